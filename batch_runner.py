@@ -0,0 +1,208 @@
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from typing import Dict, List
+from config import Config
+from config_loader import ConfigLoader
+
+# Manifest format (JSON), paths relative to the manifest file:
+# {
+#   "workers": 2,
+#   "output_dir": "batch_runs",
+#   "profiles": [
+#     {"name": "alice", "cv": "cvs/alice.pdf", "config": "profiles/alice.json",
+#      "env": {"LINKEDIN_USERNAME": "...", "LINKEDIN_PASSWORD": "..."}}
+#   ]
+# }
+# A plain list of profiles is accepted as well.
+
+def load_manifest(manifest_path: str) -> Dict:
+    """Read a batch manifest, resolving paths and giving every profile a unique name"""
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    if isinstance(manifest, list):
+        manifest = {'profiles': manifest}
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    resolve = lambda path: path if os.path.isabs(path) else os.path.join(base_dir, path)
+
+    profiles = []
+    names = set()
+    for index, entry in enumerate(manifest.get('profiles', []), 1):
+        if not entry.get('cv') or not entry.get('config'):
+            raise ValueError(f"Manifest profile {index} needs both 'cv' and 'config'")
+
+        profile = dict(entry)
+        profile['cv'] = resolve(entry['cv'])
+        profile['config'] = resolve(entry['config'])
+        for key in ('cv', 'config'):
+            if not os.path.exists(profile[key]):
+                raise FileNotFoundError(f"Manifest profile {index}: {key} file not found: {profile[key]}")
+
+        name = entry.get('name') or os.path.splitext(os.path.basename(profile['cv']))[0]
+        if name in names:
+            name = f"{name}_{index}"
+        names.add(name)
+        profile['name'] = name
+        profiles.append(profile)
+
+    if not profiles:
+        raise ValueError("Manifest has no profiles")
+
+    manifest['profiles'] = profiles
+    manifest['output_dir'] = resolve(manifest.get('output_dir', 'batch_runs'))
+    return manifest
+
+def apply_env(overrides: Dict[str, str]):
+    """Apply per-profile environment overrides to os.environ and the loaded Config"""
+    for key, value in overrides.items():
+        value = str(value)
+        os.environ[key] = value
+        if hasattr(Config, key):
+            current = getattr(Config, key)
+            if isinstance(current, bool):
+                setattr(Config, key, value.lower() == 'true')
+            elif isinstance(current, (int, float)):
+                setattr(Config, key, type(current)(value))
+            else:
+                setattr(Config, key, value)
+
+@contextmanager
+def profile_environment(overrides: Dict[str, str]):
+    """Apply a profile's environment overrides and undo them afterwards (worker processes are reused)"""
+    saved_environ = dict(os.environ)
+    saved_config = {key: value for key, value in vars(Config).items() if key.isupper()}
+    try:
+        apply_env(overrides)
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_environ)
+        for key, value in saved_config.items():
+            setattr(Config, key, value)
+
+def load_profile_config(profile: Dict) -> ConfigLoader:
+    config_loader = ConfigLoader(profile['config'])
+    if not config_loader.validate_config():
+        raise ValueError(f"Configuration validation failed: {profile['config']}")
+    return config_loader
+
+def run_profile(profile: Dict, output_dir: str) -> Dict:
+    """Run one profile in a worker process; output goes to the profile's own directory"""
+    # Imported here so the parent process stays light
+    from job_agent import JobAgent
+
+    profile_dir = os.path.join(output_dir, profile['name'])
+    os.makedirs(profile_dir, exist_ok=True)
+    result = {'name': profile['name'], 'status': 'error', 'error': None, 'results': {}}
+    start = time.perf_counter()
+
+    with open(os.path.join(profile_dir, 'run.log'), 'w', encoding='utf-8') as log, \
+            redirect_stdout(log), redirect_stderr(log):
+        try:
+            with profile_environment(profile.get('env', {})):
+                config_loader = load_profile_config(profile)
+                agent = JobAgent(
+                    db_path=os.path.join(profile_dir, 'job_applications.db'),
+                    report_path=os.path.join(profile_dir, 'job_applications_report.txt'),
+                    browser_profile_dir=os.path.join(profile_dir, 'chrome-profile'),
+                    interactive=False
+                )
+                try:
+                    results = agent.run_full_process(
+                        cv_path=profile['cv'],
+                        locations=config_loader.get_preferred_locations(),
+                        user_info=config_loader.get_personal_info(),
+                        preferences={
+                            **config_loader.get_job_preferences(),
+                            **config_loader.get_application_settings()
+                        }
+                    )
+                finally:
+                    agent.db_writer.close()
+
+            result['results'] = results or {}
+            result['status'] = 'finished' if results else 'failed'
+        except Exception as e:
+            traceback.print_exc()
+            result['error'] = str(e)
+
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def build_report(results: List[Dict], wall_seconds: float, workers: int) -> Dict:
+    """Consolidated throughput over all profiles"""
+    totals = {'total_found': 0, 'applications_attempted': 0, 'applications_successful': 0, 'duplicates_skipped': 0}
+    for result in results:
+        for key in totals:
+            totals[key] += result['results'].get(key, 0)
+
+    profile_seconds = sum(result['seconds'] for result in results)
+    return {
+        'profiles': sorted(results, key=lambda result: result['name']),
+        'totals': totals,
+        'finished': sum(result['status'] == 'finished' for result in results),
+        'failed': sum(result['status'] != 'finished' for result in results),
+        'workers': workers,
+        'wall_seconds': wall_seconds,
+        'profile_seconds': profile_seconds,
+        'applications_per_hour': totals['applications_successful'] * 3600 / wall_seconds if wall_seconds else 0.0,
+        'applications_per_worker_hour':
+            totals['applications_successful'] * 3600 / profile_seconds if profile_seconds else 0.0
+    }
+
+def print_report(report: Dict):
+    print("\nBATCH THROUGHPUT")
+    print("=" * 50)
+    for result in report['profiles']:
+        counts = result['results']
+        line = (f"{result['name']}: {result['status']} in {result['seconds']:.0f}s, "
+                f"{counts.get('total_found', 0)} found, "
+                f"{counts.get('applications_successful', 0)}/{counts.get('applications_attempted', 0)} applied")
+        if result['error']:
+            line += f" ({result['error']})"
+        print(line)
+    print("-" * 50)
+    totals = report['totals']
+    print(f"Profiles: {report['finished']} finished, {report['failed']} failed, {report['workers']} workers")
+    print(f"Jobs found: {totals['total_found']}")
+    print(f"Applications: {totals['applications_successful']}/{totals['applications_attempted']} successful")
+    print(f"Wall time: {report['wall_seconds']:.0f}s")
+    print(f"Applications per hour: {report['applications_per_hour']:.1f} "
+          f"({report['applications_per_worker_hour']:.1f} per worker-hour)")
+
+def run_batch(manifest_path: str, workers: int = None) -> Dict:
+    """Run every profile of a manifest on a shared process pool and write batch_report.json"""
+    manifest = load_manifest(manifest_path)
+    profiles = manifest['profiles']
+    output_dir = manifest['output_dir']
+    workers = max(1, min(workers or manifest.get('workers') or Config.BATCH_WORKERS, len(profiles)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Running {len(profiles)} profiles with {workers} workers, output in {output_dir}")
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_profile, profile, output_dir): profile for profile in profiles}
+        for future in as_completed(futures):
+            profile = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = {'name': profile['name'], 'status': 'error', 'error': str(e), 'results': {}, 'seconds': 0.0}
+            results.append(result)
+            print(f"[{len(results)}/{len(profiles)}] {result['name']}: {result['status']} "
+                  f"({result['results'].get('applications_successful', 0)} applied, {result['seconds']:.0f}s)")
+
+    report = build_report(results, time.perf_counter() - start, workers)
+    report_path = os.path.join(output_dir, 'batch_report.json')
+    with open(report_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+
+    print_report(report)
+    print(f"\nReport written to {report_path}")
+    return report
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Auto Job Finding Agent
+Run `python benchmark.py --help` to list the available benchmarks
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+# Modules that must not be imported before they are actually needed
+HEAVY_MODULES = [
+    'google.generativeai',
+    'undetected_chromedriver',
+    'selenium',
+    'fake_useragent',
+    'pdfplumber',
+    'PyPDF2',
+    # Profiling support, only needed by 'main.py --profile'
+    'cProfile',
+    'pstats'
+]
+
+def measure_import_time(module: str) -> Dict:
+    """Import a module in a fresh interpreter with -X importtime and parse the report"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            imports.append({
+                'module': name.strip(),
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us)
+            })
+        except ValueError:
+            continue
+
+    total_us = next((item['cumulative_us'] for item in imports if item['module'] == module), 0)
+
+    return {
+        'module': module,
+        'ok': result.returncode == 0,
+        'error': result.stderr.strip().splitlines()[-1] if result.returncode != 0 and result.stderr.strip() else '',
+        'total_ms': total_us / 1000,
+        'imports': imports
+    }
+
+def benchmark_import_time(modules: List[str], budget_ms: float, top: int) -> bool:
+    """Report import time per entry module and check it against the startup budget"""
+    passed = True
+
+    for module in modules:
+        report = measure_import_time(module)
+
+        print(f"\n{module}")
+        print("-" * 40)
+        if not report['ok']:
+            print(f"Import failed: {report['error']}")
+            passed = False
+            continue
+
+        print(f"Total import time: {report['total_ms']:.1f} ms (budget {budget_ms:.0f} ms)")
+
+        slowest = sorted(report['imports'], key=lambda item: item['self_us'], reverse=True)[:top]
+        for item in slowest:
+            print(f"  {item['self_us'] / 1000:8.1f} ms  {item['module']}")
+
+        heavy = sorted({
+            item['module'] for item in report['imports']
+            if any(item['module'] == name or item['module'].startswith(name + '.') for name in HEAVY_MODULES)
+        })
+        if heavy:
+            print(f"Heavy modules imported eagerly: {', '.join(heavy)}")
+            passed = False
+
+        if report['total_ms'] > budget_ms:
+            print(f"Over startup budget by {report['total_ms'] - budget_ms:.1f} ms")
+            passed = False
+
+    print(f"\nImport time benchmark {'passed' if passed else 'FAILED'}")
+    return passed
+
+SAMPLE_WORDS = [
+    'Python', 'developer', 'experience', 'designed', 'built', 'scalable', 'services', 'team',
+    'Kotlin', 'Android', 'data', 'pipelines', 'cloud', 'delivered', 'projects', 'improved',
+    'performance', 'customers', 'engineering', 'university', 'degree', 'SQL', 'Docker', 'led'
+]
+
+def write_sample_pdf(path: str, page_count: int, columns: int = 1, text_layer: bool = True,
+                     char_spacing: float = 0.0, seed: int = 0):
+    """Write a CV-like PDF using only the standard library"""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    pages_id = 2 + 2 * page_count
+
+    for _ in range(page_count):
+        stream = "0.9 g 40 40 532 762 re f 0 g "
+        if text_layer:
+            column_width = 500 // columns
+            for column in range(columns):
+                lines = [' '.join(rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(4, 9 // columns + 4))) for _ in range(45)]
+                body = ' '.join(f"({line}) Tj T*" for line in lines)
+                stream += f"BT /F1 10 Tf {char_spacing} Tc 14 TL {50 + column * column_width} 780 Td {body} ET "
+        content = stream.encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, content_id) if text_layer else
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] /Contents %d 0 R >>" % (pages_id, content_id)
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, page_count))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, len(objects), xref_offset)
+
+    with open(path, 'wb') as file:
+        file.write(output)
+
+PDF_CORPUS = {
+    'cv-1-page': {'page_count': 1},
+    'cv-2-columns': {'page_count': 2, 'columns': 2},
+    'portfolio-30-pages': {'page_count': 30},
+    'letter-spaced': {'page_count': 2, 'char_spacing': 6.0},
+    'image-only': {'page_count': 2, 'text_layer': False}
+}
+
+def benchmark_pdf_backends(repeat: int):
+    """Report extraction time and text quality per backend over a generated PDF corpus"""
+    from pdf_reader import PDFReader, text_quality
+
+    reader = PDFReader(parallel_workers=1)
+    reader.cache = None
+    runners = {
+        'PyPDF2': reader.extract_text_pypdf2,
+        'pdfplumber': reader.extract_text_pdfplumber,
+        'auto': reader.extract_text
+    }
+
+    print(f"{'document':<20} {'backend':<11} {'seconds':>8} {'chars':>7} {'quality':>8}")
+    print("-" * 58)
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        for name, options in PDF_CORPUS.items():
+            pdf_path = os.path.join(corpus_dir, f"{name}.pdf")
+            write_sample_pdf(pdf_path, **options)
+
+            for backend, run in runners.items():
+                timings = []
+                text = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    # Silence per-page progress output from PDFReader
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        try:
+                            text = run(pdf_path)
+                        except Exception:
+                            text = None
+                    timings.append(time.perf_counter() - start)
+
+                print(f"{name:<20} {backend:<11} {min(timings):8.3f} {len(text or ''):7d} {text_quality(text):8.2f}")
+
+INDEX_QUERIES = {
+    'unapplied jobs (first 100)': ("SELECT * FROM applications WHERE applied = FALSE ORDER BY created_at DESC LIMIT 100", ()),
+    'export order (first 1000)': ("SELECT * FROM applications ORDER BY created_at DESC LIMIT 1000", ()),
+    'jobs by company': ("SELECT id FROM applications WHERE company = ?", ('Company 4242',)),
+    'count by status': ("SELECT COUNT(*) FROM applications WHERE status = ?", ('failed',)),
+    'lookup by job id': ("SELECT id FROM applications WHERE job_id = ?", ('3900777777',))
+}
+
+def run_index_queries(conn, repeat: int) -> Dict[str, float]:
+    """Best-of-repeat time per query in milliseconds"""
+    timings = {}
+    for name, (query, params) in INDEX_QUERIES.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(query, params).fetchall()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best * 1000
+    return timings
+
+def benchmark_db_indexes(rows: int, repeat: int):
+    """Compare query times on a synthetic applications table before and after the index migration"""
+    from database import JobDatabase, APPLICATION_INDEXES
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = JobDatabase(os.path.join(db_dir, 'benchmark.db'))
+        conn = db.connection()
+
+        # Recreate a pre-migration database: no indexes and no job ids
+        for name in APPLICATION_INDEXES:
+            conn.execute(f'DROP INDEX IF EXISTS {name}')
+        conn.execute('PRAGMA user_version = 0')
+
+        print(f"Generating {rows} synthetic applications...")
+        rng = random.Random(0)
+        statuses = ['pending', 'applied', 'failed']
+        start = time.perf_counter()
+        with db.transaction() as cursor:
+            cursor.executemany('''
+            INSERT INTO applications (job_title, company, url, location, applied, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, datetime('2024-01-01', ? || ' seconds'))
+            ''', (
+                (
+                    f"Job {i}",
+                    f"Company {rng.randint(0, 20000)}",
+                    f"https://www.linkedin.com/jobs/view/{3900000000 + i}/",
+                    rng.choice(['Milan', 'Bologna', 'Remote']),
+                    status == 'applied',
+                    status,
+                    rng.randint(0, 365 * 24 * 3600)
+                )
+                for i, status in ((i, rng.choice(statuses)) for i in range(rows))
+            ))
+        print(f"Inserted in {time.perf_counter() - start:.1f}s")
+
+        before = run_index_queries(conn, repeat)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.apply_migrations()
+        print(f"Migration (job id backfill + indexes) took {time.perf_counter() - start:.1f}s\n")
+
+        after = run_index_queries(conn, repeat)
+
+        print(f"{'query':<30} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+        print("-" * 61)
+        for name in INDEX_QUERIES:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            print(f"{name:<30} {before[name]:10.2f} {after[name]:10.2f} {speedup:7.1f}x")
+
+        print("\nQuery plans after migration:")
+        for name, (query, params) in INDEX_QUERIES.items():
+            plan = '; '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {query}', params))
+            print(f"  {name}: {plan}")
+
+FTS_QUERIES = [
+    ('kotlin', {'location': 'Milan', 'applied': False}),
+    ('python docker', {}),
+    ('android kotl*', {}),
+    ('data pipelines cloud', {'status': 'pending'})
+]
+
+def benchmark_full_text_search(rows: int, repeat: int):
+    """Time ranked FTS5 search against a LIKE scan over synthetic job postings"""
+    from database import JobDatabase
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = JobDatabase(os.path.join(db_dir, 'benchmark.db'))
+
+        print(f"Generating {rows} synthetic job postings...")
+        rng = random.Random(0)
+        # Realistic vocabulary: many rare filler words plus a few skills per posting
+        filler = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9))) for _ in range(5000)]
+        skills = SAMPLE_WORDS + ['Rust', 'Scala', 'Spark', 'Airflow', 'React', 'Angular', 'Terraform', 'Swift', 'Go', 'Java']
+        start = time.perf_counter()
+        for batch_start in range(0, rows, 10000):
+            db.add_job_applications([
+                {
+                    'title': f"{rng.choice(['Senior', 'Junior', 'Lead', ''])} {rng.choice(SAMPLE_WORDS)} Engineer".strip(),
+                    'company': f"Company {rng.randint(0, 20000)}",
+                    'url': f"https://www.linkedin.com/jobs/view/{3900000000 + i}/",
+                    'location': rng.choice(['Milan', 'Bologna', 'Rome', 'Remote']),
+                    'description': ' '.join(rng.sample(filler, 120) + rng.sample(skills, 4))
+                }
+                for i in range(batch_start, min(batch_start + 10000, rows))
+            ])
+        print(f"Inserted and indexed in {time.perf_counter() - start:.1f}s\n")
+
+        conn = db.connection()
+        print(f"{'query':<28} {'results':>8} {'fts ms':>8} {'like ms':>9}")
+        print("-" * 56)
+        for query, filters in FTS_QUERIES:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                results = db.search_jobs(query, limit=20, **filters)
+                best = min(best, time.perf_counter() - start)
+
+            # Ranking needs every match, so the unindexed equivalent is a full LIKE scan
+            words = [word.rstrip('*') for word in query.split()]
+            like_sql = ' AND '.join(["(job_title || ' ' || company || ' ' || description) LIKE ?"] * len(words))
+            start = time.perf_counter()
+            conn.execute(f"SELECT COUNT(*) FROM applications WHERE {like_sql}", [f'%{word}%' for word in words]).fetchone()
+            like_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{query:<28} {len(results):8d} {best * 1000:8.2f} {like_ms:9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Auto Job Finding Agent benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    importtime_parser = subparsers.add_parser('importtime', help="Startup import time (-X importtime)")
+    importtime_parser.add_argument('modules', nargs='*', default=['main', 'job_agent', 'job_search_helper'])
+    importtime_parser.add_argument('--budget-ms', type=float, default=300.0)
+    importtime_parser.add_argument('--top', type=int, default=10)
+
+    pdf_parser = subparsers.add_parser('pdf', help="PDF backend time and text quality on a generated corpus")
+    pdf_parser.add_argument('--repeat', type=int, default=3)
+
+    db_parser = subparsers.add_parser('db-indexes', help="Query times on a synthetic table before and after indexing")
+    db_parser.add_argument('--rows', type=int, default=1000000)
+    db_parser.add_argument('--repeat', type=int, default=3)
+
+    fts_parser = subparsers.add_parser('fts', help="Full-text search latency over synthetic job postings")
+    fts_parser.add_argument('--rows', type=int, default=100000)
+    fts_parser.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'importtime':
+        passed = benchmark_import_time(args.modules, args.budget_ms, args.top)
+        sys.exit(0 if passed else 1)
+    elif args.benchmark == 'pdf':
+        benchmark_pdf_backends(args.repeat)
+    elif args.benchmark == 'db-indexes':
+        benchmark_db_indexes(args.rows, args.repeat)
+    elif args.benchmark == 'fts':
+        benchmark_full_text_search(args.rows, args.repeat)
+
+if __name__ == "__main__":
+    main()
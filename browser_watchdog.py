@@ -0,0 +1,152 @@
+import os
+import statistics
+import time
+from collections import deque
+from typing import Optional
+from config import Config
+
+# Latency is judged on the median of the last few probes, so one slow
+# command (a page still loading, a garbage collection) does not recycle
+LATENCY_SAMPLES = 5
+# Summing the memory of the process tree walks /proc when psutil is missing,
+# so it is measured at most this often; memory grows slowly anyway
+MEMORY_CHECK_SECONDS = 30
+
+def browser_root_pid(driver) -> Optional[int]:
+    """Chrome's process id, or chromedriver's when Chrome was started by it"""
+    # undetected_chromedriver starts Chrome itself and keeps its pid
+    pid = getattr(driver, 'browser_pid', None)
+    if pid:
+        return pid
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """Resident memory in bytes of a process and all its descendants, None where it cannot be read"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            total = root.memory_info().rss
+            for child in root.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total
+        except psutil.Error:
+            return None
+
+    # Without psutil the Linux /proc tables are read directly
+    if not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as file:
+                # The command name is in parentheses and may contain spaces
+                fields = file.read().rsplit(')', 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    found = False
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f'/proc/{current}/statm') as file:
+                total += int(file.read().split()[1]) * page_size
+            found = True
+        except (OSError, IndexError, ValueError):
+            continue
+    return total if found else None
+
+class BrowserWatchdog:
+    """
+    Decides when a long-running Chrome should be restarted. It counts the
+    jobs opened since the last restart, and at every check it probes the
+    latency of a trivial WebDriver command. At most every memory_interval
+    seconds it also sums the resident memory of the browser's processes
+    (renderers and GPU process included). Shared pages are counted once per
+    process, so the sum overstates real use; the limit is a trend
+    threshold, not an exact figure.
+    """
+
+    def __init__(self, max_jobs: int = None, max_rss_mb: float = None, max_latency_ms: float = None,
+                 min_jobs: int = None, memory_interval: float = MEMORY_CHECK_SECONDS):
+        self.max_jobs = Config.BROWSER_RECYCLE_JOBS if max_jobs is None else max_jobs
+        self.max_rss_mb = Config.BROWSER_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.max_latency_ms = Config.BROWSER_MAX_LATENCY_MS if max_latency_ms is None else max_latency_ms
+        self.min_jobs = Config.BROWSER_RECYCLE_MIN_JOBS if min_jobs is None else min_jobs
+        self.memory_interval = memory_interval
+        self.recycles = 0
+        self.reset()
+
+    def reset(self):
+        """Start counting for a fresh browser"""
+        self.jobs = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.rss_mb = None
+        self.measured_at = None
+
+    def record_job(self):
+        self.jobs += 1
+
+    def probe_latency(self, driver) -> Optional[float]:
+        """Round trip of a command that does no work in the page, in milliseconds"""
+        start = time.perf_counter()
+        try:
+            driver.execute_script("return 1")
+        except Exception:
+            return None
+        latency = (time.perf_counter() - start) * 1000
+        self.latencies.append(latency)
+        return latency
+
+    def memory_due(self) -> bool:
+        """Whether memory_interval has passed since the last measurement"""
+        return self.measured_at is None or time.monotonic() - self.measured_at >= self.memory_interval
+
+    def measure_rss(self, driver) -> Optional[float]:
+        """Resident memory of the browser's processes in MB"""
+        self.measured_at = time.monotonic()
+        pid = browser_root_pid(driver)
+        rss = process_tree_rss(pid) if pid else None
+        self.rss_mb = rss / (1024 * 1024) if rss is not None else None
+        return self.rss_mb
+
+    def check(self, driver) -> Optional[str]:
+        """Why the browser should be recycled now, or None to keep it"""
+        if driver is None:
+            return None
+        if self.max_jobs and self.jobs >= self.max_jobs:
+            return f"{self.jobs} jobs opened since the browser started"
+
+        # A browser that is already over a limit when fresh would otherwise restart after every job
+        if self.jobs < self.min_jobs:
+            return None
+        if self.max_latency_ms:
+            self.probe_latency(driver)
+            if len(self.latencies) == LATENCY_SAMPLES:
+                latency = statistics.median(self.latencies)
+                if latency > self.max_latency_ms:
+                    return f"WebDriver commands take {latency:.0f}ms (limit {self.max_latency_ms:.0f}ms)"
+        if self.max_rss_mb and self.memory_due():
+            rss_mb = self.measure_rss(driver)
+            if rss_mb is not None and rss_mb > self.max_rss_mb:
+                return f"browser uses {rss_mb:.0f}MB (limit {self.max_rss_mb:.0f}MB)"
+        return None
+
+    def recycled(self):
+        self.recycles += 1
+        self.reset()
@@ -0,0 +1,67 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from job_fingerprint import normalize_company, words
+
+class CardFilter:
+    """
+    Decides which job cards are worth opening, from what the card shows.
+    Companies are compared by normalize_company, so "Acme Inc." matches
+    "ACME"; excluded titles match whole words or phrases of the card title.
+    """
+
+    def __init__(self, excluded_companies: Iterable[str] = (), preferred_companies: Iterable[str] = (),
+                 excluded_titles: Iterable[str] = (), applied_companies: Iterable[str] = (),
+                 skip_applied_companies: bool = False):
+        self.excluded_companies = {normalize_company(company) for company in excluded_companies} - {''}
+        self.preferred_companies = {normalize_company(company) for company in preferred_companies} - {''}
+        self.excluded_titles = [' '.join(words(title)) for title in excluded_titles if words(title)]
+        self.skip_applied_companies = skip_applied_companies
+        self.applied_companies = set()
+        for company in applied_companies:
+            self.add_applied_company(company)
+
+    @classmethod
+    def from_preferences(cls, preferences: Dict, applied_companies: Iterable[str] = ()) -> 'CardFilter':
+        """Filter for the 'job_preferences' of a user config"""
+        return cls(
+            preferences.get('excluded_companies', []),
+            preferences.get('preferred_companies', []),
+            preferences.get('excluded_titles', []),
+            applied_companies,
+            preferences.get('skip_applied_companies', True)
+        )
+
+    def add_applied_company(self, company: str):
+        """Skip further postings of an employer applied to during this run"""
+        if self.skip_applied_companies:
+            self.applied_companies.add(normalize_company(company))
+            self.applied_companies.discard('')
+
+    def reason(self, card: Dict) -> Optional[str]:
+        """Why a card should not be opened, or None to open it"""
+        company = normalize_company(card.get('company', ''))
+        if company in self.excluded_companies:
+            return "excluded company"
+        # Preferred companies may get several applications
+        if company in self.applied_companies and company not in self.preferred_companies:
+            return "already applied to this company"
+
+        title = f" {' '.join(words(card.get('title', '')))} "
+        for phrase in self.excluded_titles:
+            if f" {phrase} " in title:
+                return f"title matches '{phrase}'"
+        return None
+
+    def select(self, cards: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, str]]]:
+        """Cards to open, preferred companies first, and (card, reason) for the dropped ones"""
+        kept = []
+        skipped = []
+        for card in cards:
+            reason = self.reason(card)
+            if reason:
+                skipped.append((card, reason))
+            else:
+                kept.append(card)
+
+        # Stable sort: page order is kept within both groups
+        kept.sort(key=lambda card: normalize_company(card.get('company', '')) not in self.preferred_companies)
+        return kept, skipped
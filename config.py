@@ -8,9 +8,95 @@ class Config:
     LINKEDIN_USERNAME = os.getenv('LINKEDIN_USERNAME')
     LINKEDIN_PASSWORD = os.getenv('LINKEDIN_PASSWORD')
     
+    # LLM backend: 'gemini' or 'fake' (offline, deterministic)
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini')
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-pro')
+    FAKE_LLM_LATENCY = float(os.getenv('FAKE_LLM_LATENCY', '0'))
+    FAKE_LLM_FAILURE_RATE = float(os.getenv('FAKE_LLM_FAILURE_RATE', '0'))
+    FAKE_LLM_RESPONSES = os.getenv('FAKE_LLM_RESPONSES')
+    FAKE_LLM_SEED = int(os.getenv('FAKE_LLM_SEED', '0'))
+    
+    # PDF extraction: 0 = one process per CPU, 1 = serial
+    PDF_PARALLEL_WORKERS = int(os.getenv('PDF_PARALLEL_WORKERS', '0'))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '8'))
+    
+    # PDF backend: 'auto' picks the cheapest backend likely to produce clean text
+    PDF_BACKEND = os.getenv('PDF_BACKEND', 'auto')
+    PDF_MIN_TEXT_QUALITY = float(os.getenv('PDF_MIN_TEXT_QUALITY', '0.6'))
+    
+    # Cache of extracted CV text, keyed by file hash and PDF backend version
+    EXTRACTION_CACHE_ENABLED = os.getenv('EXTRACTION_CACHE_ENABLED', 'true').lower() == 'true'
+    EXTRACTION_CACHE_DIR = os.getenv('EXTRACTION_CACHE_DIR', '.cv_cache')
+    EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', str(20 * 1024 * 1024)))
+    
     # Job search settings
     MAX_POSITIONS = 3
     DATABASE_PATH = 'job_applications.db'
+    DATABASE_BUSY_TIMEOUT_MS = int(os.getenv('DATABASE_BUSY_TIMEOUT_MS', '10000'))
+    # Skip reposts and near-duplicate postings of jobs already applied to
+    DUPLICATE_DETECTION = os.getenv('DUPLICATE_DETECTION', 'true').lower() == 'true'
+    # Max differing SimHash bits between descriptions of the same job (0-5)
+    DUPLICATE_MAX_DISTANCE = int(os.getenv('DUPLICATE_MAX_DISTANCE', '5'))
+    # Store each opened job's description, for screening, job history search and near-duplicate checks
+    FETCH_DESCRIPTIONS = os.getenv('FETCH_DESCRIPTIONS', 'true').lower() == 'true'
+    # Background writer: queued writes are committed in batches off the scraping thread
+    DB_WRITER_QUEUE_SIZE = int(os.getenv('DB_WRITER_QUEUE_SIZE', '1000'))
+    DB_WRITER_BATCH_SIZE = int(os.getenv('DB_WRITER_BATCH_SIZE', '100'))
+    DB_WRITER_FLUSH_INTERVAL = float(os.getenv('DB_WRITER_FLUSH_INTERVAL', '1.0'))
+    
+    # Application pacing and daily cap, used when the user config's application_settings
+    # don't set delay_between_applications / max_applications_per_day (0 = no limit)
+    APPLICATION_DELAY_SECONDS = float(os.getenv('APPLICATION_DELAY_SECONDS', '15'))
+    MAX_APPLICATIONS_PER_DAY = int(os.getenv('MAX_APPLICATIONS_PER_DAY', '50'))
+    # Applications allowed back to back after an idle period
+    APPLICATION_BURST = int(os.getenv('APPLICATION_BURST', '1'))
+    
+    # Search scheduling: order (position, location) searches and size page budgets by past yield
+    ADAPTIVE_SCHEDULING = os.getenv('ADAPTIVE_SCHEDULING', 'true').lower() == 'true'
+    SEARCH_MAX_PAGES = int(os.getenv('SEARCH_MAX_PAGES', '2'))
+    # Prior minutes per application for searches without history
+    SEARCH_PRIOR_MINUTES = float(os.getenv('SEARCH_PRIOR_MINUTES', '5'))
+    # Total browser time for searching per run (0 = unlimited)
+    RUN_TIME_BUDGET_MINUTES = float(os.getenv('RUN_TIME_BUDGET_MINUTES', '0'))
+    
+    # Incremental search: newest postings first, stop at postings seen in earlier runs
+    INCREMENTAL_SEARCH = os.getenv('INCREMENTAL_SEARCH', 'false').lower() == 'true'
+    # Consecutive known postings that end an incremental scan (promoted posts break date order)
+    INCREMENTAL_KNOWN_STREAK = int(os.getenv('INCREMENTAL_KNOWN_STREAK', '3'))
+    
+    # Tabs loading upcoming job pages while the current one is applied to (0 = off)
+    PREFETCH_TABS = int(os.getenv('PREFETCH_TABS', '1'))
+    # Longest wait for a prefetched page that has not finished loading
+    PREFETCH_WAIT_SECONDS = float(os.getenv('PREFETCH_WAIT_SECONDS', '4'))
+    
+    # Restart Chrome, keeping its login, after this many opened jobs (0 = never)
+    BROWSER_RECYCLE_JOBS = int(os.getenv('BROWSER_RECYCLE_JOBS', '150'))
+    # ... or once its processes use more memory than this (0 = no limit)
+    BROWSER_MAX_RSS_MB = float(os.getenv('BROWSER_MAX_RSS_MB', '3000'))
+    # ... or once a no-op WebDriver command takes longer than this, median of the last 5 checks (0 = no limit)
+    BROWSER_MAX_LATENCY_MS = float(os.getenv('BROWSER_MAX_LATENCY_MS', '1000'))
+    # Jobs a fresh browser opens before the memory and latency limits apply
+    BROWSER_RECYCLE_MIN_JOBS = int(os.getenv('BROWSER_RECYCLE_MIN_JOBS', '10'))
+    
+    # Start Chrome and log in on a background thread while the CV is analyzed
+    OVERLAP_BROWSER_STARTUP = os.getenv('OVERLAP_BROWSER_STARTUP', 'true').lower() == 'true'
+    
+    # 'main.py --profile': per-stage .pstats and collapsed stacks are written under this directory
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+    
+    # Profiles run in parallel by 'main.py batch' unless the manifest sets workers
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '2'))
+    
+    # Distributed runs ('main.py queue'): work queue URL (a bare path is a SQLite file) and leases
+    WORK_QUEUE_URL = os.getenv('WORK_QUEUE_URL', 'work_queue.db')
+    WORK_QUEUE_LEASE_SECONDS = float(os.getenv('WORK_QUEUE_LEASE_SECONDS', '300'))
+    WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv('WORK_QUEUE_MAX_ATTEMPTS', '3'))
+    # How often idle workers check for units whose leases expired
+    WORK_QUEUE_POLL_INTERVAL = float(os.getenv('WORK_QUEUE_POLL_INTERVAL', '10'))
+    
+    # Run Chrome without a window (servers, batch mode)
+    CHROME_HEADLESS = os.getenv('CHROME_HEADLESS', 'false').lower() == 'true'
     
     # Chrome settings for bot detection bypass (compatible options only)
     CHROME_OPTIONS = [
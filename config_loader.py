@@ -3,8 +3,8 @@ import os
 from typing import Dict, Any
 
 class ConfigLoader:
-    def __init__(self):
-        self.user_config_path = 'user_config.json'
+    def __init__(self, user_config_path: str = 'user_config.json'):
+        self.user_config_path = user_config_path
         self.user_config = self.load_user_config()
     
     def load_user_config(self) -> Dict[str, Any]:
@@ -65,6 +65,11 @@ class ConfigLoader:
             print("Warning: No preferred locations specified")
             return False
         
+        batch_size = self.get_job_preferences().get('screening_batch_size', 10)
+        if not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size <= 0:
+            print(f"job_preferences.screening_batch_size must be a positive integer, got {batch_size!r}")
+            return False
+        
         return True
     
     def update_config(self, updates: Dict[str, Any]) -> bool:
@@ -1,16 +1,38 @@
-import google.generativeai as genai
-from config import Config
+from llm_backend import LLMBackend, create_llm_backend
 from pdf_reader import PDFReader
-from typing import Dict, List
+from typing import Dict, List, Optional
 import json
 import os
+import re
+
+def parse_fit_score(value) -> Optional[int]:
+    """Fit score from an LLM reply (80, 80.5, "80", "80%", "80/100"), or None if it is not a number"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        score = value
+    else:
+        match = re.match(r'\s*(\d+(?:\.\d+)?)', str(value or ''))
+        if not match:
+            return None
+        score = float(match.group(1))
+    return max(0, min(100, int(round(score))))
 
 class CVAnalyzer:
-    def __init__(self):
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.5-pro')
+    def __init__(self, llm_backend: LLMBackend = None):
+        self.llm = llm_backend or create_llm_backend()
         self.pdf_reader = PDFReader()
     
+    def generate_json(self, prompt: str) -> Dict:
+        """Send prompt to the LLM backend and parse the JSON response"""
+        response_text = self.llm.generate(prompt).strip()
+        if response_text.startswith('```json'):
+            response_text = response_text[7:-3]
+        elif response_text.startswith('```'):
+            response_text = response_text[3:-3]
+        
+        return json.loads(response_text)
+    
     def read_cv_file(self, cv_path: str) -> str:
         """
         Read CV from file (supports PDF and text files)
@@ -82,15 +104,7 @@ class CVAnalyzer:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            # Clean and parse JSON response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:-3]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:-3]
-            
-            cv_data = json.loads(response_text)
+            cv_data = self.generate_json(prompt)
             print(f"Successfully analyzed CV for {cv_data.get('personal_info', {}).get('name', 'Unknown')}")
             return cv_data
             
@@ -146,14 +160,7 @@ class CVAnalyzer:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:-3]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:-3]
-            
-            data = json.loads(response_text)
+            data = self.generate_json(prompt)
             positions = data.get('positions', [])
             
             # Filter positions by minimum score if specified
@@ -164,4 +171,79 @@ class CVAnalyzer:
             
         except Exception as e:
             print(f"Error matching positions: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def compact_cv(self, cv_data: Dict) -> Dict:
+        """Reduce CV analysis to the fields needed for job screening"""
+        return {
+            'skills': cv_data.get('skills', [])[:25],
+            'experience_years': cv_data.get('experience_years', 'unknown'),
+            'job_titles': cv_data.get('job_titles', [])[:5],
+            'industries': cv_data.get('industries', [])[:5],
+            'summary': cv_data.get('summary', '')
+        }
+    
+    def screen_jobs(self, cv_data: Dict, jobs: List[Dict], batch_size: int = 10,
+                    max_description_chars: int = 1500) -> Dict[str, Dict]:
+        """
+        Score how well each job fits the CV, sending batch_size job descriptions per prompt.
+        Jobs need 'job_id', 'title', 'company' and 'description'.
+        Returns {job_id: {'fit_score': int, 'reason': str}}
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Screening batch size must be positive, got {batch_size}")
+        compact_cv = json.dumps(self.compact_cv(cv_data), indent=2)
+        screenings = {}
+        
+        for start in range(0, len(jobs), batch_size):
+            batch = jobs[start:start + batch_size]
+            postings = [
+                {
+                    'job_id': job['job_id'],
+                    'title': job.get('title', ''),
+                    'company': job.get('company', ''),
+                    'location': job.get('location', ''),
+                    'description': (job.get('description') or '')[:max_description_chars]
+                }
+                for job in batch
+            ]
+            
+            prompt = f"""
+        Screen the following job postings against the candidate profile.
+        
+        Candidate Profile:
+        {compact_cv}
+        
+        Job Postings:
+        {json.dumps(postings, indent=2)}
+        
+        Return a fit score from 0 to 100 and a one-sentence reason for every job_id, in JSON format:
+        {{
+            "screenings": [
+                {{"job_id": "job id from the posting", "fit_score": 80, "reason": "Why the job fits or not"}}
+            ]
+        }}
+        """
+            
+            try:
+                data = self.generate_json(prompt)
+            except Exception as e:
+                print(f"Error screening jobs {start + 1}-{start + len(batch)}: {e}")
+                continue
+            
+            batch_ids = {posting['job_id'] for posting in postings}
+            for result in data.get('screenings', []):
+                job_id = str(result.get('job_id', ''))
+                if job_id not in batch_ids:
+                    continue
+                # A reply like "high" is skipped so the job is screened again next run
+                fit_score = parse_fit_score(result.get('fit_score'))
+                if fit_score is None:
+                    print(f"Ignoring unreadable fit score {result.get('fit_score')!r} for job {job_id}")
+                    continue
+                screenings[job_id] = {
+                    'fit_score': fit_score,
+                    'reason': result.get('reason', '')
+                }
+        
+        return screenings
\ No newline at end of file
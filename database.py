@@ -1,18 +1,405 @@
 import sqlite3
-from typing import Dict, List
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Iterable, Iterator, Optional, Set, Tuple
 from config import Config
+from report_writers import EXPORT_COLUMNS, get_report_writer
+from job_record import JobRecord, job_record_factory
+from job_fingerprint import SIMHASH_BANDS, hamming_distance, job_fingerprint, to_signed
 import json
+import re
 from datetime import datetime
 
+def normalize_job_id(url: str) -> str:
+    """Extract the LinkedIn job id from a job URL (falls back to the URL itself)"""
+    if not url:
+        return ''
+    match = re.search(r'(?:currentJobId=|/jobs/view/(?:[^/?]*-)?)(\d+)', url)
+    return match.group(1) if match else url.split('?')[0].rstrip('/')
+
+# Secondary indexes for the real access paths of the applications table
+APPLICATION_INDEXES = {
+    # get_unapplied_jobs: WHERE applied = FALSE ORDER BY created_at DESC
+    'idx_applications_applied_created': 'applications (applied, created_at)',
+    # export_to_txt: ORDER BY created_at DESC over the whole table
+    'idx_applications_created': 'applications (created_at)',
+    'idx_applications_company': 'applications (company)',
+    'idx_applications_status': 'applications (status)',
+    'idx_applications_job_id': 'applications (job_id)'
+}
+
+def migrate_job_id_and_indexes(cursor: sqlite3.Cursor):
+    """Add the normalized job id column and the applications indexes"""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(applications)')}
+    if 'job_id' not in columns:
+        cursor.execute('ALTER TABLE applications ADD COLUMN job_id TEXT')
+    
+    # Backfill inside SQLite so memory stays flat on large tables
+    cursor.connection.create_function('normalize_job_id', 1, normalize_job_id, deterministic=True)
+    cursor.execute('UPDATE applications SET job_id = normalize_job_id(url) WHERE job_id IS NULL')
+    
+    for name, definition in APPLICATION_INDEXES.items():
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {definition}')
+    cursor.execute('ANALYZE applications')
+
+def migrate_updated_at(cursor: sqlite3.Cursor):
+    """Track when each application last changed, for incremental exports"""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(applications)')}
+    if 'updated_at' not in columns:
+        cursor.execute('ALTER TABLE applications ADD COLUMN updated_at TIMESTAMP')
+    # UTC like the triggers below, while application_date is Python local time
+    cursor.execute('''
+    UPDATE applications SET updated_at = COALESCE(
+        strftime('%Y-%m-%d %H:%M:%f', application_date, 'utc'), strftime('%Y-%m-%d %H:%M:%f', created_at)
+    ) WHERE updated_at IS NULL
+    ''')
+    
+    # Millisecond timestamps so several changes within one second stay ordered
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS applications_set_updated_at_on_insert
+    AFTER INSERT ON applications FOR EACH ROW WHEN NEW.updated_at IS NULL
+    BEGIN
+        UPDATE applications SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = NEW.id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS applications_set_updated_at_on_update
+    AFTER UPDATE ON applications FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+    BEGIN
+        UPDATE applications SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = NEW.id;
+    END
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_applications_updated ON applications (updated_at)')
+
+def migrate_description_search(cursor: sqlite3.Cursor):
+    """Store job descriptions and index title, company and description with FTS5"""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(applications)')}
+    if 'description' not in columns:
+        cursor.execute('ALTER TABLE applications ADD COLUMN description TEXT')
+    
+    try:
+        # External-content table: the text lives once, in applications
+        cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+            job_title, company, description,
+            content='applications', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Warning: full-text search unavailable ({e}), search will fall back to LIKE")
+        return
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications
+    BEGIN
+        INSERT INTO applications_fts (rowid, job_title, company, description)
+        VALUES (NEW.id, NEW.job_title, NEW.company, NEW.description);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications
+    BEGIN
+        INSERT INTO applications_fts (applications_fts, rowid, job_title, company, description)
+        VALUES ('delete', OLD.id, OLD.job_title, OLD.company, OLD.description);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS applications_fts_update AFTER UPDATE OF job_title, company, description ON applications
+    BEGIN
+        INSERT INTO applications_fts (applications_fts, rowid, job_title, company, description)
+        VALUES ('delete', OLD.id, OLD.job_title, OLD.company, OLD.description);
+        INSERT INTO applications_fts (rowid, job_title, company, description)
+        VALUES (NEW.id, NEW.job_title, NEW.company, NEW.description);
+    END
+    ''')
+    cursor.execute("INSERT INTO applications_fts (applications_fts) VALUES ('rebuild')")
+
+def update_fingerprints(cursor: sqlite3.Cursor, urls: List[str] = None, chunk_size: int = 500):
+    """Recompute duplicate-detection fingerprints from the stored rows (all rows when urls is None)"""
+    query = 'SELECT id, url, company, job_title, location, description FROM applications'
+    bands = [f'band{band}' for band in range(SIMHASH_BANDS)]
+    last_id = 0
+    start = 0
+    
+    # One chunk of rows in memory at a time, so backfilling a large table stays flat
+    while True:
+        if urls is None:
+            rows = cursor.execute(f'{query} WHERE id > ? ORDER BY id LIMIT ?', (last_id, chunk_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+        else:
+            if start >= len(urls):
+                break
+            chunk = urls[start:start + chunk_size]
+            start += chunk_size
+            rows = cursor.execute(f"{query} WHERE url IN ({', '.join('?' * len(chunk))})", chunk).fetchall()
+        
+        values = []
+        for _, url, company, title, location, description in rows:
+            fingerprint = job_fingerprint({'company': company, 'title': title, 'location': location,
+                                           'description': description})
+            value = fingerprint['simhash']
+            values.append((url, fingerprint['key'], to_signed(value) if value is not None else None,
+                           *fingerprint['bands']))
+        
+        cursor.executemany(f'''
+        INSERT OR REPLACE INTO job_fingerprints (url, posting_key, simhash, {', '.join(bands)})
+        VALUES ({', '.join('?' * (3 + SIMHASH_BANDS))})
+        ''', values)
+
+def migrate_job_fingerprints(cursor: sqlite3.Cursor):
+    """Fingerprint postings by company, title and location plus a description SimHash to catch reposts"""
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS job_fingerprints (
+        url TEXT PRIMARY KEY,
+        posting_key TEXT,
+        simhash INTEGER,
+        {', '.join(f'band{band} INTEGER' for band in range(SIMHASH_BANDS))}
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_fingerprints_key ON job_fingerprints (posting_key)')
+    for band in range(SIMHASH_BANDS):
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_fingerprints_band{band} ON job_fingerprints (band{band})')
+    update_fingerprints(cursor)
+
+# Counters kept per run and per (position, location) search
+SEARCH_COUNTERS = ['jobs_found', 'easy_apply', 'attempted', 'applied', 'duplicates', 'seconds', 'pages']
+
+def migrate_run_statistics(cursor: sqlite3.Cursor):
+    """Keep per-run totals and per-(position, location) yield aggregates"""
+    counters = ',\n'.join(f'    {column} {"REAL" if column == "seconds" else "INTEGER"} DEFAULT 0'
+                           for column in SEARCH_COUNTERS)
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        finished_at TIMESTAMP,
+        status TEXT DEFAULT 'running',
+        searches INTEGER DEFAULT 0,
+{counters}
+    )
+    ''')
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS search_yield (
+        position TEXT NOT NULL COLLATE NOCASE,
+        location TEXT NOT NULL COLLATE NOCASE,
+        searches INTEGER DEFAULT 0,
+{counters},
+        last_run_id INTEGER,
+        last_searched_at TIMESTAMP,
+        PRIMARY KEY (position, location)
+    )
+    ''')
+
+def migrate_search_pages(cursor: sqlite3.Cursor):
+    """Count result pages per search so page budgets can be sized from history"""
+    for table in ('runs', 'search_yield'):
+        columns = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+        if 'pages' not in columns:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN pages INTEGER DEFAULT 0')
+
+def migrate_search_watermarks(cursor: sqlite3.Cursor):
+    """Remember the newest LinkedIn job id seen per (position, location) for incremental searches"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS search_watermarks (
+        position TEXT NOT NULL COLLATE NOCASE,
+        location TEXT NOT NULL COLLATE NOCASE,
+        newest_job_id INTEGER NOT NULL,
+        updated_at TIMESTAMP,
+        PRIMARY KEY (position, location)
+    )
+    ''')
+
+def migrate_watermark_ranges(cursor: sqlite3.Cursor):
+    """Keep the oldest job id of the range each incremental search scanned without gaps"""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(search_watermarks)')}
+    if 'oldest_job_id' not in columns:
+        cursor.execute('ALTER TABLE search_watermarks ADD COLUMN oldest_job_id INTEGER')
+        # Older marks may have been set by scans cut off after their first page, so only the newest id is trusted
+        cursor.execute('UPDATE search_watermarks SET oldest_job_id = newest_job_id')
+
+def migrate_rate_limits(cursor: sqlite3.Cursor):
+    """Persist the application pacing token bucket and daily counter (see rate_governor)"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS rate_limits (
+        name TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        day TEXT NOT NULL,
+        day_count INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+
+def migrate_updated_at_utc(cursor: sqlite3.Cursor):
+    """Convert updated_at values copied from the local-time application_date to UTC"""
+    # Rows changed since then carry trigger timestamps, which never equal application_date
+    cursor.execute('''
+    UPDATE applications SET updated_at = strftime('%Y-%m-%d %H:%M:%f', application_date, 'utc')
+    WHERE application_date IS NOT NULL AND updated_at = application_date
+    ''')
+    # An export mark ahead of the clock would hide every change made until the clock passes it
+    cursor.execute('''
+    UPDATE export_state SET last_updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+    WHERE last_updated_at > strftime('%Y-%m-%d %H:%M:%f', 'now')
+    ''')
+
+def fts_query(text: str) -> str:
+    """Quote each word so user input like 'C++' or 'node.js' is not parsed as FTS5 syntax"""
+    terms = []
+    for word in text.split():
+        # A trailing * keeps prefix search available
+        prefix = word.endswith('*') and len(word) > 1
+        word = word.rstrip('*') if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+# Schema migrations in order; the database's PRAGMA user_version records how many were applied
+SCHEMA_MIGRATIONS = [
+    migrate_job_id_and_indexes,
+    migrate_updated_at,
+    migrate_description_search,
+    migrate_job_fingerprints,
+    migrate_run_statistics,
+    migrate_search_pages,
+    migrate_search_watermarks,
+    migrate_watermark_ranges,
+    migrate_rate_limits,
+    migrate_updated_at_utc
+]
+
+class ConnectionManager:
+    """
+    Process-wide SQLite connections for one database file.
+    Each thread gets its own persistent connection in WAL mode, so readers
+    never block the writer and concurrent writers wait on the busy timeout
+    instead of failing with "database is locked".
+    """
+    _managers = {}
+    _managers_lock = threading.Lock()
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.pid = os.getpid()
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+        self.schema_lock = threading.Lock()
+        self.schema_ready = False
+    
+    @classmethod
+    def for_path(cls, db_path: str) -> 'ConnectionManager':
+        """Return the shared manager for a database file"""
+        key = os.path.abspath(db_path)
+        with cls._managers_lock:
+            manager = cls._managers.get(key)
+            # Connections must not be shared with forked child processes
+            if manager is None or manager.pid != os.getpid():
+                manager = cls(db_path)
+                cls._managers[key] = manager
+            return manager
+    
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; write transactions are opened explicitly by transaction()
+            conn = sqlite3.connect(self.db_path, timeout=Config.DATABASE_BUSY_TIMEOUT_MS / 1000,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(Config.DATABASE_BUSY_TIMEOUT_MS)}')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-16000')
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """Run statements in a write transaction, committing on success"""
+        conn = self.connection()
+        # IMMEDIATE takes the write lock up front, so lock waits go through busy_timeout
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn.cursor()
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def initialize(self, init_schema):
+        """Run schema initialisation once per process"""
+        with self.schema_lock:
+            if not self.schema_ready:
+                init_schema()
+                self.schema_ready = True
+    
+    def close_thread(self):
+        """Close the calling thread's connection; threads that exit must call it or the connection leaks"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            return
+        self.local.conn = None
+        with self.lock:
+            self.connections = [other for other in self.connections if other is not conn]
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    def close_all(self):
+        """Close every connection opened by this manager"""
+        with self.lock:
+            for conn in self.connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self.connections = []
+            self.local = threading.local()
+
 class JobDatabase:
-    def __init__(self):
-        self.db_path = Config.DATABASE_PATH
-        self.init_database()
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.connections = ConnectionManager.for_path(self.db_path)
+        self.connections.initialize(self.init_database)
+    
+    def connection(self) -> sqlite3.Connection:
+        """Shared connection for reads on the current thread"""
+        return self.connections.connection()
+    
+    def transaction(self):
+        """Write transaction on the shared connection"""
+        return self.connections.transaction()
     
     def init_database(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.transaction() as cursor:
+            self.create_tables(cursor)
+        self.apply_migrations()
+    
+    def apply_migrations(self) -> int:
+        """Apply pending schema migrations to existing databases, returns the schema version"""
+        conn = self.connection()
+        
+        for version, migration in enumerate(SCHEMA_MIGRATIONS, 1):
+            # Re-check inside the write lock in case another process migrated first
+            with self.transaction() as cursor:
+                current_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+                if current_version >= version:
+                    continue
+                print(f"Migrating database to schema version {version}: {migration.__doc__}")
+                migration(cursor)
+                cursor.execute(f'PRAGMA user_version = {version}')
+        
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    
+    def create_tables(self, cursor: sqlite3.Cursor):
+        """Create tables that don't exist yet"""
         
         # Applications table
         cursor.execute('''
@@ -42,105 +429,496 @@ class JobDatabase:
         )
         ''')
         
-        conn.commit()
-        conn.close()
+        # High-water marks of incremental exports, per output file
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS export_state (
+            target TEXT PRIMARY KEY,
+            last_updated_at TIMESTAMP
+        )
+        ''')
+        
+        # LLM screening results, cached by LinkedIn job id
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_screenings (
+            job_id TEXT PRIMARY KEY,
+            fit_score INTEGER,
+            reason TEXT,
+            screened_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
     
     def add_job_application(self, job_data: Dict) -> int:
         """Add a new job application to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-            INSERT INTO applications 
-            (job_title, company, url, location, requirements, missing_info, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                job_data.get('title', ''),
-                job_data.get('company', ''),
-                job_data.get('url', ''),
-                job_data.get('location', ''),
-                json.dumps(job_data.get('requirements', [])),
-                json.dumps(job_data.get('missing_info', [])),
-                job_data.get('status', 'pending')
-            ))
-            
-            application_id = cursor.lastrowid
-            conn.commit()
-            return application_id
+            with self.transaction() as cursor:
+                cursor.execute('''
+                INSERT INTO applications 
+                (job_title, company, url, job_id, location, description, requirements, missing_info, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    job_data.get('title', ''),
+                    job_data.get('company', ''),
+                    job_data.get('url', ''),
+                    normalize_job_id(job_data.get('url', '')),
+                    job_data.get('location', ''),
+                    job_data.get('description', ''),
+                    json.dumps(job_data.get('requirements', [])),
+                    json.dumps(job_data.get('missing_info', [])),
+                    job_data.get('status', 'pending')
+                ))
+                update_fingerprints(cursor, [job_data.get('url', '')])
+                return cursor.lastrowid
             
         except sqlite3.IntegrityError:
             # Job already exists
             return None
-        finally:
-            conn.close()
+    
+    def add_job_applications(self, jobs: List[Dict]) -> Dict[str, Dict[str, int]]:
+        """
+        Insert or update a batch of jobs in a single transaction.
+        Existing rows (same URL) get refreshed details but keep their status.
+        Returns {'new': {url: id}, 'existing': {url: id}}
+        """
+        if not any(job.get('url') for job in jobs):
+            return {'new': {}, 'existing': {}}
+        
+        with self.transaction() as cursor:
+            return self.upsert_jobs(cursor, jobs)
+    
+    def upsert_jobs(self, cursor: sqlite3.Cursor, jobs: List[Dict]) -> Dict[str, Dict[str, int]]:
+        """Insert or update jobs inside the caller's transaction"""
+        # Last occurrence wins for URLs repeated within the batch
+        jobs_by_url = {job['url']: job for job in jobs if job.get('url')}
+        urls = list(jobs_by_url)
+        result = {'new': {}, 'existing': {}}
+        if not urls:
+            return result
+        
+        result['existing'] = self.get_ids_by_url(cursor, urls)
+        
+        cursor.executemany('''
+        INSERT INTO applications 
+        (job_title, company, url, job_id, location, description, requirements, missing_info, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            job_title = COALESCE(NULLIF(excluded.job_title, ''), job_title),
+            company = COALESCE(NULLIF(excluded.company, ''), company),
+            location = COALESCE(NULLIF(excluded.location, ''), location),
+            description = COALESCE(NULLIF(excluded.description, ''), description),
+            requirements = COALESCE(NULLIF(excluded.requirements, '[]'), requirements),
+            missing_info = COALESCE(NULLIF(excluded.missing_info, '[]'), missing_info)
+        ''', [
+            (
+                job.get('title', ''),
+                job.get('company', ''),
+                url,
+                normalize_job_id(url),
+                job.get('location', ''),
+                job.get('description', ''),
+                json.dumps(job.get('requirements', [])),
+                json.dumps(job.get('missing_info', [])),
+                job.get('status', 'pending')
+            )
+            for url, job in jobs_by_url.items()
+        ])
+        
+        new_urls = [url for url in urls if url not in result['existing']]
+        result['new'] = self.get_ids_by_url(cursor, new_urls)
+        update_fingerprints(cursor, urls)
+        
+        return result
+    
+    def get_ids_by_url(self, cursor: sqlite3.Cursor, urls: List[str]) -> Dict[str, int]:
+        """Map URLs to application ids for the rows that exist"""
+        ids = {}
+        # Stay below SQLite's host parameter limit
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'SELECT url, id FROM applications WHERE url IN ({placeholders})', chunk)
+            ids.update(cursor.fetchall())
+        return ids
     
     def mark_as_applied(self, application_id: int):
         """Mark application as successfully applied"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        with self.transaction() as cursor:
+            cursor.execute('''
+            UPDATE applications 
+            SET applied = TRUE, application_date = ?, status = 'applied'
+            WHERE id = ?
+            ''', (datetime.now(), application_id))
+    
+    def mark_applied_by_url(self, cursor: sqlite3.Cursor, urls: List[str]):
+        """Mark applications as applied by URL inside the caller's transaction"""
+        applied_at = datetime.now()
+        cursor.executemany('''
         UPDATE applications 
         SET applied = TRUE, application_date = ?, status = 'applied'
-        WHERE id = ?
-        ''', (datetime.now(), application_id))
-        
-        conn.commit()
-        conn.close()
+        WHERE url = ?
+        ''', [(applied_at, url) for url in urls])
     
-    def get_unapplied_jobs(self) -> List[Dict]:
-        """Get all jobs that haven't been applied to yet"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def iter_unapplied_jobs(self, chunk_size: int = 1000) -> Iterator[JobRecord]:
+        """Yield jobs that haven't been applied to yet, newest first"""
+        cursor = self.connection().cursor()
+        cursor.row_factory = job_record_factory
         
         cursor.execute('''
-        SELECT * FROM applications 
+        SELECT id, job_title, company, url, job_id, location, applied, status, requirements, missing_info, created_at
+        FROM applications 
         WHERE applied = FALSE 
         ORDER BY created_at DESC
         ''')
         
-        jobs = []
-        for row in cursor.fetchall():
-            jobs.append({
+        while True:
+            records = cursor.fetchmany(chunk_size)
+            if not records:
+                break
+            yield from records
+    
+    def get_unapplied_jobs(self) -> List[JobRecord]:
+        """Get all jobs that haven't been applied to yet"""
+        return list(self.iter_unapplied_jobs())
+    
+    def export_to_txt(self, filename: str = 'job_applications.txt'):
+        """Export all job applications to a text file"""
+        self.export(filename, 'txt')
+    
+    def iter_applications(self, status=None, since: str = None, until: str = None, location: str = None,
+                          changed_since: str = None, chunk_size: int = 1000) -> Iterator[List[JobRecord]]:
+        """
+        Yield chunks of application records (EXPORT_COLUMNS only) matching the filters.
+        status can be a single status or a list; since/until bound created_at;
+        location matches case-insensitively as a substring.
+        """
+        conditions = []
+        params = []
+        
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            conditions.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if since:
+            conditions.append('created_at >= ?')
+            params.append(since)
+        if until:
+            conditions.append('created_at <= ?')
+            params.append(until)
+        if location:
+            conditions.append('location LIKE ?')
+            params.append(f'%{location}%')
+        if changed_since:
+            conditions.append('updated_at > ?')
+            params.append(changed_since)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        order = 'updated_at ASC' if changed_since is not None else 'created_at DESC'
+        
+        # A dedicated cursor keeps this iteration independent of other queries on the connection
+        cursor = self.connection().cursor()
+        cursor.row_factory = job_record_factory
+        cursor.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM applications {where} ORDER BY {order}", params)
+        
+        while True:
+            records = cursor.fetchmany(chunk_size)
+            if not records:
+                break
+            yield records
+    
+    def export(self, filename: str, export_format: str = None, status=None, since: str = None,
+               until: str = None, location: str = None, incremental: bool = False,
+               chunk_size: int = 1000) -> int:
+        """
+        Stream applications to TXT, CSV, JSONL, Parquet or Arrow (format inferred from the extension).
+        With incremental=True only rows changed since the previous export to the same file are appended.
+        Returns the number of rows written.
+        """
+        target = f"{os.path.abspath(filename)}"
+        changed_since = None
+        if incremental:
+            row = self.connection().execute(
+                'SELECT last_updated_at FROM export_state WHERE target = ?', (target,)
+            ).fetchone()
+            # Empty string sorts before every timestamp, so the first run exports everything
+            changed_since = row[0] if row and row[0] else ''
+        
+        writer = get_report_writer(filename, export_format, append=incremental)
+        written = 0
+        last_updated_at = changed_since
+        
+        writer.open()
+        try:
+            for rows in self.iter_applications(status, since, until, location, changed_since, chunk_size):
+                writer.write_rows(rows)
+                written += len(rows)
+                if incremental:
+                    last_updated_at = max(last_updated_at, max(row.updated_at or '' for row in rows))
+        finally:
+            writer.close()
+        
+        if incremental:
+            with self.transaction() as cursor:
+                cursor.execute('''
+                INSERT INTO export_state (target, last_updated_at) VALUES (?, ?)
+                ON CONFLICT(target) DO UPDATE SET last_updated_at = excluded.last_updated_at
+                ''', (target, last_updated_at))
+        
+        print(f"Report exported to {filename} ({written} {'changed ' if incremental else ''}rows)")
+        return written
+    
+    def search_jobs(self, query: str, location: str = None, status=None, applied: bool = None,
+                    limit: int = 20) -> List[Dict]:
+        """
+        Full-text search over job title, company and description, best matches first.
+        Words are ANDed; a trailing * matches prefixes (e.g. 'kotlin andr*').
+        """
+        conditions = []
+        params = []
+        if location:
+            conditions.append('a.location LIKE ?')
+            params.append(f'%{location}%')
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            conditions.append(f"a.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if applied is not None:
+            conditions.append('a.applied = ?')
+            params.append(bool(applied))
+        
+        columns = 'a.id, a.job_title, a.company, a.location, a.url, a.status, a.applied'
+        conn = self.connection()
+        
+        try:
+            rows = conn.execute(f'''
+            SELECT {columns}, snippet(applications_fts, 2, '[', ']', '...', 12), bm25(applications_fts)
+            FROM applications_fts JOIN applications a ON a.id = applications_fts.rowid
+            WHERE applications_fts MATCH ? {''.join(' AND ' + condition for condition in conditions)}
+            ORDER BY bm25(applications_fts)
+            LIMIT ?
+            ''', [fts_query(query)] + params + [limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            if 'no such table' not in str(e):
+                raise
+            # SQLite built without FTS5: unranked full scan
+            words = query.split()
+            like_conditions = ["(a.job_title || ' ' || a.company || ' ' || COALESCE(a.description, '')) LIKE ?"] * len(words)
+            like_params = [f"%{word.rstrip('*')}%" for word in words]
+            rows = conn.execute(f'''
+            SELECT {columns}, substr(COALESCE(a.description, ''), 1, 80), 0
+            FROM applications a
+            WHERE {' AND '.join(like_conditions + conditions) or '1'}
+            ORDER BY a.created_at DESC
+            LIMIT ?
+            ''', like_params + params + [limit]).fetchall()
+        
+        return [
+            {
                 'id': row[0],
                 'title': row[1],
                 'company': row[2],
-                'url': row[3],
-                'location': row[4],
-                'requirements': json.loads(row[7]) if row[7] else [],
-                'missing_info': json.loads(row[8]) if row[8] else [],
-                'status': row[9]
-            })
+                'location': row[3],
+                'url': row[4],
+                'status': row[5],
+                'applied': bool(row[6]),
+                'snippet': row[7],
+                'rank': row[8]
+            }
+            for row in rows
+        ]
+    
+    def find_duplicate(self, job: Dict, max_distance: int = None, fingerprint: Dict = None) -> Optional[str]:
+        """
+        URL of an applied posting that is likely the same job: same normalized
+        (company, title, location) or a description SimHash within max_distance bits.
+        """
+        max_distance = Config.DUPLICATE_MAX_DISTANCE if max_distance is None else max_distance
+        fingerprint = fingerprint or job_fingerprint(job)
+        if not fingerprint['key'] and fingerprint['simhash'] is None:
+            return None
         
-        conn.close()
-        return jobs
+        # CROSS JOIN keeps job_fingerprints as the outer table, so each OR branch is served by its own index
+        cursor = self.connection().cursor()
+        cursor.execute(f'''
+        SELECT f.url, f.posting_key, f.simhash FROM job_fingerprints f
+        CROSS JOIN applications a ON a.url = f.url
+        WHERE a.applied = TRUE AND (f.posting_key = ? OR {' OR '.join(f'f.band{band} = ?' for band in range(SIMHASH_BANDS))})
+        ''', (fingerprint['key'], *fingerprint['bands']))
+        
+        for url, key, value in cursor.fetchall():
+            if key == fingerprint['key']:
+                return url
+            if value is not None and fingerprint['simhash'] is not None and \
+                    hamming_distance(value, fingerprint['simhash']) <= max_distance:
+                return url
+        return None
     
-    def export_to_txt(self, filename: str = 'job_applications.txt'):
-        """Export all job applications to a text file"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_applied_companies(self) -> Set[str]:
+        """Names of the companies with at least one application"""
+        cursor = self.connection().execute('SELECT DISTINCT company FROM applications WHERE applied = TRUE')
+        return {company for (company,) in cursor.fetchall() if company}
+    
+    def start_run(self) -> int:
+        """Open a row for a new run and return its id"""
+        with self.transaction() as cursor:
+            cursor.execute('INSERT INTO runs DEFAULT VALUES')
+            return cursor.lastrowid
+    
+    def finish_run(self, run_id: int, status: str = 'finished'):
+        """Close a run row"""
+        with self.transaction() as cursor:
+            cursor.execute('UPDATE runs SET finished_at = ?, status = ? WHERE id = ?',
+                           (datetime.now(), status, run_id))
+    
+    def add_search_stats(self, cursor: sqlite3.Cursor, searches: List[Dict]):
+        """
+        Add the counters of finished searches ({'run_id', 'position', 'location', 'jobs_found', ...})
+        to their run row and their (position, location) aggregate, inside the caller's transaction.
+        """
+        searched_at = datetime.now()
+        values = [[search.get(column, 0) or 0 for column in SEARCH_COUNTERS] for search in searches]
+        increments = ', '.join(f'{column} = {column} + ?' for column in SEARCH_COUNTERS)
         
-        cursor.execute('SELECT * FROM applications ORDER BY created_at DESC')
+        cursor.executemany(f'UPDATE runs SET searches = searches + 1, {increments} WHERE id = ?',
+                           [row + [search.get('run_id')] for search, row in zip(searches, values)])
+        cursor.executemany(f'''
+        INSERT INTO search_yield (position, location, searches, {', '.join(SEARCH_COUNTERS)}, last_run_id, last_searched_at)
+        VALUES (?, ?, 1, {', '.join('?' * len(SEARCH_COUNTERS))}, ?, ?)
+        ON CONFLICT(position, location) DO UPDATE SET
+            searches = searches + 1,
+            {', '.join(f'{column} = {column} + excluded.{column}' for column in SEARCH_COUNTERS)},
+            last_run_id = excluded.last_run_id,
+            last_searched_at = excluded.last_searched_at
+        ''', [
+            [search.get('position', ''), search.get('location', '')] + row + [search.get('run_id'), searched_at]
+            for search, row in zip(searches, values)
+        ])
+    
+    def get_search_stats(self, position: str = None, location: str = None, order_by: str = 'applications_per_minute',
+                         limit: int = 20) -> List[Dict]:
+        """
+        Yield per (position, location) with derived rates, best first.
+        order_by is one of applications_per_minute, success_rate, easy_apply_rate, applied, searches.
+        """
+        orderings = ['applications_per_minute', 'success_rate', 'easy_apply_rate', 'applied', 'searches']
+        if order_by not in orderings:
+            raise ValueError(f"Unsupported ordering: {order_by}. Supported: {', '.join(orderings)}")
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("JOB APPLICATIONS REPORT\n")
-            f.write("=" * 50 + "\n\n")
-            
-            for row in cursor.fetchall():
-                f.write(f"Job Title: {row[1]}\n")
-                f.write(f"Company: {row[2]}\n")
-                f.write(f"URL: {row[3]}\n")
-                f.write(f"Location: {row[4]}\n")
-                f.write(f"Applied: {'Yes' if row[5] else 'No'}\n")
-                f.write(f"Status: {row[9]}\n")
-                
-                if row[8]:  # missing_info
-                    missing = json.loads(row[8])
-                    if missing:
-                        f.write(f"Missing Information: {', '.join(missing)}\n")
-                
-                f.write("-" * 30 + "\n\n")
-        
-        conn.close()
-        print(f"Report exported to {filename}")
\ No newline at end of file
+        conditions = []
+        params = []
+        if position:
+            conditions.append('position = ?')
+            params.append(position)
+        if location:
+            conditions.append('location = ?')
+            params.append(location)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        cursor = self.connection().cursor()
+        cursor.execute(f'''
+        SELECT position, location, searches, {', '.join(SEARCH_COUNTERS)}, last_searched_at,
+            1.0 * easy_apply / NULLIF(jobs_found, 0) AS easy_apply_rate,
+            1.0 * applied / NULLIF(attempted, 0) AS success_rate,
+            seconds / NULLIF(applied, 0) AS seconds_per_application,
+            60.0 * applied / NULLIF(seconds, 0) AS applications_per_minute
+        FROM search_yield {where}
+        ORDER BY {order_by} DESC NULLS LAST, searches DESC
+        LIMIT ?
+        ''', params + [limit])
+        
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_search_yield(self) -> Dict[Tuple[str, str], Dict]:
+        """Raw counters of every (position, location) searched so far, keyed by the lowercased pair"""
+        cursor = self.connection().cursor()
+        cursor.execute(f'SELECT position, location, searches, {", ".join(SEARCH_COUNTERS)} FROM search_yield')
+        
+        columns = [column[0] for column in cursor.description]
+        return {
+            (row[0].lower(), row[1].lower()): dict(zip(columns, row))
+            for row in cursor.fetchall()
+        }
+    
+    def get_search_watermark(self, position: str, location: str) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        (newest, oldest) job ids an incremental search has scanned without gaps, or None
+        before the first one. oldest is None once a scan reached the end of the results.
+        """
+        row = self.connection().execute(
+            'SELECT newest_job_id, oldest_job_id FROM search_watermarks WHERE position = ? AND location = ?',
+            (position, location)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+    
+    def update_search_watermarks(self, cursor: sqlite3.Cursor,
+                                 watermarks: List[Tuple[str, str, int, Optional[int]]]):
+        """Store the scanned ranges of (position, location, newest_job_id, oldest_job_id) inside the caller's transaction"""
+        updated_at = datetime.now()
+        cursor.executemany('''
+        INSERT INTO search_watermarks (position, location, newest_job_id, oldest_job_id, updated_at) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(position, location) DO UPDATE SET
+            newest_job_id = MAX(newest_job_id, excluded.newest_job_id),
+            oldest_job_id = excluded.oldest_job_id,
+            updated_at = excluded.updated_at
+        ''', [(position, location, newest, oldest, updated_at) for position, location, newest, oldest in watermarks])
+    
+    def get_run_stats(self, limit: int = 10) -> List[Dict]:
+        """Most recent runs with their totals and derived rates"""
+        cursor = self.connection().cursor()
+        cursor.execute(f'''
+        SELECT id, started_at, finished_at, status, searches, {', '.join(SEARCH_COUNTERS)},
+            1.0 * easy_apply / NULLIF(jobs_found, 0) AS easy_apply_rate,
+            1.0 * applied / NULLIF(attempted, 0) AS success_rate,
+            seconds / NULLIF(applied, 0) AS seconds_per_application
+        FROM runs ORDER BY id DESC LIMIT ?
+        ''', (limit,))
+        
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_screened_job_ids(self, job_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of job ids that already have a screening result"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return set()
+        
+        cursor = self.connection().cursor()
+        
+        screened = set()
+        # Stay below SQLite's host parameter limit
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'SELECT job_id FROM job_screenings WHERE job_id IN ({placeholders})', chunk)
+            screened.update(row[0] for row in cursor.fetchall())
+        
+        return screened
+    
+    def save_screenings(self, screenings: Dict[str, Dict]):
+        """Store fit score and reason per job id"""
+        if not screenings:
+            return
+        
+        with self.transaction() as cursor:
+            self.write_screenings(cursor, screenings)
+    
+    def write_screenings(self, cursor: sqlite3.Cursor, screenings: Dict[str, Dict]):
+        """Store screening results inside the caller's transaction"""
+        cursor.executemany('''
+        INSERT OR REPLACE INTO job_screenings (job_id, fit_score, reason, screened_at)
+        VALUES (?, ?, ?, ?)
+        ''', [
+            (job_id, result.get('fit_score'), result.get('reason', ''), datetime.now())
+            for job_id, result in screenings.items()
+        ])
+    
+    def get_screenings(self) -> Dict[str, Dict]:
+        """Get all screening results keyed by job id"""
+        cursor = self.connection().cursor()
+        
+        cursor.execute('SELECT job_id, fit_score, reason FROM job_screenings')
+        screenings = {
+            row[0]: {'fit_score': row[1], 'reason': row[2]}
+            for row in cursor.fetchall()
+        }
+        
+        return screenings
\ No newline at end of file
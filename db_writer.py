@@ -0,0 +1,175 @@
+import atexit
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+from config import Config
+from database import JobDatabase
+
+# Queue markers handled by the writer thread itself
+FLUSH = 'flush'
+STOP = 'stop'
+
+class DatabaseWriter:
+    """
+    Asynchronous writer for JobDatabase.
+    Writes are queued and committed by a dedicated thread in batched
+    transactions, so the scraping loop never waits on disk. The queue is
+    bounded: when it is full, callers block until the writer catches up.
+    Call flush() before reading data that was just queued.
+    """
+
+    def __init__(self, db: JobDatabase = None, max_queue_size: int = None,
+                 batch_size: int = None, flush_interval: float = None):
+        self.db = db or JobDatabase()
+        self.batch_size = batch_size or Config.DB_WRITER_BATCH_SIZE
+        self.flush_interval = Config.DB_WRITER_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.queue = queue.Queue(maxsize=max_queue_size or Config.DB_WRITER_QUEUE_SIZE)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.closed = False
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        atexit.register(self.close)
+
+    def start(self):
+        """Start the writer thread if it is not running"""
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("DatabaseWriter is closed")
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='DatabaseWriter', daemon=True)
+                self.thread.start()
+
+    def enqueue(self, operation: str, payload):
+        """Queue a write, blocking while the queue is full (backpressure)"""
+        if self.closed:
+            raise RuntimeError("DatabaseWriter is closed")
+        self.start()
+        self.queue.put((operation, payload))
+
+    def add_job(self, job_data: Dict):
+        """Queue a discovered job for insert or update by URL"""
+        self.enqueue('add_job', job_data)
+
+    def mark_applied(self, url: str):
+        """Queue marking the application with this URL as applied"""
+        self.enqueue('mark_applied', url)
+
+    def record_search(self, search: Dict):
+        """Queue the counters of a finished (position, location) search for the run statistics"""
+        self.enqueue('record_search', search)
+
+    def update_search_watermark(self, position: str, location: str, newest_job_id: int, oldest_job_id: Optional[int]):
+        """Queue the job id range a (position, location) search has scanned without gaps"""
+        self.enqueue('update_watermark', (position, location, newest_job_id, oldest_job_id))
+
+    def save_screenings(self, screenings: Dict[str, Dict]):
+        """Queue screening results keyed by job id"""
+        if screenings:
+            self.enqueue('save_screenings', screenings)
+
+    def flush(self):
+        """Block until every queued write has been committed"""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        # The marker makes the writer commit its partial batch immediately
+        self.queue.put((FLUSH, None))
+        self.queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            thread = self.thread
+
+        if thread is not None and thread.is_alive():
+            self.queue.put((STOP, None))
+            self.queue.join()
+            thread.join()
+
+        if self.dropped:
+            print(f"Warning: {self.dropped} database writes failed and were dropped")
+
+    def run(self):
+        """Writer thread: collect queued writes into batches and commit them"""
+        stopping = False
+        try:
+            while not stopping:
+                operation = self.queue.get()
+                batch = []
+                markers = 0
+                deadline = time.monotonic() + self.flush_interval
+
+                while True:
+                    if operation[0] in (FLUSH, STOP):
+                        markers += 1
+                        stopping = stopping or operation[0] == STOP
+                        break
+                    batch.append(operation)
+
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        operation = self.queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    self.write_batch(batch)
+                for _ in range(len(batch) + markers):
+                    self.queue.task_done()
+        finally:
+            self.db.connections.close_thread()
+
+    def write_batch(self, batch: List):
+        """Commit a batch in one transaction, retrying writes one by one on failure"""
+        try:
+            with self.db.transaction() as cursor:
+                self.apply(cursor, batch)
+            self.written += len(batch)
+            self.batches += 1
+            return
+        except Exception as e:
+            print(f"Warning: Batched database write failed, retrying individually: {e}")
+
+        for operation in batch:
+            try:
+                with self.db.transaction() as cursor:
+                    self.apply(cursor, [operation])
+                self.written += 1
+            except Exception as e:
+                self.dropped += 1
+                print(f"Warning: Dropped database write {operation[0]}: {e}")
+
+    def apply(self, cursor, batch: List):
+        """Run queued writes in order, grouping consecutive writes of the same kind"""
+        index = 0
+        while index < len(batch):
+            kind = batch[index][0]
+            end = index
+            while end < len(batch) and batch[end][0] == kind:
+                end += 1
+            payloads = [payload for _, payload in batch[index:end]]
+
+            if kind == 'add_job':
+                self.db.upsert_jobs(cursor, payloads)
+            elif kind == 'mark_applied':
+                self.db.mark_applied_by_url(cursor, payloads)
+            elif kind == 'record_search':
+                self.db.add_search_stats(cursor, payloads)
+            elif kind == 'update_watermark':
+                self.db.update_search_watermarks(cursor, payloads)
+            elif kind == 'save_screenings':
+                merged = {}
+                for screenings in payloads:
+                    merged.update(screenings)
+                self.db.write_screenings(cursor, merged)
+            else:
+                raise ValueError(f"Unknown database write: {kind}")
+
+            index = end
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import zlib
+from importlib import metadata
+from typing import Optional
+from config import Config
+
+class ExtractionCache:
+    """
+    Content-addressed cache of extracted PDF text.
+    Entries are keyed by file hash, backend and backend version, stored
+    zlib-compressed and evicted least-recently-used beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or Config.EXTRACTION_CACHE_DIR
+        self.max_bytes = Config.EXTRACTION_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """SHA-256 of the file contents"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def backend_version(backend: str) -> str:
+        """Installed version of a backend package, read without importing it"""
+        try:
+            return metadata.version(backend)
+        except metadata.PackageNotFoundError:
+            return 'unknown'
+
+    def entry_path(self, file_hash: str, backend: str) -> str:
+        """Path of the cache entry for a file hash and backend"""
+        key = hashlib.sha256(f"{file_hash}:{backend}:{self.backend_version(backend)}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.zz")
+
+    def get(self, file_hash: str, backend: str) -> Optional[str]:
+        """Return cached text for a file hash and backend, or None"""
+        path = self.entry_path(file_hash, backend)
+        try:
+            with open(path, 'rb') as file:
+                text = zlib.decompress(file.read()).decode('utf-8')
+            # Refresh mtime so eviction is least-recently-used
+            os.utime(path)
+            return text
+        except (OSError, zlib.error, UnicodeDecodeError):
+            return None
+
+    def put(self, file_hash: str, backend: str, text: str):
+        """Store extracted text and evict old entries beyond the size limit"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.entry_path(file_hash, backend)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as file:
+                file.write(zlib.compress(text.encode('utf-8'), 9))
+            os.replace(temp_path, path)
+            self.evict()
+        except OSError as e:
+            print(f"Warning: Could not write extraction cache: {e}")
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.zz'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except OSError:
+                continue
@@ -1,20 +1,125 @@
 import time
-import random
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List
+from config import Config
 from cv_analyzer import CVAnalyzer
 from linkedin_scraper import LinkedInScraper
 from database import JobDatabase
+from db_writer import DatabaseWriter
+from search_scheduler import SearchScheduler
+from rate_governor import ApplicationGovernor
+from card_filter import CardFilter
 from job_search_helper import JobSearchHelper
+from llm_backend import LLMBackend
 import json
 
+if TYPE_CHECKING:
+    # cProfile and pstats are only imported by runs with --profile (see main.py)
+    from stage_profiler import StageProfiler
+
 class JobAgent:
-    def __init__(self):
-        self.cv_analyzer = CVAnalyzer()
-        self.linkedin_scraper = LinkedInScraper()
-        self.db = JobDatabase()
+    def __init__(self, llm_backend: LLMBackend = None, db_path: str = None,
+                 report_path: str = 'job_applications_report.txt', browser_profile_dir: str = None,
+                 interactive: bool = True, profiler: 'StageProfiler' = None):
+        self.cv_analyzer = CVAnalyzer(llm_backend)
+        self.db = JobDatabase(db_path)
+        self.db_writer = DatabaseWriter(self.db)
+        self.linkedin_scraper = LinkedInScraper(self.db_writer, browser_profile_dir)
+        self.report_path = report_path
+        # Batch runs have nobody at the terminal for the manual search helper
+        self.interactive = interactive
+        # Set by 'main.py --profile': every timed stage is also profiled
+        self.profiler = profiler
         self.cv_data = {}
         self.matched_positions = []
         self.user_info = {}
+        self.timings = {}
+        self.run_id = None
+        # Background browser startup, see start_browser()
+        self.browser_executor = None
+        self.browser_future = None
+        self.browser_seconds = None
+        self.browser_wait_seconds = None
+    
+    @contextmanager
+    def timed(self, stage: str):
+        """Accumulate wall-clock time spent in a stage of the run"""
+        start = time.perf_counter()
+        try:
+            if self.profiler:
+                with self.profiler.profile(stage):
+                    yield
+            else:
+                yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+    
+    def print_timing_summary(self):
+        """Print time per stage and extraction cache statistics"""
+        print("\nTIMING")
+        print("-" * 20)
+        for stage, seconds in self.timings.items():
+            print(f"{stage}: {seconds:.2f}s")
+        
+        cache = self.cv_analyzer.pdf_reader.cache
+        if cache:
+            print(f"CV text cache: {cache.hits} hits, {cache.misses} misses")
+        
+        if self.browser_seconds is not None:
+            print(f"Browser startup and login: {self.browser_seconds:.2f}s")
+            if self.browser_wait_seconds is not None:
+                saved = max(0.0, self.browser_seconds - self.browser_wait_seconds)
+                print(f"Saved by overlapping with CV analysis: {saved:.2f}s "
+                      f"(waited {self.browser_wait_seconds:.2f}s at the first search)")
+    
+    def start_browser(self):
+        """Start Chrome and log in on a background thread while the CV is analyzed"""
+        print("Starting browser in the background...")
+        self.browser_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='BrowserStartup')
+        self.browser_future = self.browser_executor.submit(self.prepare_browser_in_background)
+    
+    def prepare_browser_in_background(self) -> bool:
+        """prepare_browser on the startup thread, which closes its own database connection when done"""
+        try:
+            return self.prepare_browser()
+        finally:
+            self.db.connections.close_thread()
+    
+    def prepare_browser(self) -> bool:
+        """Set up the Chrome driver and log in, returns whether login succeeded"""
+        start = time.perf_counter()
+        try:
+            self.linkedin_scraper.setup_driver()
+            return self.linkedin_scraper.login()
+        finally:
+            self.browser_seconds = time.perf_counter() - start
+    
+    def wait_for_browser(self) -> bool:
+        """Join the background browser startup, or start the browser now if it was not started"""
+        if self.browser_future is None:
+            return self.prepare_browser()
+        
+        start = time.perf_counter()
+        try:
+            # Re-raises a driver setup failure from the background thread
+            return self.browser_future.result()
+        finally:
+            self.browser_wait_seconds = time.perf_counter() - start
+            self.browser_future = None
+            self.browser_executor.shutdown()
+    
+    def stop_browser(self):
+        """Close a browser started in the background that no search used"""
+        if self.browser_future is None:
+            return
+        try:
+            self.browser_future.result()
+        except Exception:
+            pass
+        self.browser_future = None
+        self.browser_executor.shutdown()
+        self.linkedin_scraper.close()
     
     def analyze_cv(self, cv_path: str) -> Dict:
         """Step 1: Analyze CV using Gemini API"""
@@ -38,26 +143,61 @@ class JobAgent:
         self.linkedin_scraper.set_user_info(user_info)
         print("User information set for applications")
     
-    def search_and_apply_jobs(self, locations: List[str]) -> Dict:
-        """Step 3 & 4: Search for jobs and apply to easy apply positions"""
+    def set_application_settings(self, settings: Dict, connections=None, name: str = 'applications'):
+        """
+        Pace and cap applications by delay_between_applications and max_applications_per_day.
+        The budget lives in this agent's database unless other connections are given.
+        """
+        governor = ApplicationGovernor.from_settings(connections or self.db.connections, settings, name)
+        self.linkedin_scraper.governor = governor
+        if governor.max_per_day:
+            print(f"Applications: one every {governor.delay_seconds:g}s, at most {governor.max_per_day} per day "
+                  f"({governor.remaining_today()} left today)")
+        else:
+            print(f"Applications: one every {governor.delay_seconds:g}s, no daily limit")
+    
+    def set_job_preferences(self, preferences: Dict):
+        """Card rules from excluded_companies, preferred_companies, excluded_titles and skip_applied_companies"""
+        skip_applied = preferences.get('skip_applied_companies', True)
+        applied_companies = self.db.get_applied_companies() if skip_applied else set()
+        card_filter = CardFilter.from_preferences(preferences, applied_companies)
+        self.linkedin_scraper.card_filter = card_filter
+        # Screening needs the descriptions even when storing them is turned off
+        self.linkedin_scraper.fetch_descriptions = bool(
+            preferences.get('fetch_descriptions', Config.FETCH_DESCRIPTIONS) or preferences.get('screen_jobs')
+        )
+        print(f"Card filter: {len(card_filter.excluded_companies)} excluded and "
+              f"{len(card_filter.preferred_companies)} preferred companies, "
+              f"{len(card_filter.excluded_titles)} excluded titles, "
+              f"{len(card_filter.applied_companies)} companies already applied to")
+    
+    def search_and_apply_jobs(self, locations: List[str], time_budget_minutes: float = None,
+                              incremental: bool = None) -> Dict:
+        """
+        Step 3 & 4: Search for jobs and apply to easy apply positions.
+        Searches are ordered and given page budgets by historical yield (see SearchScheduler).
+        """
         results = {
             'total_found': 0,
             'applications_attempted': 0,
             'applications_successful': 0,
-            'jobs_with_missing_info': 0
+            'jobs_with_missing_info': 0,
+            'duplicates_skipped': 0,
+            'jobs_filtered': 0,
+            'browser_restarts': 0
         }
         
-        # Setup LinkedIn scraper
+        # Setup LinkedIn scraper (joins the background startup when run_full_process began it)
         print("Setting up LinkedIn scraper...")
         try:
-            self.linkedin_scraper.setup_driver()
-            
-            if not self.linkedin_scraper.login():
+            if not self.wait_for_browser():
                 print("Failed to login to LinkedIn")
                 return results
                 
         except Exception as e:
             print(f"LinkedIn scraper setup failed: {e}")
+            if not self.interactive:
+                return results
             print("\nChrome automation encountered issues, switching to manual job search helper...")
             
             # Use the job search helper instead
@@ -66,55 +206,149 @@ class JobAgent:
             
             return results
         
+        if time_budget_minutes is None:
+            time_budget_minutes = Config.RUN_TIME_BUDGET_MINUTES
+        if incremental is None:
+            incremental = Config.INCREMENTAL_SEARCH
+        pairs = [(position['title'], location) for position in self.matched_positions for location in locations]
+        scheduler = SearchScheduler(self.db, pairs, time_budget=time_budget_minutes * 60 if time_budget_minutes else None)
+        
         try:
-            # Use fast workflow for each matched position in each location
-            for position in self.matched_positions:
-                for location in locations:
-                    print(f"\nFast applying for '{position['title']}' in {location}...")
-                    
-                    # Use the new fast search and apply method
-                    fast_results = self.linkedin_scraper.search_and_apply_jobs_fast(
-                        position['title'], 
-                        location, 
-                        self.user_info
-                    )
-                    
-                    # Update results
-                    results['total_found'] += fast_results.get('total_found', 0)
-                    results['applications_successful'] += fast_results.get('applied', 0)
-                    results['applications_attempted'] += fast_results.get('applied', 0) + fast_results.get('failed', 0)
-                    
-                    print(f"Applied to {fast_results.get('applied', 0)} jobs, failed on {fast_results.get('failed', 0)}")
-                    
-                    # Short delay between different position searches
-                    time.sleep(random.uniform(3, 5))
+            # Use fast workflow for each matched position in each location, best yield first
+            while True:
+                if self.linkedin_scraper.governor.remaining_today() == 0:
+                    print("Daily application limit reached, skipping the remaining searches")
+                    break
+                search = scheduler.next_search()
+                if search is None:
+                    break
+                position, location = search['position'], search['location']
+                print(f"\nFast applying for '{position}' in {location} (up to {search['max_pages']} pages)...")
+                
+                # Use the new fast search and apply method
+                search_start = time.perf_counter()
+                fast_results = self.linkedin_scraper.search_and_apply_jobs_fast(
+                    position, 
+                    location, 
+                    self.user_info,
+                    max_pages=search['max_pages'],
+                    deadline=search['deadline'],
+                    incremental=incremental
+                )
+                seconds = time.perf_counter() - search_start
+                self.record_search(position, location, fast_results, seconds)
+                scheduler.update(position, location, fast_results.get('applied', 0), seconds, fast_results.get('pages', 0))
+                
+                # Update results
+                results['total_found'] += fast_results.get('total_found', 0)
+                results['applications_successful'] += fast_results.get('applied', 0)
+                results['applications_attempted'] += fast_results.get('applied', 0) + fast_results.get('failed', 0)
+                results['duplicates_skipped'] += fast_results.get('duplicates', 0)
+                results['jobs_filtered'] += fast_results.get('filtered', 0)
+                results['browser_restarts'] += fast_results.get('browser_restarts', 0)
+                
+                print(f"Applied to {fast_results.get('applied', 0)} jobs, failed on {fast_results.get('failed', 0)}")
+                
+                # Without a browser every remaining search would return nothing
+                if fast_results.get('browser_failed'):
+                    print("The browser could not be restarted, stopping the run")
+                    break
         
         finally:
             self.linkedin_scraper.close()
         
         return results
     
+    def run_work_unit(self, unit: Dict, lease) -> Dict:
+        """Search and apply on one leased result page of a distributed run (see queue_runner)"""
+        if self.linkedin_scraper.governor.remaining_today() == 0:
+            print("Daily application limit reached, skipping this unit")
+            return {'applied': 0, 'failed': 0, 'total_found': 0, 'pages': 0, 'limit_reached': True, 'seconds': 0.0}
+        
+        # The browser stays open between units; the worker closes it
+        self.linkedin_scraper.lease = lease
+        start = time.perf_counter()
+        try:
+            results = self.linkedin_scraper.search_and_apply_jobs_fast(
+                unit['position'],
+                unit['location'],
+                self.user_info,
+                max_pages=1,
+                start_page=unit['page']
+            )
+        finally:
+            self.linkedin_scraper.lease = None
+        if results.get('browser_failed'):
+            # Fails the unit, so it is retried by this worker's next browser or another worker
+            raise RuntimeError("The browser could not be restarted")
+        results['seconds'] = time.perf_counter() - start
+        return results
+    
+    def record_search(self, position: str, location: str, fast_results: Dict, seconds: float):
+        """Queue the yield of one (position, location) search for the run statistics"""
+        self.db_writer.record_search({
+            'run_id': self.run_id,
+            'position': position,
+            'location': location,
+            'jobs_found': fast_results.get('total_found', 0),
+            'easy_apply': fast_results.get('easy_apply', 0),
+            'attempted': fast_results.get('applied', 0) + fast_results.get('failed', 0),
+            'applied': fast_results.get('applied', 0),
+            'duplicates': fast_results.get('duplicates', 0),
+            'seconds': seconds,
+            'pages': fast_results.get('pages', 0)
+        })
+    
+    def screen_discovered_jobs(self, batch_size: int = 10) -> Dict[str, Dict]:
+        """Optional step: score discovered jobs against the CV in batched LLM calls"""
+        jobs = [job for job in self.linkedin_scraper.discovered_jobs if job.get('job_id')]
+        
+        # Each posting is screened at most once across runs
+        self.db_writer.flush()
+        screened_ids = self.db.get_screened_job_ids(job['job_id'] for job in jobs)
+        pending = {}
+        for job in jobs:
+            if job['job_id'] not in screened_ids:
+                pending[job['job_id']] = job
+        
+        if not pending:
+            print("No new jobs to screen")
+            return {}
+        
+        print(f"Screening {len(pending)} jobs in batches of {batch_size}...")
+        screenings = self.cv_analyzer.screen_jobs(self.cv_data, list(pending.values()), batch_size)
+        self.db_writer.save_screenings(screenings)
+        print(f"Screened {len(screenings)} jobs ({len(screened_ids)} already cached)")
+        return screenings
+    
     def generate_reports(self):
         """Generate reports for jobs with missing information"""
         print("\nGenerating reports...")
         
+        # Reports must see every write queued during the run
+        self.db_writer.flush()
+        
         # Export to text file
-        self.db.export_to_txt('job_applications_report.txt')
+        self.db.export_to_txt(self.report_path)
         
-        # Get unapplied jobs for summary
-        unapplied_jobs = self.db.get_unapplied_jobs()
+        # Stream unapplied jobs for the summary, keeping only those with missing information
+        unapplied_count = 0
+        jobs_with_missing = []
+        for job in self.db.iter_unapplied_jobs():
+            unapplied_count += 1
+            if job.missing_info:
+                jobs_with_missing.append(job)
         
         print(f"\nSummary:")
-        print(f"Total unapplied jobs: {len(unapplied_jobs)}")
+        print(f"Total unapplied jobs: {unapplied_count}")
         
         # Show jobs with missing information
-        jobs_with_missing = [job for job in unapplied_jobs if job.get('missing_info')]
         if jobs_with_missing:
             print(f"\nJobs requiring additional information:")
             for job in jobs_with_missing:
-                print(f"- {job['title']} at {job['company']}")
-                print(f"  URL: {job['url']}")
-                print(f"  Missing: {', '.join(job['missing_info'])}")
+                print(f"- {job.job_title} at {job.company}")
+                print(f"  URL: {job.url}")
+                print(f"  Missing: {', '.join(job.missing_info)}")
                 print()
     
     def run_full_process(self, cv_path: str, locations: List[str], user_info: Dict, preferences: Dict = None):
@@ -122,37 +356,78 @@ class JobAgent:
         print("Starting Auto Job Finding Agent...")
         print("=" * 50)
         
-        # Step 1: Analyze CV
-        cv_analysis = self.analyze_cv(cv_path)
-        
-        if not cv_analysis:
-            print("Failed to analyze CV. Exiting.")
-            return
-        
-        # Step 2: Find matched positions
-        positions = self.find_matched_positions(locations, preferences)
-        
-        if not positions:
-            print("No matched positions found. Exiting.")
-            return
+        # Every run gets a statistics row; searches add their counters as they finish
+        self.run_id = self.db.start_run()
+        status = 'failed'
         
-        # Step 3: Set user info
-        self.set_user_info(user_info)
+        # Chrome startup and login don't depend on the CV, so they run during CV analysis
+        if Config.OVERLAP_BROWSER_STARTUP:
+            self.start_browser()
         
-        # Step 4: Search and apply to jobs
-        results = self.search_and_apply_jobs(locations)
-        
-        # Step 5: Generate reports
-        self.generate_reports()
-        
-        # Final summary
-        print("\n" + "=" * 50)
-        print("FINAL RESULTS")
-        print("=" * 50)
-        print(f"Total jobs found: {results['total_found']}")
-        print(f"Applications attempted: {results['applications_attempted']}")
-        print(f"Applications successful: {results['applications_successful']}")
-        print(f"Jobs requiring additional info: {results['jobs_with_missing_info']}")
-        print("\nCheck 'job_applications_report.txt' for detailed results.")
+        try:
+            # Step 1: Analyze CV
+            with self.timed("CV analysis"):
+                cv_analysis = self.analyze_cv(cv_path)
+            
+            if not cv_analysis:
+                print("Failed to analyze CV. Exiting.")
+                return
+            
+            # Step 2: Find matched positions
+            with self.timed("Position matching"):
+                positions = self.find_matched_positions(locations, preferences)
+            
+            if not positions:
+                print("No matched positions found. Exiting.")
+                return
+            
+            # Step 3: Set user info and application limits
+            self.set_user_info(user_info)
+            self.set_application_settings(preferences or {})
+            self.set_job_preferences(preferences or {})
+            
+            # Step 4: Search and apply to jobs
+            with self.timed("Search and apply"):
+                results = self.search_and_apply_jobs(
+                    locations,
+                    (preferences or {}).get('run_time_budget_minutes'),
+                    (preferences or {}).get('incremental_search')
+                )
+            
+            # Optional: batch-screen discovered jobs against the CV
+            if preferences and preferences.get('screen_jobs'):
+                with self.timed("Job screening"):
+                    screenings = self.screen_discovered_jobs(preferences.get('screening_batch_size', 10))
+                results['jobs_screened'] = len(screenings)
+            
+            # Step 5: Generate reports
+            with self.timed("Reports"):
+                self.generate_reports()
+            
+            # Final summary
+            print("\n" + "=" * 50)
+            print("FINAL RESULTS")
+            print("=" * 50)
+            print(f"Total jobs found: {results['total_found']}")
+            print(f"Applications attempted: {results['applications_attempted']}")
+            print(f"Applications successful: {results['applications_successful']}")
+            print(f"Jobs requiring additional info: {results['jobs_with_missing_info']}")
+            print(f"Duplicate postings skipped: {results.get('duplicates_skipped', 0)}")
+            print(f"Jobs filtered before opening: {results.get('jobs_filtered', 0)}")
+            print(f"Browser restarts: {results.get('browser_restarts', 0)}")
+            self.print_timing_summary()
+            print(f"\nCheck '{self.report_path}' for detailed results.")
+            
+            status = 'finished'
+            return results
         
-        return results
\ No newline at end of file
+        finally:
+            # Early exits never reach the search that would have used the browser
+            self.stop_browser()
+            # Counters of every search land in the runs table before it is closed
+            self.db_writer.flush()
+            self.db.finish_run(self.run_id, status)
+            # Other threads close their own connections; later use on this thread reopens it
+            self.db.connections.close_thread()
+            if self.profiler:
+                self.profiler.print_summary()
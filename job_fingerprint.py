@@ -0,0 +1,134 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+# SimHash is split into this many bands; two hashes within SIMHASH_BANDS - 1
+# bits of each other always share at least one band exactly
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 6
+BAND_WIDTHS = [SIMHASH_BITS // SIMHASH_BANDS + (band < SIMHASH_BITS % SIMHASH_BANDS) for band in range(SIMHASH_BANDS)]
+
+# Hash bits are spread to 64 counters of 16 bits packed in one integer, so
+# the per-bit counts of many hashes are summed with plain integer additions.
+# BYTE_SPREAD[i][b] is byte value b at byte position i of the hash.
+COUNTER_BITS = 16
+BYTE_SPREAD = [
+    [sum(1 << ((index * 8 + bit) * COUNTER_BITS) for bit in range(8) if value >> bit & 1) for value in range(256)]
+    for index in range(SIMHASH_BITS // 8)
+]
+
+# Descriptions shorter than this (in words) are too generic to compare
+MIN_DESCRIPTION_WORDS = 30
+
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'jnr': 'junior',
+    'eng': 'engineer', 'engr': 'engineer', 'dev': 'developer', 'mgr': 'manager'
+}
+# Tags recruiters add to the same role: work mode, contract type, gender markers
+TITLE_NOISE_WORDS = {
+    'remote', 'hybrid', 'onsite', 'full', 'part', 'time', 'contract', 'permanent', 'temporary',
+    'm', 'f', 'd', 'w', 'x', 'h', 'mfd', 'mwd', 'all', 'genders', 'urgent', 'new'
+}
+COMPANY_SUFFIXES = {
+    'inc', 'ltd', 'llc', 'llp', 'plc', 'corp', 'corporation', 'co', 'company', 'gmbh', 'ag',
+    'srl', 'spa', 'sa', 'bv', 'nv', 'ab', 'as', 'oy', 'limited', 'group'
+}
+
+def words(text: str) -> List[str]:
+    """Lowercase alphanumeric words of a text"""
+    return re.findall(r'[a-z0-9+#]+', (text or '').lower())
+
+def normalize_title(title: str) -> str:
+    """Title reduced to its sorted significant words, so reordered or tagged variants match"""
+    # Bracketed tags such as "(m/f/d)" or "[Remote]" are dropped entirely
+    title = re.sub(r'[(\[][^)\]]*[)\]]', ' ', title or '')
+    tokens = {TITLE_ABBREVIATIONS.get(word, word) for word in words(title)}
+    return ' '.join(sorted(tokens - TITLE_NOISE_WORDS))
+
+def normalize_company(company: str) -> str:
+    """Company name without punctuation and legal suffixes"""
+    return ' '.join(word for word in words(company) if word not in COMPANY_SUFFIXES)
+
+def normalize_location(location: str) -> str:
+    """Location as lowercase words"""
+    return ' '.join(words(location))
+
+def posting_key(company: str, title: str, location: str) -> Optional[str]:
+    """Stable key of the normalized (company, title, location), or None without a title"""
+    title = normalize_title(title)
+    if not title:
+        return None
+    key = f"{normalize_company(company)}|{title}|{normalize_location(location)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def simhash(text: str, shingle_size: int = 2) -> Optional[int]:
+    """64-bit SimHash over word shingles of a description, or None if it is too short"""
+    tokens = words(text)
+    if len(tokens) < MIN_DESCRIPTION_WORDS:
+        return None
+
+    # Repeated shingles count repeatedly; the cap keeps every counter below 2**16
+    shingles = [' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+    shingles = shingles[:(1 << COUNTER_BITS) - 1]
+    counters = 0
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+        counters += sum(spread[byte] for spread, byte in zip(BYTE_SPREAD, digest))
+
+    # A bit is set when more than half of the shingle hashes have it set
+    mask = (1 << COUNTER_BITS) - 1
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if (counters >> (bit * COUNTER_BITS) & mask) * 2 > len(shingles):
+            value |= 1 << bit
+    return value
+
+def simhash_bands(value: int) -> Tuple[int, ...]:
+    """Split a SimHash into SIMHASH_BANDS integers for indexed lookup"""
+    bands = []
+    for width in BAND_WIDTHS:
+        bands.append(value & ((1 << width) - 1))
+        value >>= width
+    return tuple(bands)
+
+def to_signed(value: int) -> int:
+    """Store an unsigned 64-bit hash in a signed SQLite INTEGER"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def hamming_distance(first: int, second: int) -> int:
+    return bin((first ^ second) & ((1 << SIMHASH_BITS) - 1)).count('1')
+
+def job_fingerprint(job: Dict) -> Dict:
+    """Posting key, SimHash and SimHash bands of a job dict (title, company, location, description)"""
+    value = simhash(job.get('description', ''))
+    return {
+        'key': posting_key(job.get('company', ''), job.get('title', ''), job.get('location', '')),
+        'simhash': value,
+        'bands': simhash_bands(value) if value is not None else (None,) * SIMHASH_BANDS
+    }
+
+class FingerprintIndex:
+    """In-memory fingerprint index of the postings handled during the current run"""
+
+    def __init__(self, max_distance: int = SIMHASH_BANDS - 1):
+        self.max_distance = max_distance
+        self.keys = {}
+        self.bands = [{} for _ in range(SIMHASH_BANDS)]
+
+    def add(self, url: str, fingerprint: Dict):
+        if fingerprint['key']:
+            self.keys.setdefault(fingerprint['key'], url)
+        if fingerprint['simhash'] is not None:
+            for band, value in enumerate(fingerprint['bands']):
+                self.bands[band].setdefault(value, []).append((fingerprint['simhash'], url))
+
+    def find(self, fingerprint: Dict) -> Optional[str]:
+        """URL of a posting with the same key or a near-identical description, or None"""
+        if fingerprint['key'] in self.keys:
+            return self.keys[fingerprint['key']]
+        if fingerprint['simhash'] is not None:
+            for band, value in enumerate(fingerprint['bands']):
+                for other, url in self.bands[band].get(value, []):
+                    if hamming_distance(fingerprint['simhash'], other) <= self.max_distance:
+                        return url
+        return None
@@ -0,0 +1,71 @@
+import json
+import sqlite3
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# JSON-encoded columns, stored raw on the record and decoded on first access
+JSON_COLUMNS = {'requirements': 'requirements_json', 'missing_info': 'missing_info_json'}
+
+@dataclass
+class JobRecord:
+    """One row of the applications table, built by job_record_factory"""
+    # Declared by hand (not dataclass(slots=True)) to keep Python 3.8 support
+    __slots__ = (
+        'id', 'job_title', 'company', 'url', 'job_id', 'location', 'applied', 'application_date',
+        'status', 'requirements_json', 'missing_info_json', 'created_at', 'updated_at', 'description',
+        'decoded_requirements', 'decoded_missing_info'
+    )
+    id: Optional[int]
+    job_title: str
+    company: str
+    url: str
+    job_id: Optional[str]
+    location: Optional[str]
+    applied: bool
+    application_date: Optional[str]
+    status: str
+    requirements_json: Optional[str]
+    missing_info_json: Optional[str]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+    description: Optional[str]
+
+    def __post_init__(self):
+        self.decoded_requirements = None
+        self.decoded_missing_info = None
+
+    @property
+    def requirements(self) -> List:
+        if self.decoded_requirements is None:
+            self.decoded_requirements = decode_json_list(self.requirements_json)
+        return self.decoded_requirements
+
+    @property
+    def missing_info(self) -> List:
+        if self.decoded_missing_info is None:
+            self.decoded_missing_info = decode_json_list(self.missing_info_json)
+        return self.decoded_missing_info
+
+    def raw(self, column: str):
+        """Value of a database column as stored (JSON columns stay encoded)"""
+        return getattr(self, JSON_COLUMNS.get(column, column))
+
+RECORD_FIELDS = tuple(record_field.name for record_field in fields(JobRecord))
+
+def decode_json_list(value: Optional[str]) -> List:
+    """Decode a JSON list column, skipping the parser for empty values"""
+    if not value or value == '[]':
+        return []
+    return json.loads(value)
+
+@lru_cache(maxsize=64)
+def record_fields(description: Tuple) -> Tuple[str, ...]:
+    """JobRecord field names for the columns of a query"""
+    return tuple(JSON_COLUMNS.get(column[0], column[0]) for column in description)
+
+def job_record_factory(cursor: sqlite3.Cursor, row: Tuple) -> JobRecord:
+    """sqlite3 row factory mapping applications columns to JobRecord fields by name"""
+    values = dict.fromkeys(RECORD_FIELDS)
+    values.update(zip(record_fields(cursor.description), row))
+    return JobRecord(**values)
@@ -1,25 +1,76 @@
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from fake_useragent import UserAgent
 import time
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from config import Config
-from database import JobDatabase
+from database import normalize_job_id
+from db_writer import DatabaseWriter
+from job_fingerprint import FingerprintIndex, job_fingerprint
+from rate_governor import ApplicationGovernor
+from card_filter import CardFilter
+from browser_watchdog import BrowserWatchdog
+
+# Browser automation modules take seconds to import, so they are loaded on
+# first use by load_webdriver_modules() instead of at import time
+uc = None
+By = None
+WebDriverWait = None
+EC = None
+TimeoutException = None
+NoSuchElementException = None
+
+# Job search results per page, for the &start= offset of later pages
+RESULTS_PER_PAGE = 25
+
+def load_webdriver_modules():
+    """Import undetected_chromedriver and selenium on first use"""
+    global uc, By, WebDriverWait, EC, TimeoutException, NoSuchElementException
+    if uc is not None:
+        return
+    
+    import undetected_chromedriver
+    from selenium.webdriver.common.by import By as by
+    from selenium.webdriver.support.ui import WebDriverWait as web_driver_wait
+    from selenium.webdriver.support import expected_conditions
+    from selenium.common.exceptions import TimeoutException as timeout_exception
+    from selenium.common.exceptions import NoSuchElementException as no_such_element_exception
+    
+    By = by
+    WebDriverWait = web_driver_wait
+    EC = expected_conditions
+    TimeoutException = timeout_exception
+    NoSuchElementException = no_such_element_exception
+    uc = undetected_chromedriver
 
 class LinkedInScraper:
-    def __init__(self):
+    def __init__(self, db_writer: DatabaseWriter = None, profile_dir: str = None):
         self.driver = None
-        self.db = JobDatabase()
+        # Chrome user data directory, so parallel profiles keep separate cookies and sessions
+        self.profile_dir = profile_dir
+        # Writes are queued so the Selenium loop never waits on disk
+        self.db_writer = db_writer or DatabaseWriter()
         self.user_info = {}
+        self.discovered_jobs = []
+        # Fingerprints of postings handled this run, not yet visible in the database
+        self.fingerprints = FingerprintIndex(Config.DUPLICATE_MAX_DISTANCE)
+        # WorkLease of the unit being run by a queue worker: applications go through its ledger
+        self.lease = None
+        # Paces applications and caps them per day, shared with other runs through the database
+        self.governor = ApplicationGovernor(self.db_writer.db.connections)
+        # Company and title rules applied to cards before they are clicked
+        self.card_filter = CardFilter()
+        # Reading the description pane costs WebDriver calls per job (see set_job_preferences in JobAgent)
+        self.fetch_descriptions = Config.FETCH_DESCRIPTIONS
+        # Background tabs loading upcoming job pages, by job URL (see prefetch_next)
+        self.search_window = None
+        self.job_window = None
+        self.prefetched_tabs = {}
+        # Restarts Chrome once it has opened too many jobs or grown large or slow (see recycle_driver)
+        self.watchdog = BrowserWatchdog()
         
     def setup_driver(self):
         """Setup Chrome driver with anti-detection measures"""
         try:
+            load_webdriver_modules()
             options = uc.ChromeOptions()
             
             # Stable Chrome options for better compatibility
@@ -30,9 +81,14 @@ class LinkedInScraper:
             options.add_argument('--disable-features=VizDisplayCompositor')
             options.add_argument('--disable-extensions')
             options.add_argument('--disable-plugins')
+            if Config.CHROME_HEADLESS:
+                options.add_argument('--headless=new')
             
             # Use undetected chromedriver with minimal options
-            self.driver = uc.Chrome(options=options, version_main=None)
+            if self.profile_dir:
+                self.driver = uc.Chrome(options=options, version_main=None, user_data_dir=self.profile_dir)
+            else:
+                self.driver = uc.Chrome(options=options, version_main=None)
             
             # Set shorter timeouts to prevent hanging
             self.driver.set_page_load_timeout(15)
@@ -82,49 +138,76 @@ class LinkedInScraper:
             print(f"Login failed: {e}")
             return False
     
-    def search_and_apply_jobs_fast(self, position: str, location: str, user_info: Dict) -> Dict:
-        """Fast workflow: Search and apply to jobs directly on the page"""
-        results = {'applied': 0, 'failed': 0, 'total_found': 0}
+    def search_and_apply_jobs_fast(self, position: str, location: str, user_info: Dict,
+                                   max_pages: int = 2, deadline: float = None, incremental: bool = False,
+                                   start_page: int = 1) -> Dict:
+        """
+        Fast workflow: Search and apply to jobs directly on the page.
+        Starts at result page start_page and stops after max_pages result pages,
+        or at deadline (a time.monotonic() value).
+        With incremental=True results are sorted newest first, postings in the job id range
+        earlier runs scanned are skipped without clicks, and scanning stops at them when
+        those runs reached the end of the results.
+        """
+        results = {'applied': 0, 'failed': 0, 'total_found': 0, 'easy_apply': 0, 'duplicates': 0, 'filtered': 0,
+                   'prefetched': 0, 'pages': 0, 'browser_restarts': 0, 'browser_failed': False, 'limit_reached': False}
+        mark = self.db_writer.db.get_search_watermark(position, location) if incremental else None
+        scan = {
+            'watermark': mark[0] if mark else None,
+            'oldest': mark[1] if mark else None,
+            'newest': None,
+            'recent': (),
+            'known_streak': 0,
+            'reached_known': False,
+            'finished': False,
+            'exhausted': False
+        }
+        # The scan state after the last page whose cards were all handled: a page cut short
+        # by the deadline, a lost lease, the daily cap or an error leaves its postings eligible
+        covered = dict(scan)
         
         try:
+            # A browser due for a restart gets it before loading the search
+            reason = self.watchdog.check(self.driver)
+            if reason:
+                results['browser_restarts'] += 1
+                if not self.recycle_driver(reason):
+                    results['browser_failed'] = True
+                    return results
+            
             # Navigate to jobs page with Easy Apply filter
-            jobs_url = f"https://www.linkedin.com/jobs/search/?keywords={position}&location={location}&f_AL=true"
+            search_url = f"https://www.linkedin.com/jobs/search/?keywords={position}&location={location}&f_AL=true"
+            if incremental:
+                search_url += "&sortBy=DD"
+            jobs_url = self.search_page_url(search_url, start_page)
             print(f"Navigating to: {jobs_url}")
-            
-            # Direct navigation with retries
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    print(f"Navigation attempt {attempt + 1}...")
-                    self.driver.get(jobs_url)
-                    
-                    # Wait for any content to load
-                    time.sleep(8)
-                    
-                    # Check if we're on LinkedIn
-                    current_url = self.driver.current_url
-                    if "linkedin.com" in current_url:
-                        print(f"Successfully navigated to LinkedIn: {current_url}")
-                        break
-                    else:
-                        print(f"Unexpected URL: {current_url}")
-                        if attempt == max_retries - 1:
-                            return results
-                        continue
-                        
-                except Exception as e:
-                    print(f"Navigation attempt {attempt + 1} failed: {e}")
-                    if attempt == max_retries - 1:
-                        return results
-                    time.sleep(3)
+            if not self.open_search_page(jobs_url):
+                return results
             
             # Process jobs page by page
-            page = 1
-            jobs_applied = 0
-            max_applications = 10  # Limit applications per search
+            page = start_page
+            # After a browser restart the page is loaded again and the cards handled before it are skipped
+            revisit = False
+            handled = set()
+            scan_at_page = dict(scan)
             
-            while page <= 2 and jobs_applied < max_applications:  # Limit to 2 pages
-                print(f"Processing page {page}...")
+            while page < start_page + max_pages and not results['limit_reached']:
+                if deadline is not None and time.monotonic() >= deadline:
+                    print("Run time budget reached, stopping this search")
+                    break
+                if self.lease and self.lease.lost.is_set():
+                    print("Work unit lease lost, stopping this search")
+                    break
+                
+                if revisit:
+                    print(f"Resuming page {page} in the restarted browser...")
+                    scan.update(scan_at_page)
+                else:
+                    print(f"Processing page {page}...")
+                    results['pages'] += 1
+                    handled = set()
+                    scan_at_page = dict(scan)
+                recycle = None
                 
                 # Find ALL li elements on the page - simple and direct
                 job_items = self.driver.find_elements(By.TAG_NAME, "li")
@@ -132,54 +215,126 @@ class LinkedInScraper:
                 
                 if not job_items:
                     print("No li elements found, breaking")
+                    scan['exhausted'] = True
+                    covered = dict(scan)
                     break
                 
-                results['total_found'] += len(job_items)
+                if not revisit:
+                    results['total_found'] += len(job_items)
                 
-                # Process each li element - simple approach
+                # Read every card before clicking any, so unwanted jobs cost no interaction
+                cards = []
                 for i, li_item in enumerate(job_items):
                     try:
-                        if jobs_applied >= max_applications:
-                            break
+                        # Newest-first results: a run of known postings means the rest are known too
+                        card_job_id = li_item.get_attribute('data-occludable-job-id') if incremental else None
+                        if card_job_id and self.note_card(scan, card_job_id):
+                            if scan['finished']:
+                                print(f"Reached postings seen in earlier runs (job id <= {scan['watermark']}), stopping")
+                                break
+                            continue
                         
                         # Check if this li has Easy Apply text
                         li_text = li_item.text.lower()
+                        if 'easy apply' not in li_text and 'candidatura facile' not in li_text:
+                            continue
+                        if not revisit:
+                            results['easy_apply'] += 1
                         
-                        if 'easy apply' in li_text or 'candidatura facile' in li_text:
-                            print(f"Found Easy Apply in li {i+1} - NEW APPROACH!")
-                            
-                            # Get job title and link
-                            job_title = f"Job {i+1}"
-                            job_link = None
+                        card = self.read_card(li_item, i, location)
+                        
+                        # Cards without the job id attribute are checked by their link
+                        if incremental and not card_job_id and self.note_card(scan, normalize_job_id(card['url'])):
+                            if scan['finished']:
+                                print(f"Reached postings seen in earlier runs (job id <= {scan['watermark']}), stopping")
+                                break
+                            continue
+                        cards.append(card)
+                    except Exception as e:
+                        continue
+                
+                # Drop excluded companies and titles, preferred companies first
+                cards = [card for card in cards if self.card_key(card) not in handled]
+                cards, skipped = self.card_filter.select(cards)
+                handled.update(self.card_key(card) for card, _ in skipped)
+                for card, reason in skipped:
+                    print(f"Skipping {card['title']} at {card['company'] or 'unknown company'}: {reason}")
+                results['filtered'] += len(skipped)
+                print(f"{len(cards)} Easy Apply jobs to open on page {page}")
+                
+                cut_short = False
+                for index, card in enumerate(cards):
+                    try:
+                        if deadline is not None and time.monotonic() >= deadline:
+                            cut_short = True
+                            break
+                        if self.lease and self.lease.lost.is_set():
+                            cut_short = True
+                            break
+                        # Restarts happen between jobs, never during an application
+                        recycle = self.watchdog.check(self.driver)
+                        if recycle:
+                            break
+                        handled.add(self.card_key(card))
+                        
+                        job_title = card['title']
+                        job_link = card['link']
+                        
+                        # Another card of this page may have been an application to the same employer
+                        reason = self.card_filter.reason(card)
+                        if reason:
+                            print(f"Skipping {job_title} at {card['company']}: {reason}")
+                            results['filtered'] += 1
+                            continue
+                        
+                        # Skip reposts of jobs already handled, using card data only
+                        duplicate_of = self.find_duplicate(card)
+                        if duplicate_of:
+                            print(f"Skipping likely repost of {duplicate_of}: {job_title}")
+                            results['duplicates'] += 1
+                            continue
+                        
+                        # STEP 1: Open the job details, from a tab loaded in the background if there is one
+                        if self.open_prefetched(card):
+                            print(f"STEP 1: Switched to prefetched details of: {job_title}")
+                            results['prefetched'] += 1
+                        elif job_link:
+                            print(f"STEP 1: Clicking job to open details: {job_title}")
                             try:
-                                links = li_item.find_elements(By.TAG_NAME, "a")
-                                for link in links:
-                                    if link.text and len(link.text.strip()) > 10:
-                                        job_title = link.text.strip()[:60]
-                                        job_link = link
-                                        break
+                                self.driver.execute_script("arguments[0].click();", job_link)
+                                time.sleep(4)
+                                print("Job details opened")
                             except:
-                                pass
-                            
-                            print(f"STEP 1: Clicking job to open details: {job_title}")
-                            
-                            # STEP 1: Click the job to open job details
-                            if job_link:
                                 try:
-                                    self.driver.execute_script("arguments[0].click();", job_link)
+                                    job_link.click()
                                     time.sleep(4)
-                                    print("Job details opened")
+                                    print("Job details opened (regular click)")
                                 except:
-                                    try:
-                                        job_link.click()
-                                        time.sleep(4)
-                                        print("Job details opened (regular click)")
-                                    except:
-                                        print("Could not open job details")
-                                        continue
-                            
+                                    print("Could not open job details")
+                                    continue
+                        self.watchdog.record_job()
+                        
+                        # The next job loads in another tab while this one is applied to
+                        self.prefetch_next(cards[index + 1:])
+                        
+                        # Record the discovered job with its description for later screening
+                        job_data = self.record_discovered_job(card)
+                        if job_data.get('duplicate_of'):
+                            print(f"Skipping near-duplicate of {job_data['duplicate_of']}: {job_title}")
+                            results['duplicates'] += 1
+                            continue
+                        
+                        # Queue workers share postings: only the worker holding the reservation applies
+                        if self.lease and not self.lease.reserve_application(job_data['job_id']):
+                            print(f"Skipping job reserved by another worker: {job_title}")
+                            continue
+                        application_sent = False
+                        slot_taken = False
+                        form_opened = False
+                        try:
                             # STEP 2: Look for Easy Apply button in the job details area
                             print("STEP 2: Looking for Easy Apply button in job details...")
+                            easy_apply_button = None
                             easy_apply_found = False
                             
                             # Try multiple selectors for Easy Apply button
@@ -198,24 +353,40 @@ class LinkedInScraper:
                                         if button.is_displayed() and button.is_enabled():
                                             button_text = button.text.lower()
                                             if 'easy apply' in button_text or 'candidatura facile' in button_text or 'apply' in button_text:
-                                                print(f"FOUND EASY APPLY BUTTON: {button.text}")
-                                                self.driver.execute_script("arguments[0].click();", button)
-                                                time.sleep(4)
-                                                easy_apply_found = True
+                                                easy_apply_button = button
                                                 break
-                                    if easy_apply_found:
+                                    if easy_apply_button:
                                         break
                                 except:
                                     continue
                             
+                            if easy_apply_button:
+                                print(f"FOUND EASY APPLY BUTTON: {easy_apply_button.text}")
+                                # Paced only now, so jobs without a usable button cost no delay
+                                if not self.governor.acquire():
+                                    print("Daily application limit reached, stopping")
+                                    results['limit_reached'] = True
+                                    cut_short = True
+                                    break
+                                slot_taken = True
+                                try:
+                                    self.driver.execute_script("arguments[0].click();", easy_apply_button)
+                                    time.sleep(4)
+                                    easy_apply_found = True
+                                except:
+                                    print("Could not click the Easy Apply button")
+                            
                             if easy_apply_found:
                                 # Check for modal
                                 modals = self.driver.find_elements(By.CSS_SELECTOR, ".jobs-easy-apply-modal, .artdeco-modal, [role='dialog']")
                                 if modals:
                                     print("MODAL APPEARED! Processing application...")
+                                    form_opened = True
                                     if self.complete_full_application(user_info, job_title):
+                                        application_sent = True
                                         results['applied'] += 1
-                                        jobs_applied += 1
+                                        self.db_writer.mark_applied(job_data['url'])
+                                        self.card_filter.add_applied_company(card['company'])
                                         print(f"✓ SUCCESSFULLY APPLIED TO: {job_title}")
                                     else:
                                         results['failed'] += 1
@@ -226,11 +397,34 @@ class LinkedInScraper:
                             else:
                                 print("Easy Apply button not found in job details")
                                 results['failed'] += 1
-                            
-                            time.sleep(random.uniform(3, 5))
-                    
+                        finally:
+                            # Only a crash of the whole process leaves the posting reserved
+                            if self.lease:
+                                self.lease.finish_application(job_data['job_id'], application_sent)
+                            # Only an attempt that never got to the form gives its slot and token back
+                            if slot_taken:
+                                self.governor.release(form_opened or application_sent)
+                
                     except Exception as e:
                         continue
+                    finally:
+                        self.finish_card(card)
+                
+                self.close_prefetched_tabs()
+                if recycle:
+                    results['browser_restarts'] += 1
+                    if not self.recycle_driver(recycle):
+                        results['browser_failed'] = True
+                        break
+                    revisit = self.open_search_page(self.search_page_url(search_url, page))
+                    if not revisit:
+                        break
+                    continue
+                revisit = False
+                if not cut_short:
+                    covered = dict(scan)
+                if scan['finished'] or results['limit_reached']:
+                    break
                 
                 # Go to next page
                 try:
@@ -241,16 +435,71 @@ class LinkedInScraper:
                         page += 1
                     else:
                         print("No more pages available")
+                        covered['exhausted'] = True
                         break
                 except:
                     print("Next page button not found")
+                    covered['exhausted'] = True
                     break
                     
         except Exception as e:
             print(f"Error in search and apply: {e}")
+        finally:
+            self.close_prefetched_tabs()
+        
+        # Later pages alone are not contiguous with the newest postings
+        scanned = self.scanned_range(covered) if incremental and covered['newest'] and start_page == 1 else None
+        if scanned:
+            self.db_writer.update_search_watermark(position, location, *scanned)
             
         return results
     
+    def note_card(self, scan: Dict, card_job_id) -> bool:
+        """Track the newest job id of an incremental scan, returns whether the card is already known"""
+        if not card_job_id or not str(card_job_id).isdigit():
+            return False
+        card_job_id = int(card_job_id)
+        scan['newest'] = max(scan['newest'] or 0, card_job_id)
+        # A tuple, so the copy taken at the start of a page stays unchanged
+        scan['recent'] = (scan['recent'] + (card_job_id,))[-Config.INCREMENTAL_KNOWN_STREAK:]
+        
+        if scan['watermark'] is None or card_job_id > scan['watermark']:
+            scan['known_streak'] = 0
+            return False
+        # Below the range of earlier scans: postings their page or time limits cut off
+        if scan['oldest'] is not None and card_job_id < scan['oldest']:
+            scan['known_streak'] = 0
+            return False
+        
+        # Promoted postings can appear out of date order, so one known card is not enough
+        scan['known_streak'] += 1
+        if scan['known_streak'] >= Config.INCREMENTAL_KNOWN_STREAK and not scan['reached_known']:
+            scan['reached_known'] = True
+            if scan['oldest'] is None:
+                scan['finished'] = True
+            else:
+                print(f"Skipping postings scanned by earlier runs (job ids {scan['oldest']}-{scan['watermark']})")
+        return True
+    
+    def scanned_range(self, scan: Dict) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        (newest, oldest) job ids scanned without gaps after an incremental scan from the first
+        page, or None to keep the stored range. oldest is None when the scan reached the end.
+        """
+        # The scan covers its newest posting down to where it stopped. The highest of the
+        # last few ids is taken, so a promoted older posting does not claim extra coverage.
+        bottom = None if scan['exhausted'] else max(scan['recent'])
+        if scan['watermark'] is None:
+            return scan['newest'], bottom
+        # A scan stopped above the stored range would leave a gap between the two
+        if bottom is not None and bottom > scan['watermark']:
+            return None
+        
+        newest = max(scan['watermark'], scan['newest'])
+        if bottom is None or scan['oldest'] is None:
+            return newest, None
+        return newest, min(scan['oldest'], bottom)
+    
     def apply_to_current_job(self, user_info: Dict, job_title: str) -> bool:
         """Apply to the currently selected job"""
         try:
@@ -667,6 +916,259 @@ class LinkedInScraper:
         except Exception as e:
             print(f"Error filling form: {e}")
     
+    def search_page_url(self, search_url: str, page: int) -> str:
+        """URL of a result page of a search, so a restarted browser can go straight back to it"""
+        if page > 1:
+            return f"{search_url}&start={(page - 1) * RESULTS_PER_PAGE}"
+        return search_url
+    
+    def open_search_page(self, url: str) -> bool:
+        """Navigate to a search results page, with retries"""
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                print(f"Navigation attempt {attempt + 1}...")
+                self.driver.get(url)
+                
+                # Wait for any content to load
+                time.sleep(8)
+                
+                # Check if we're on LinkedIn
+                current_url = self.driver.current_url
+                if "linkedin.com" in current_url:
+                    print(f"Successfully navigated to LinkedIn: {current_url}")
+                    # Job details of prefetched tabs are opened from and closed back to this tab
+                    self.search_window = self.driver.current_window_handle
+                    return True
+                print(f"Unexpected URL: {current_url}")
+                
+            except Exception as e:
+                print(f"Navigation attempt {attempt + 1} failed: {e}")
+                if attempt < max_retries - 1:
+                    time.sleep(3)
+        return False
+    
+    def recycle_driver(self, reason: str) -> bool:
+        """Replace the browser with a fresh one that keeps the LinkedIn session, returns False if that failed"""
+        print(f"Restarting the browser: {reason}")
+        cookies = []
+        try:
+            cookies = self.driver.get_cookies()
+        except Exception as e:
+            print(f"Could not read cookies before the restart: {e}")
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Could not quit the old browser: {e}")
+        
+        # Tabs went away with the old browser
+        self.driver = None
+        self.prefetched_tabs.clear()
+        self.job_window = None
+        self.search_window = None
+        
+        # Chrome sometimes fails to start right after the old one quit, so it gets a second try
+        for attempt in range(2):
+            try:
+                self.setup_driver()
+                break
+            except Exception as e:
+                print(f"Browser restart attempt {attempt + 1} failed: {e}")
+                if self.driver:
+                    try:
+                        self.driver.quit()
+                    except Exception:
+                        pass
+                    self.driver = None
+        else:
+            return False
+        
+        self.watchdog.recycled()
+        return self.restore_session(cookies)
+    
+    def restore_session(self, cookies: List[Dict]) -> bool:
+        """Log a new browser in with the old one's cookies, or with the login form if they are not enough"""
+        # A browser profile directory keeps the cookies on disk; a temporary profile needs them copied
+        if cookies:
+            try:
+                # Cookies can only be added for the domain of the open page
+                self.driver.get('https://www.linkedin.com/robots.txt')
+                for cookie in cookies:
+                    try:
+                        self.driver.add_cookie(cookie)
+                    except Exception:
+                        continue
+            except Exception as e:
+                print(f"Could not copy cookies to the new browser: {e}")
+        
+        try:
+            self.driver.get('https://www.linkedin.com/feed/')
+            WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "global-nav"))
+            )
+            print("LinkedIn session kept across the browser restart")
+            return True
+        except Exception:
+            print("LinkedIn session not kept, logging in again")
+            return self.login()
+    
+    def record_discovered_job(self, card: Dict) -> Dict:
+        """Store a job whose details are open and keep it for screening"""
+        url = card['url'] or self.driver.current_url
+        
+        job_data = {
+            'job_id': normalize_job_id(url),
+            'title': card['title'],
+            'company': card['company'] or 'Unknown Company',
+            'location': card['location'],
+            'url': url.split('?')[0] if '/jobs/view/' in url else url,
+            'description': self.get_job_description() if self.fetch_descriptions else ''
+        }
+        
+        # The description can reveal a near-duplicate posted under another title or company
+        fingerprint = job_fingerprint(job_data)
+        job_data['duplicate_of'] = self.find_duplicate(job_data, fingerprint)
+        if job_data['duplicate_of']:
+            job_data['status'] = 'duplicate'
+        self.fingerprints.add(job_data['url'], fingerprint)
+        
+        self.db_writer.add_job(job_data)
+        self.discovered_jobs.append(job_data)
+        return job_data
+    
+    def prefetch_next(self, upcoming: List[Dict]):
+        """Open the details pages of the next cards worth opening in background tabs, up to PREFETCH_TABS"""
+        for card in upcoming:
+            if len(self.prefetched_tabs) >= Config.PREFETCH_TABS:
+                return
+            if '/jobs/view/' not in card['url'] or card['url'] in self.prefetched_tabs or self.card_filter.reason(card):
+                continue
+            try:
+                handles = set(self.driver.window_handles)
+                # window.open starts loading without moving the driver off the current tab
+                self.driver.execute_script("window.open(arguments[0], '_blank');", card['url'])
+                new_handles = set(self.driver.window_handles) - handles
+                if new_handles:
+                    self.prefetched_tabs[card['url']] = new_handles.pop()
+            except Exception as e:
+                print(f"Could not prefetch {card['title']}: {e}")
+                return
+    
+    def open_prefetched(self, card: Dict) -> bool:
+        """Switch to the card's prefetched tab, returns False if it has none"""
+        handle = self.prefetched_tabs.pop(card['url'], None)
+        if handle is None:
+            return False
+        try:
+            self.driver.switch_to.window(handle)
+            self.job_window = handle
+            # Usually loaded already; otherwise wait up to the old fixed delay
+            deadline = time.monotonic() + Config.PREFETCH_WAIT_SECONDS
+            while self.driver.execute_script("return document.readyState") != 'complete':
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.1)
+            return True
+        except Exception as e:
+            print(f"Prefetched tab unusable, opening the card instead: {e}")
+            self.finish_card(card)
+            return False
+    
+    def finish_card(self, card: Dict):
+        """Close the job's details tab, or its prefetched tab if the card was skipped"""
+        if self.job_window:
+            self.close_tab(self.job_window)
+            self.job_window = None
+        handle = self.prefetched_tabs.pop(card['url'], None)
+        if handle:
+            self.close_tab(handle)
+    
+    def close_prefetched_tabs(self):
+        """Close unused prefetched tabs so their memory is freed"""
+        for url in list(self.prefetched_tabs):
+            self.close_tab(self.prefetched_tabs.pop(url))
+    
+    def close_tab(self, handle: str):
+        """Close a tab other than the search tab and return to the search tab"""
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+            self.driver.switch_to.window(self.search_window)
+        except Exception as e:
+            print(f"Could not close tab: {e}")
+    
+    def read_card(self, job_card, index: int, search_location: str) -> Dict:
+        """Title, link, company and URL shown on a job card, without clicking it"""
+        job_title = f"Job {index + 1}"
+        job_link = None
+        try:
+            for link in job_card.find_elements(By.TAG_NAME, "a"):
+                if link.text and len(link.text.strip()) > 10:
+                    job_title = link.text.strip()[:60]
+                    job_link = link
+                    break
+        except:
+            pass
+        
+        return {
+            'element': job_card,
+            'link': job_link,
+            'title': job_title,
+            'company': self.get_card_company(job_card),
+            'location': search_location,
+            'url': self.get_card_url(job_link)
+        }
+    
+    def card_key(self, card: Dict) -> str:
+        """Identifies a card within its result page, also across page reloads"""
+        return card['url'] or f"{card['title']}|{card['company']}"
+    
+    def get_card_url(self, job_link) -> str:
+        """URL of a job card link without tracking parameters"""
+        try:
+            url = job_link.get_attribute('href') or '' if job_link else ''
+        except:
+            return ''
+        return url.split('?')[0] if '/jobs/view/' in url else url
+    
+    def get_card_company(self, job_card) -> str:
+        """Company name shown on a job card"""
+        for selector in [".artdeco-entity-lockup__subtitle", ".job-card-container__primary-description"]:
+            try:
+                company = job_card.find_element(By.CSS_SELECTOR, selector).text.strip()
+                if company:
+                    return company
+            except:
+                continue
+        return ''
+    
+    def find_duplicate(self, job: Dict, fingerprint: Dict = None) -> Optional[str]:
+        """URL of a posting this job likely duplicates (seen this run or applied before), or None"""
+        if not Config.DUPLICATE_DETECTION:
+            return None
+        fingerprint = fingerprint or job_fingerprint(job)
+        return self.fingerprints.find(fingerprint) or self.db_writer.db.find_duplicate(job, fingerprint=fingerprint)
+    
+    def get_job_description(self) -> str:
+        """Read the description text from the open job details pane"""
+        description_selectors = [
+            ".jobs-description__content",
+            ".jobs-description-content__text",
+            "#job-details"
+        ]
+        
+        for selector in description_selectors:
+            try:
+                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                for element in elements:
+                    text = element.text.strip()
+                    if text:
+                        return text
+            except:
+                continue
+        
+        return ''
+    
     def search_jobs(self, position: str, location: str) -> List[Dict]:
         """Legacy method - now just calls the fast version and returns empty list"""
         print("Using fast application workflow...")
@@ -880,6 +1382,7 @@ class LinkedInScraper:
         self.user_info = user_info
     
     def close(self):
-        """Close the browser"""
+        """Close the browser and commit queued database writes"""
         if self.driver:
-            self.driver.quit()
\ No newline at end of file
+            self.driver.quit()
+        self.db_writer.flush()
\ No newline at end of file
@@ -0,0 +1,184 @@
+import json
+import random
+import re
+import time
+from typing import Dict, List, Optional
+from config import Config
+
+
+class LLMBackend:
+    """Interface for text generation backends used by CVAnalyzer"""
+    name = 'base'
+
+    def generate(self, prompt: str) -> str:
+        """Return the raw text response for a prompt"""
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini backend (requires GEMINI_API_KEY and network access)"""
+    name = 'gemini'
+
+    def __init__(self, model_name: str = 'gemini-2.5-pro'):
+        # Imported here so offline backends don't need the SDK installed
+        import google.generativeai as genai
+
+        genai.configure(api_key=Config.GEMINI_API_KEY)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str) -> str:
+        response = self.model.generate_content(prompt)
+        return response.text
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Offline backend returning canned or template-generated JSON.
+    Latency and failures can be injected to exercise retry and timing paths.
+    """
+    name = 'fake'
+
+    KNOWN_SKILLS = [
+        'Python', 'Java', 'Kotlin', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C++', 'SQL',
+        'Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure', 'Linux', 'Git', 'React', 'Django',
+        'Flask', 'FastAPI', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch',
+        'Pandas', 'Selenium', 'Communication', 'Leadership'
+    ]
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0,
+                 responses: Optional[Dict[str, str]] = None, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.responses = responses or {}
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            raise RuntimeError("Injected fake LLM failure")
+
+        # Canned responses are matched by substring of the prompt
+        for marker, response in self.responses.items():
+            if marker in prompt:
+                return response
+
+        if 'Analyze the following CV' in prompt:
+            return json.dumps(self._analyze_cv(prompt))
+        if 'suggest exactly' in prompt:
+            return json.dumps(self._match_positions(prompt))
+        if 'Screen the following job postings' in prompt:
+            return json.dumps(self._screen_jobs(prompt))
+
+        return json.dumps({})
+
+    def _analyze_cv(self, prompt: str) -> Dict:
+        """Build a CV analysis from the CV text embedded in the prompt"""
+        cv_text = self._section(prompt, 'CV Content:', 'Please extract')
+        lines = [line.strip() for line in cv_text.splitlines() if line.strip()]
+        lowered = cv_text.lower()
+
+        email = re.search(r'[\w.+-]+@[\w-]+\.[\w.]+', cv_text)
+        phone = re.search(r'\+?\d[\d -]{7,}\d', cv_text)
+        years = re.search(r'(\d+)\+?\s+years', lowered)
+        skills = [skill for skill in self.KNOWN_SKILLS if skill.lower() in lowered] or ['Python']
+
+        return {
+            'personal_info': {
+                'name': lines[0] if lines else 'Unknown',
+                'email': email.group(0) if email else '',
+                'phone': phone.group(0) if phone else ''
+            },
+            'skills': skills,
+            'experience_years': int(years.group(1)) if years else 3,
+            'job_titles': ['Software Engineer'],
+            'industries': ['Technology'],
+            'education': [],
+            'key_achievements': [],
+            'preferred_roles': [f"{skills[0]} Developer", 'Software Engineer', 'Backend Engineer'],
+            'salary_range': {'min': '40000', 'max': '60000'},
+            'summary': f"Professional with experience in {', '.join(skills[:3])}"
+        }
+
+    def _match_positions(self, prompt: str) -> Dict:
+        """Build position suggestions from the CV data embedded in the prompt"""
+        count = re.search(r'suggest exactly (\d+)', prompt)
+        count = int(count.group(1)) if count else 3
+
+        try:
+            cv_data = json.loads(self._section(prompt, 'CV Data:', 'Preferred Locations:'))
+        except ValueError:
+            cv_data = {}
+
+        roles: List[str] = cv_data.get('preferred_roles') or ['Software Engineer']
+        skills: List[str] = cv_data.get('skills') or ['Python']
+
+        positions = []
+        for i in range(count):
+            positions.append({
+                'title': roles[i % len(roles)],
+                'keywords': skills[:3],
+                'seniority_level': 'mid',
+                'match_score': 95 - i * 5,
+                'reason': 'Template match generated by the fake LLM backend',
+                'expected_salary_range': {'min': '40000', 'max': '60000'}
+            })
+
+        return {'positions': positions}
+
+    def _screen_jobs(self, prompt: str) -> Dict:
+        """Score postings by skill overlap with the candidate profile"""
+        try:
+            profile = json.loads(self._section(prompt, 'Candidate Profile:', 'Job Postings:'))
+            postings = json.loads(self._section(prompt, 'Job Postings:', 'Return a fit score'))
+        except ValueError:
+            return {'screenings': []}
+
+        skills = [skill.lower() for skill in profile.get('skills', [])]
+        screenings = []
+        for posting in postings:
+            text = f"{posting.get('title', '')} {posting.get('description', '')}".lower()
+            matched = [skill for skill in skills if skill in text]
+            screenings.append({
+                'job_id': posting.get('job_id'),
+                'fit_score': min(100, 40 + 15 * len(matched)),
+                'reason': f"Matches {', '.join(matched)}" if matched else 'No matching skills found'
+            })
+
+        return {'screenings': screenings}
+
+    @staticmethod
+    def _section(text: str, start: str, end: str) -> str:
+        """Return the text between two markers of a prompt"""
+        start_index = text.find(start)
+        if start_index == -1:
+            return ''
+        start_index += len(start)
+        end_index = text.find(end, start_index)
+        return text[start_index:end_index if end_index != -1 else None].strip()
+
+
+def create_llm_backend(name: str = None) -> LLMBackend:
+    """Create the LLM backend selected by name or Config.LLM_BACKEND"""
+    name = (name or Config.LLM_BACKEND or 'gemini').lower()
+
+    if name == 'gemini':
+        return GeminiBackend(Config.GEMINI_MODEL)
+
+    if name == 'fake':
+        responses = {}
+        if Config.FAKE_LLM_RESPONSES:
+            with open(Config.FAKE_LLM_RESPONSES, 'r', encoding='utf-8') as file:
+                responses = json.load(file)
+        return FakeLLMBackend(
+            latency=Config.FAKE_LLM_LATENCY,
+            failure_rate=Config.FAKE_LLM_FAILURE_RATE,
+            responses=responses,
+            seed=Config.FAKE_LLM_SEED
+        )
+
+    raise ValueError(f"Unknown LLM backend: {name}. Supported backends: gemini, fake")
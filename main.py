@@ -9,7 +9,7 @@ import os
 from job_agent import JobAgent
 from config_loader import ConfigLoader
 
-def main():
+def main(profile: bool = False):
     print("=== AUTO JOB FINDING AGENT ===")
     print()
     
@@ -95,7 +95,12 @@ def main():
     
     # Initialize and run the agent
     try:
-        agent = JobAgent()
+        profiler = None
+        if profile:
+            from stage_profiler import StageProfiler
+            profiler = StageProfiler()
+            print(f"Profiling enabled, output in {profiler.output_dir}")
+        agent = JobAgent(profiler=profiler)
         
         results = agent.run_full_process(
             cv_path=cv_path,
@@ -134,7 +139,14 @@ def setup_wizard():
             "max_jobs_per_search": 3,
             "min_match_score": 70,
             "excluded_companies": [],
-            "preferred_companies": []
+            "preferred_companies": [],
+            "excluded_titles": [],
+            "skip_applied_companies": True,
+            "fetch_descriptions": True,
+            "screen_jobs": False,
+            "screening_batch_size": 10,
+            "run_time_budget_minutes": 0,
+            "incremental_search": False
         },
         "application_settings": {
             "auto_submit": True,
@@ -185,8 +197,132 @@ def setup_wizard():
     except Exception as e:
         print(f"Error saving configuration: {e}")
 
+def search_command(argv):
+    """Full-text search over stored job postings"""
+    import argparse
+    from database import JobDatabase
+    
+    parser = argparse.ArgumentParser(prog='main.py search', description="Search stored job postings")
+    parser.add_argument('query', nargs='+', help="Words to match in title, company or description (word* for prefixes)")
+    parser.add_argument('--location', help="Location substring, e.g. Milan")
+    parser.add_argument('--status', action='append', help="Application status (repeatable)")
+    parser.add_argument('--not-applied', action='store_true', help="Only jobs that were not applied to")
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    db = JobDatabase()
+    results = db.search_jobs(
+        ' '.join(args.query),
+        location=args.location,
+        status=args.status,
+        applied=False if args.not_applied else None,
+        limit=args.limit
+    )
+    
+    if not results:
+        print("No matching jobs found")
+        return
+    
+    for i, job in enumerate(results, 1):
+        print(f"{i}. {job['title']} at {job['company']} ({job['location']}) - {job['status']}")
+        print(f"   URL: {job['url']}")
+        if job['snippet']:
+            print(f"   {job['snippet']}")
+
+def format_rate(value, percent: bool = False) -> str:
+    """Format a derived rate, '-' when it is undefined"""
+    if value is None:
+        return '-'
+    return f"{value * 100:.0f}%" if percent else f"{value:.2f}"
+
+def stats_command(argv):
+    """Run history and yield per (position, location) search"""
+    import argparse
+    from database import JobDatabase
+    
+    parser = argparse.ArgumentParser(prog='main.py stats', description="Show run and search yield statistics")
+    parser.add_argument('--position', help="Only this position title")
+    parser.add_argument('--location', help="Only this location")
+    parser.add_argument('--order-by', default='applications_per_minute',
+                        choices=['applications_per_minute', 'success_rate', 'easy_apply_rate', 'applied', 'searches'])
+    parser.add_argument('--runs', type=int, default=5, help="Number of recent runs to show")
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    db = JobDatabase()
+    
+    print("RECENT RUNS")
+    print("-" * 20)
+    for run in db.get_run_stats(args.runs):
+        print(f"#{run['id']} {run['started_at']} ({run['status']}): {run['searches']} searches, "
+              f"{run['jobs_found']} found, {run['applied']}/{run['attempted']} applied, "
+              f"{format_rate(run['seconds_per_application'])} s/application")
+    
+    print("\nSEARCH YIELD")
+    print("-" * 20)
+    searches = db.get_search_stats(args.position, args.location, args.order_by, args.limit)
+    if not searches:
+        print("No searches recorded yet")
+        return
+    
+    for search in searches:
+        print(f"{search['position']} in {search['location']}: {search['searches']} searches, "
+              f"{search['jobs_found']} found, Easy Apply {format_rate(search['easy_apply_rate'], True)}, "
+              f"success {format_rate(search['success_rate'], True)}, "
+              f"{format_rate(search['seconds_per_application'])} s/application, "
+              f"{format_rate(search['applications_per_minute'])} applications/min")
+
+def batch_command(argv):
+    """Run many profiles from a manifest without prompts"""
+    import argparse
+    from batch_runner import run_batch
+    
+    parser = argparse.ArgumentParser(prog='main.py batch', description="Run profiles from a manifest of CV and config files")
+    parser.add_argument('manifest', help="JSON manifest with a 'profiles' list of {name, cv, config, env}")
+    parser.add_argument('--workers', type=int, help="Profiles run in parallel (default: manifest 'workers' or BATCH_WORKERS)")
+    args = parser.parse_args(argv)
+    
+    report = run_batch(args.manifest, args.workers)
+    sys.exit(0 if report['failed'] == 0 else 1)
+
+def queue_command(argv):
+    """Plan, work on or inspect a distributed run"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='main.py queue', description="Spread the searches of a batch manifest over several workers")
+    parser.add_argument('--queue', help="Work queue URL or SQLite path (default: WORK_QUEUE_URL)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    plan = commands.add_parser('plan', help="Analyze each profile's CV and queue its search pages")
+    plan.add_argument('manifest')
+    plan.add_argument('--pages', type=int, help="Result pages per search (default: SEARCH_MAX_PAGES)")
+    work = commands.add_parser('work', help="Lease and run units until the queue is empty")
+    work.add_argument('manifest')
+    work.add_argument('--processes', type=int, default=1, help="Worker processes on this host")
+    work.add_argument('--worker-id', help="Worker name in the queue (default: host-pid)")
+    commands.add_parser('status', help="Show unit and application counts")
+    args = parser.parse_args(argv)
+    
+    from queue_runner import plan_units, print_queue_status, run_queue_workers
+    if args.command == 'plan':
+        print(f"Queued {plan_units(args.manifest, args.queue, args.pages)} new work units")
+    elif args.command == 'work':
+        stats = run_queue_workers(args.manifest, args.queue, args.processes, args.worker_id)
+        print(f"Workers finished: {stats.get('done', 0)} done, {stats.get('failed', 0)} failed, {stats.get('lost', 0)} lost")
+    else:
+        print_queue_status(args.queue)
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == '--setup':
+    if len(sys.argv) > 1 and sys.argv[1] == '--profile':
+        main(profile=True)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--setup':
         setup_wizard()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'search':
+        search_command(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'stats':
+        stats_command(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        batch_command(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'queue':
+        queue_command(sys.argv[2:])
     else:
         main()
\ No newline at end of file
@@ -1,13 +1,124 @@
-import PyPDF2
-import pdfplumber
+import math
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+from extraction_cache import ExtractionCache
+
+def extract_page_range_pdfplumber(pdf_path: str, start: int, end: int) -> list:
+    """Extract pages [start, end) with pdfplumber; runs in a worker process"""
+    import pdfplumber
+    
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in range(start, end):
+            try:
+                page = pdf.pages[page_num]
+                pages.append((page_num, page.extract_text() or '', None))
+                # Release the parsed layout objects of finished pages
+                page.flush_cache()
+            except Exception as page_error:
+                pages.append((page_num, '', str(page_error)))
+    
+    return pages
+
+def text_quality(text: str) -> float:
+    """Score extracted text from 0 (unusable) to 1 (clean, word-like text)"""
+    if not text or not text.strip():
+        return 0.0
+    
+    printable_ratio = sum(1 for ch in text if ch.isprintable() or ch in '\n\t') / len(text)
+    
+    # Unmapped glyphs show up as (cid:NN) markers or replacement characters
+    garbage = len(re.findall(r'\(cid:\d+\)', text)) + text.count('\ufffd')
+    
+    words = text.split()
+    if not words:
+        return 0.0
+    
+    # Glued words ("ExperiencedPythonDeveloperwith") and letter-spaced
+    # text ("P y t h o n") are the typical layout failures
+    clean_words = sum(1 for word in words if re.fullmatch(r"[(\"'\[]?[\w@.+/&#%-]{1,25}[.,;:!?)\"'\]]*", word))
+    single_letters = sum(1 for word in words if len(word) == 1 and word.isalpha())
+    spacing_factor = 1.0 if single_letters / len(words) < 0.3 else 0.5
+    
+    score = printable_ratio * (clean_words / len(words)) * spacing_factor * (1 - min(1.0, garbage / len(words)))
+    return round(score, 3)
 
 class PDFReader:
-    def __init__(self):
-        pass
+    def __init__(self, parallel_workers: int = None, min_parallel_pages: int = None,
+                 cache: ExtractionCache = None):
+        # 0 means one worker per CPU, 1 disables parallel extraction
+        self.parallel_workers = Config.PDF_PARALLEL_WORKERS if parallel_workers is None else parallel_workers
+        self.min_parallel_pages = Config.PDF_PARALLEL_MIN_PAGES if min_parallel_pages is None else min_parallel_pages
+        if cache is None and Config.EXTRACTION_CACHE_ENABLED:
+            cache = ExtractionCache()
+        self.cache = cache
+        self.backend = Config.PDF_BACKEND
+        self.min_text_quality = Config.PDF_MIN_TEXT_QUALITY
+    
+    def probe(self, pdf_path: str) -> dict:
+        """Cheap pre-check of page count, fonts and the text layer of the first page"""
+        probe = {'pages': 0, 'has_fonts': False, 'has_images': False, 'first_page_quality': 0.0}
+        
+        try:
+            import PyPDF2
+            
+            with open(pdf_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                probe['pages'] = len(pdf_reader.pages)
+                if not probe['pages']:
+                    return probe
+                
+                first_page = pdf_reader.pages[0]
+                resources = first_page.get('/Resources')
+                resources = resources.get_object() if resources is not None else {}
+                probe['has_fonts'] = bool(resources.get('/Font'))
+                probe['has_images'] = bool(resources.get('/XObject'))
+                
+                if probe['has_fonts']:
+                    probe['first_page_quality'] = text_quality(first_page.extract_text() or '')
+                    
+        except Exception as e:
+            print(f"Warning: PDF probe failed: {e}")
+        
+        return probe
+    
+    def select_backends(self, pdf_path: str) -> list:
+        """Order backends so the cheapest one likely to succeed runs first"""
+        if self.backend == 'pdfplumber':
+            return ['pdfplumber', 'PyPDF2']
+        if self.backend == 'PyPDF2':
+            return ['PyPDF2', 'pdfplumber']
+        
+        probe = self.probe(pdf_path)
+        print(f"PDF probe: {probe['pages']} pages, fonts: {probe['has_fonts']}, "
+              f"first page quality: {probe['first_page_quality']:.2f}")
+        
+        # PyPDF2 is several times faster, so use it whenever its text looks clean
+        if probe['first_page_quality'] >= self.min_text_quality:
+            return ['PyPDF2', 'pdfplumber']
+        
+        # No text layer on the first page: likely image-based, pdfplumber
+        # is the only backend with a chance on mixed documents
+        return ['pdfplumber', 'PyPDF2']
+    
+    def extract_with_backend(self, pdf_path: str, backend: str) -> str:
+        """Run a single extraction backend"""
+        if backend == 'PyPDF2':
+            return self.extract_text_pypdf2(pdf_path)
+        if self.parallel_workers != 1:
+            return self.extract_text_pdfplumber_parallel(pdf_path, self.parallel_workers)
+        return self.extract_text_pdfplumber(pdf_path)
     
     def extract_text_pypdf2(self, pdf_path: str) -> str:
         """Extract text from PDF using PyPDF2"""
         try:
+            import PyPDF2
+            
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 text = ""
@@ -30,38 +141,122 @@ class PDFReader:
     def extract_text_pdfplumber(self, pdf_path: str) -> str:
         """Extract text from PDF using pdfplumber (better for complex layouts)"""
         try:
-            text = ""
+            import pdfplumber
+            
+            start_time = time.perf_counter()
+            page_texts = []
             with pdfplumber.open(pdf_path) as pdf:
                 for page_num, page in enumerate(pdf.pages):
                     try:
                         page_text = page.extract_text()
                         if page_text:
-                            text += page_text + "\n"
+                            page_texts.append(page_text)
                     except Exception as page_error:
                         print(f"Warning: Could not extract text from page {page_num + 1} with pdfplumber: {page_error}")
                         continue
+                page_count = len(pdf.pages)
             
-            return text.strip() if text.strip() else None
+            self.report_speed(page_count, time.perf_counter() - start_time, 1)
+            text = "\n".join(page_texts).strip()
+            return text if text else None
             
         except Exception as e:
             print(f"Error reading PDF with pdfplumber: {e}")
             return None
     
+    def extract_text_pdfplumber_parallel(self, pdf_path: str, workers: int = 0) -> str:
+        """Extract text with pdfplumber, spreading page ranges across a process pool"""
+        try:
+            import pdfplumber
+            
+            with pdfplumber.open(pdf_path) as pdf:
+                page_count = len(pdf.pages)
+            
+            workers = min(workers or os.cpu_count() or 1, page_count)
+            if workers <= 1 or page_count < self.min_parallel_pages:
+                return self.extract_text_pdfplumber(pdf_path)
+            
+            # Two ranges per worker balances pages of uneven layout cost
+            range_size = math.ceil(page_count / (workers * 2))
+            page_ranges = [(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)]
+            
+            # Forking while other threads run (the browser starting up in the background)
+            # can copy their held locks into the workers, so start them from a clean process
+            context = None
+            if threading.active_count() > 1 and 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+            
+            start_time = time.perf_counter()
+            page_texts = []
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = [
+                    executor.submit(extract_page_range_pdfplumber, pdf_path, start, end)
+                    for start, end in page_ranges
+                ]
+                
+                # Collect in submission order so pages stay in document order
+                for future in futures:
+                    for page_num, page_text, page_error in future.result():
+                        if page_error:
+                            print(f"Warning: Could not extract text from page {page_num + 1} with pdfplumber: {page_error}")
+                        elif page_text:
+                            page_texts.append(page_text)
+            
+            self.report_speed(page_count, time.perf_counter() - start_time, workers)
+            text = "\n".join(page_texts).strip()
+            return text if text else None
+            
+        except Exception as e:
+            print(f"Error reading PDF with parallel pdfplumber: {e}")
+            return None
+    
+    def report_speed(self, page_count: int, elapsed: float, workers: int):
+        """Print extraction throughput"""
+        pages_per_second = page_count / elapsed if elapsed > 0 else float('inf')
+        print(f"Extracted {page_count} pages in {elapsed:.2f}s ({pages_per_second:.1f} pages/s, {workers} process{'es' if workers > 1 else ''})")
+    
     def extract_text(self, pdf_path: str) -> str:
         """Extract text from PDF using the best available method"""
         print(f"Attempting to extract text from: {pdf_path}")
         
-        # Try pdfplumber first (better for complex layouts)
-        print("Trying pdfplumber...")
-        text = self.extract_text_pdfplumber(pdf_path)
+        # Unchanged files are served from the extraction cache without parsing
+        file_hash = self.cache.file_hash(pdf_path) if self.cache else None
+        if self.cache:
+            for backend in ('pdfplumber', 'PyPDF2'):
+                text = self.cache.get(file_hash, backend)
+                if text:
+                    self.cache.hits += 1
+                    print(f"Loaded {len(text)} characters from extraction cache ({backend})")
+                    return text
+            self.cache.misses += 1
         
-        # If pdfplumber fails, try PyPDF2
-        if not text:
-            print("pdfplumber failed, trying PyPDF2...")
-            text = self.extract_text_pypdf2(pdf_path)
+        # Run backends in order of expected cost, rejecting low quality output
+        best_text, best_backend, best_quality = None, None, -1.0
+        for backend in self.select_backends(pdf_path):
+            print(f"Trying {backend}...")
+            text = self.extract_with_backend(pdf_path, backend)
+            quality = text_quality(text)
+            
+            if text and quality > best_quality:
+                best_text, best_backend, best_quality = text, backend, quality
+            
+            if quality >= self.min_text_quality:
+                break
+            
+            if text:
+                print(f"{backend} text quality {quality:.2f} is below {self.min_text_quality:.2f}, trying next backend...")
+            else:
+                print(f"{backend} failed, trying next backend...")
+        
+        text = best_text
+        if text and self.cache:
+            self.cache.put(file_hash, best_backend, text)
         
         if not text:
             raise Exception("Failed to extract text from PDF with both methods. The PDF might be image-based or corrupted.")
         
-        print(f"Successfully extracted {len(text)} characters from PDF")
+        if best_quality < self.min_text_quality:
+            print(f"Warning: extracted text quality is low ({best_quality:.2f}), CV analysis may be inaccurate")
+        
+        print(f"Successfully extracted {len(text)} characters from PDF with {best_backend} (quality {best_quality:.2f})")
         return text
\ No newline at end of file
@@ -0,0 +1,180 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Dict
+from config import Config
+from batch_runner import load_manifest, load_profile_config, profile_environment
+from work_queue import SQLiteWorkQueue, WorkLease, WorkQueueBackend, create_work_queue, default_worker_id, run_worker
+
+# Distributed runs share a batch manifest (see batch_runner) and a work queue:
+# 'plan' analyzes every profile's CV once and queues one unit per
+# (profile, position, location, result page); any number of 'work' processes,
+# on this host or others, then lease units until the queue is empty.
+
+def plan_units(manifest_path: str, queue_url: str = None, pages: int = None) -> int:
+    """Match positions for every profile and queue their search pages, returns the number of new units"""
+    # Imported here so the parent process stays light
+    from job_agent import JobAgent
+
+    manifest = load_manifest(manifest_path)
+    queue = create_work_queue(queue_url)
+    pages = pages or Config.SEARCH_MAX_PAGES
+    added = 0
+
+    for profile in manifest['profiles']:
+        profile_dir = os.path.join(manifest['output_dir'], profile['name'])
+        os.makedirs(profile_dir, exist_ok=True)
+
+        with profile_environment(profile.get('env', {})):
+            config_loader = load_profile_config(profile)
+            locations = config_loader.get_preferred_locations()
+            agent = JobAgent(db_path=os.path.join(profile_dir, 'job_applications.db'), interactive=False)
+            try:
+                if not agent.analyze_cv(profile['cv']):
+                    print(f"Failed to analyze the CV of {profile['name']}, no units queued")
+                    continue
+                positions = agent.find_matched_positions(locations, config_loader.get_job_preferences())
+            finally:
+                agent.db_writer.close()
+
+        units = [
+            {'profile': profile['name'], 'position': position['title'], 'location': location, 'page': page}
+            for position in positions for location in locations for page in range(1, pages + 1)
+        ]
+        count = queue.add_units(units)
+        print(f"{profile['name']}: queued {count} units ({len(units) - count} already queued)")
+        added += count
+
+    return added
+
+class QueueWorker:
+    """Runs leased units, keeping one logged-in browser open for the profile of the last unit"""
+
+    def __init__(self, manifest: Dict, queue: WorkQueueBackend, worker_id: str):
+        self.queue = queue
+        self.profiles = {profile['name']: profile for profile in manifest['profiles']}
+        self.output_dir = manifest['output_dir']
+        self.worker_id = worker_id
+        self.profile_name = None
+        self.agent = None
+        self.stack = ExitStack()
+
+    def open_profile(self, name: str):
+        """Switch to a profile: its environment, database and a logged-in browser"""
+        from job_agent import JobAgent
+
+        self.close_profile()
+        profile = self.profiles.get(name)
+        if profile is None:
+            raise ValueError(f"Profile {name} is not in the manifest")
+        profile_dir = os.path.join(self.output_dir, name)
+        os.makedirs(profile_dir, exist_ok=True)
+
+        # Undone in reverse order: browser, run statistics, database writes, environment
+        try:
+            self.stack.enter_context(profile_environment(profile.get('env', {})))
+            config_loader = load_profile_config(profile)
+            agent = JobAgent(
+                db_path=os.path.join(profile_dir, 'job_applications.db'),
+                report_path=os.path.join(profile_dir, 'job_applications_report.txt'),
+                # Chrome locks its user data directory, so workers on one host need their own
+                browser_profile_dir=os.path.join(profile_dir, f'chrome-profile-{self.worker_id}'),
+                interactive=False
+            )
+            self.stack.callback(agent.db_writer.close)
+            agent.run_id = agent.db.start_run()
+            self.stack.callback(agent.db.finish_run, agent.run_id)
+            self.stack.callback(agent.linkedin_scraper.close)
+
+            agent.set_user_info(config_loader.get_personal_info())
+            # Workers of a SQLite queue share one application budget per profile in the queue database
+            if isinstance(self.queue, SQLiteWorkQueue):
+                agent.set_application_settings(
+                    config_loader.get_application_settings(), self.queue.connections, f"profile:{name}"
+                )
+            else:
+                agent.set_application_settings(config_loader.get_application_settings())
+            agent.set_job_preferences(config_loader.get_job_preferences())
+            if not agent.wait_for_browser():
+                raise RuntimeError(f"Failed to login to LinkedIn as {name}")
+        except BaseException:
+            self.close_profile()
+            raise
+
+        self.profile_name = name
+        self.agent = agent
+
+    def close_profile(self):
+        self.stack.close()
+        self.profile_name = None
+        self.agent = None
+
+    def process_unit(self, unit: Dict, lease: WorkLease) -> Dict:
+        if unit['profile'] != self.profile_name:
+            self.open_profile(unit['profile'])
+        try:
+            return self.agent.run_work_unit(unit, lease)
+        except Exception:
+            # The browser may be gone; the next unit opens the profile again
+            self.close_profile()
+            raise
+
+    def record_unit(self, unit: Dict, result: Dict):
+        """Add a completed unit to the profile's run statistics"""
+        self.agent.record_search(unit['position'], unit['location'], result, result.get('seconds', 0.0))
+
+def run_queue_worker(manifest_path: str, queue_url: str = None, worker_id: str = None) -> Dict[str, int]:
+    """Work on the queue until it is empty"""
+    queue = create_work_queue(queue_url)
+    worker = QueueWorker(load_manifest(manifest_path), queue, worker_id or default_worker_id())
+    try:
+        return run_worker(queue, worker.process_unit, worker.record_unit, worker.worker_id)
+    finally:
+        worker.close_profile()
+
+def run_queue_workers(manifest_path: str, queue_url: str = None, processes: int = 1,
+                      worker_id: str = None) -> Dict[str, int]:
+    """Run several workers as local processes, for one host or for trying out a distributed run"""
+    worker_id = worker_id or default_worker_id()
+    if processes <= 1:
+        return run_queue_worker(manifest_path, queue_url, worker_id)
+
+    totals = {}
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(run_queue_worker, manifest_path, queue_url, f"{worker_id}-{index}")
+            for index in range(1, processes + 1)
+        ]
+        for future in futures:
+            for key, value in future.result().items():
+                totals[key] = totals.get(key, 0) + value
+    return totals
+
+def print_queue_status(queue_url: str = None):
+    queue = create_work_queue(queue_url)
+    counts = queue.counts()
+    print("WORK UNITS")
+    print("-" * 20)
+    for status in ('pending', 'leased', 'done', 'failed'):
+        print(f"{status}: {counts['units'].get(status, 0)}")
+
+    # 'reserved' applications belong to running workers, or to workers that
+    # died mid-application and whose outcome is unknown
+    print("\nAPPLICATIONS")
+    print("-" * 20)
+    for status in ('applied', 'failed', 'reserved'):
+        print(f"{status}: {counts['applications'].get(status, 0)}")
+
+    totals = {}
+    for result in queue.results():
+        profile = totals.setdefault(result['profile'], {'pages': 0, 'found': 0, 'applied': 0, 'workers': set()})
+        profile['pages'] += 1
+        profile['found'] += result.get('total_found', 0)
+        profile['applied'] += result.get('applied', 0)
+        profile['workers'].add(result['worker_id'])
+    if totals:
+        print("\nPER PROFILE")
+        print("-" * 20)
+        for name, profile in sorted(totals.items()):
+            print(f"{name}: {profile['pages']} pages, {profile['found']} found, "
+                  f"{profile['applied']} applied by {len(profile['workers'])} workers")
@@ -0,0 +1,93 @@
+import time
+from datetime import date
+from typing import Dict, Optional
+from config import Config
+from database import ConnectionManager
+
+class ApplicationGovernor:
+    """
+    Token bucket pacing applications, persisted in SQLite so every run and
+    process using the same database shares one budget.
+
+    The bucket refills one token every delay_seconds, up to burst tokens. A
+    process that takes a token while the bucket is empty drives it negative
+    and sleeps until its token would have arrived. Processes queue up behind
+    each other that way, and time spent browsing between applications counts
+    toward the delay. A daily counter caps the volume; attempts that never
+    open the application form give their token and daily slot back. The
+    rate_limits table is created by the database migrations (or with the
+    work queue's tables).
+    """
+
+    def __init__(self, connections: ConnectionManager, name: str = 'applications', delay_seconds: float = None,
+                 max_per_day: int = None, burst: int = None):
+        self.connections = connections
+        self.name = name
+        self.delay_seconds = max(0.0, Config.APPLICATION_DELAY_SECONDS if delay_seconds is None else delay_seconds)
+        self.max_per_day = Config.MAX_APPLICATIONS_PER_DAY if max_per_day is None else max_per_day
+        self.burst = max(1, burst or Config.APPLICATION_BURST)
+        self.waited_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, connections: ConnectionManager, settings: Dict, name: str = 'applications') -> 'ApplicationGovernor':
+        """Governor for the 'application_settings' of a user config"""
+        return cls(
+            connections,
+            name,
+            delay_seconds=settings.get('delay_between_applications'),
+            max_per_day=settings.get('max_applications_per_day')
+        )
+
+    def state(self, cursor):
+        """(tokens, updated_at, day, day_count), with the day counter reset at midnight"""
+        today = date.today().isoformat()
+        row = cursor.execute(
+            'SELECT tokens, updated_at, day, day_count FROM rate_limits WHERE name = ?', (self.name,)
+        ).fetchone()
+        if row is None:
+            return float(self.burst), time.time(), today, 0
+        tokens, updated_at, day, day_count = row
+        return tokens, updated_at, today, day_count if day == today else 0
+
+    def acquire(self) -> bool:
+        """Wait for the next application slot; False once today's limit is reached"""
+        with self.connections.transaction() as cursor:
+            tokens, updated_at, day, day_count = self.state(cursor)
+            if self.max_per_day and day_count >= self.max_per_day:
+                return False
+
+            now = time.time()
+            if self.delay_seconds:
+                tokens = min(self.burst, tokens + (now - updated_at) / self.delay_seconds) - 1
+            wait = max(0.0, -tokens * self.delay_seconds)
+            cursor.execute('''
+            INSERT OR REPLACE INTO rate_limits (name, tokens, updated_at, day, day_count) VALUES (?, ?, ?, ?, ?)
+            ''', (self.name, tokens, now, day, day_count + 1))
+
+        if wait > 0:
+            print(f"Pacing applications: next one in {wait:.1f}s")
+            time.sleep(wait)
+            self.waited_seconds += wait
+        return True
+
+    def release(self, started: bool):
+        """
+        Close a slot taken by acquire(). started is whether the attempt reached LinkedIn's
+        application form; one that never did refunds its token and daily slot.
+        """
+        if started:
+            return
+        with self.connections.transaction() as cursor:
+            cursor.execute('''
+            UPDATE rate_limits
+            SET tokens = MIN(?, tokens + 1),
+                day_count = CASE WHEN day = ? THEN MAX(0, day_count - 1) ELSE day_count END
+            WHERE name = ?
+            ''', (self.burst, date.today().isoformat(), self.name))
+
+    def remaining_today(self) -> Optional[int]:
+        """Applications left today, or None without a daily limit"""
+        if not self.max_per_day:
+            return None
+        day_count = self.state(self.connections.connection().cursor())[3]
+        return max(0, self.max_per_day - day_count)
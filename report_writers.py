@@ -0,0 +1,155 @@
+import csv
+import json
+import os
+from typing import List
+from job_record import JobRecord
+
+# Columns written by every export format, in order
+EXPORT_COLUMNS = [
+    'id', 'job_title', 'company', 'url', 'job_id', 'location', 'applied',
+    'application_date', 'status', 'requirements', 'missing_info', 'created_at', 'updated_at'
+]
+
+class ReportWriter:
+    """Writes application records one at a time so exports stream in constant memory"""
+    extension = ''
+    supports_append = True
+
+    def __init__(self, filename: str, append: bool = False):
+        self.filename = filename
+        self.append = append
+        # Header only for new or empty files so appended exports stay well formed
+        self.write_header = not (append and os.path.exists(filename) and os.path.getsize(filename) > 0)
+        self.file = None
+
+    def open(self):
+        self.file = open(self.filename, 'a' if self.append else 'w', encoding='utf-8', newline='')
+
+    def write(self, row: JobRecord):
+        raise NotImplementedError
+
+    def write_rows(self, rows: List[JobRecord]):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+class TxtReportWriter(ReportWriter):
+    """Human-readable report (the original job_applications_report.txt layout)"""
+    extension = '.txt'
+
+    def open(self):
+        super().open()
+        if self.write_header:
+            self.file.write("JOB APPLICATIONS REPORT\n")
+            self.file.write("=" * 50 + "\n\n")
+
+    def write(self, row: JobRecord):
+        f = self.file
+        f.write(f"Job Title: {row.job_title}\n")
+        f.write(f"Company: {row.company}\n")
+        f.write(f"URL: {row.url}\n")
+        f.write(f"Location: {row.location}\n")
+        f.write(f"Applied: {'Yes' if row.applied else 'No'}\n")
+        f.write(f"Status: {row.status}\n")
+
+        if row.missing_info:
+            f.write(f"Missing Information: {', '.join(row.missing_info)}\n")
+
+        f.write("-" * 30 + "\n\n")
+
+class CsvReportWriter(ReportWriter):
+    extension = '.csv'
+
+    def open(self):
+        super().open()
+        self.writer = csv.writer(self.file)
+        if self.write_header:
+            self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, row: JobRecord):
+        self.writer.writerow([row.raw(column) for column in EXPORT_COLUMNS])
+
+class JsonlReportWriter(ReportWriter):
+    extension = '.jsonl'
+
+    def write(self, row: JobRecord):
+        record = {column: getattr(row, column) for column in EXPORT_COLUMNS}
+        record['applied'] = bool(record['applied'])
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+class ArrowReportWriter(ReportWriter):
+    """Columnar export through pyarrow (Parquet or Arrow IPC), written batch by batch"""
+    supports_append = False
+
+    def open(self):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ValueError("Parquet/Arrow export requires pyarrow: pip install pyarrow")
+
+        self.pyarrow = pyarrow
+        fields = [pyarrow.field(column, pyarrow.string()) for column in EXPORT_COLUMNS]
+        fields[EXPORT_COLUMNS.index('id')] = pyarrow.field('id', pyarrow.int64())
+        fields[EXPORT_COLUMNS.index('applied')] = pyarrow.field('applied', pyarrow.bool_())
+        self.schema = pyarrow.schema(fields)
+        self.writer = self.open_writer()
+
+    def open_writer(self):
+        raise NotImplementedError
+
+    def write(self, row: JobRecord):
+        self.write_rows([row])
+
+    def write_rows(self, rows: List[JobRecord]):
+        if not rows:
+            return
+        columns = {column: [row.raw(column) for row in rows] for column in EXPORT_COLUMNS}
+        columns['applied'] = [bool(value) for value in columns['applied']]
+        for column in EXPORT_COLUMNS:
+            if column not in ('id', 'applied'):
+                columns[column] = [None if value is None else str(value) for value in columns[column]]
+        self.writer.write_batch(self.pyarrow.RecordBatch.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        if getattr(self, 'writer', None):
+            self.writer.close()
+
+class ParquetReportWriter(ArrowReportWriter):
+    extension = '.parquet'
+
+    def open_writer(self):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(self.filename, self.schema)
+
+class ArrowIpcReportWriter(ArrowReportWriter):
+    extension = '.arrow'
+
+    def open_writer(self):
+        import pyarrow.ipc
+        return self.pyarrow.ipc.new_file(self.filename, self.schema)
+
+REPORT_WRITERS = {
+    'txt': TxtReportWriter,
+    'csv': CsvReportWriter,
+    'jsonl': JsonlReportWriter,
+    'parquet': ParquetReportWriter,
+    'arrow': ArrowIpcReportWriter
+}
+
+def get_report_writer(filename: str, export_format: str = None, append: bool = False) -> ReportWriter:
+    """Create the writer for a format, inferred from the file extension when not given"""
+    if not export_format:
+        extension = os.path.splitext(filename)[1].lower()
+        export_format = next((name for name, writer in REPORT_WRITERS.items() if writer.extension == extension), 'txt')
+
+    writer_class = REPORT_WRITERS.get(export_format.lower())
+    if writer_class is None:
+        raise ValueError(f"Unsupported export format: {export_format}. Supported formats: {', '.join(REPORT_WRITERS)}")
+
+    if append and not writer_class.supports_append:
+        raise ValueError(f"Incremental export is not supported for {export_format}; use txt, csv or jsonl")
+
+    return writer_class(filename, append)
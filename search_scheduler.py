@@ -0,0 +1,103 @@
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from database import JobDatabase
+
+class SearchScheduler:
+    """
+    Orders (position, location) searches and sizes their page budgets by
+    historical yield, within an optional run time budget.
+
+    Each pair is a bandit arm whose reward is successful applications per
+    minute of browser time. Rates get a Gamma posterior (Poisson arrivals of
+    applications over the minutes spent), and Thompson sampling picks the next
+    search: proven pairs go first and get more pages, while pairs with little
+    history still get explored.
+    """
+
+    def __init__(self, db: JobDatabase, pairs: List[Tuple[str, str]], time_budget: float = None,
+                 max_pages: int = None, adaptive: bool = None, seed: int = None):
+        self.pairs = list(dict.fromkeys(pairs))
+        self.time_budget = time_budget
+        self.max_pages = max_pages or Config.SEARCH_MAX_PAGES
+        self.adaptive = Config.ADAPTIVE_SCHEDULING if adaptive is None else adaptive
+        self.random = random.Random(seed)
+        self.started_at = time.monotonic()
+
+        history = db.get_search_yield()
+        self.arms = {}
+        for position, location in self.pairs:
+            stats = history.get((position.lower(), location.lower()), {})
+            self.arms[(position, location)] = {
+                'applied': stats.get('applied', 0) or 0,
+                'minutes': (stats.get('seconds', 0) or 0) / 60,
+                'pages': stats.get('pages', 0) or 0
+            }
+
+        # Prior: one application per pooled minutes-per-application, so unseen
+        # pairs start at the average rate instead of at zero
+        applied = sum(arm['applied'] for arm in self.arms.values())
+        minutes = sum(arm['minutes'] for arm in self.arms.values())
+        pages = sum(arm['pages'] for arm in self.arms.values())
+        self.prior_alpha = 1.0
+        self.prior_beta = minutes / applied if applied else Config.SEARCH_PRIOR_MINUTES
+        self.seconds_per_page = minutes * 60 / pages if pages else None
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left in the time budget, or None without a budget"""
+        if not self.time_budget:
+            return None
+        return self.time_budget - (time.monotonic() - self.started_at)
+
+    def sample_rate(self, arm: Dict) -> float:
+        """Draw applications per minute from the arm's Gamma posterior"""
+        alpha = self.prior_alpha + arm['applied']
+        beta = self.prior_beta + arm['minutes']
+        return self.random.gammavariate(alpha, 1 / beta)
+
+    def next_search(self) -> Optional[Dict]:
+        """Next {'position', 'location', 'max_pages', 'deadline'} to run, or None when done or out of time"""
+        if not self.pairs:
+            return None
+
+        remaining = self.remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            print(f"Run time budget used up, skipping {len(self.pairs)} remaining searches")
+            self.pairs = []
+            return None
+
+        if self.adaptive:
+            # Searches already run are sampled too, so late low-yield pairs still get few pages
+            samples = {pair: self.sample_rate(arm) for pair, arm in self.arms.items()}
+            pair = max(self.pairs, key=samples.get)
+            # The best sampled pair gets max_pages, the others in proportion to their sample
+            best = max(samples.values())
+            share = samples[pair] / best if best > 0 else 1.0
+            pages = max(1, round(self.max_pages * share))
+        else:
+            pair = self.pairs[0]
+            pages = self.max_pages
+
+        if remaining is not None and self.seconds_per_page:
+            pages = max(1, min(pages, int(remaining // self.seconds_per_page)))
+
+        self.pairs.remove(pair)
+        return {
+            'position': pair[0],
+            'location': pair[1],
+            'max_pages': pages,
+            'deadline': time.monotonic() + remaining if remaining is not None else None
+        }
+
+    def update(self, position: str, location: str, applied: int, seconds: float, pages: int):
+        """Add a finished search to its arm and to the seconds-per-page estimate"""
+        arm = self.arms[(position, location)]
+        arm['applied'] += applied
+        arm['minutes'] += seconds / 60
+        arm['pages'] += pages
+
+        total_pages = sum(arm['pages'] for arm in self.arms.values())
+        if total_pages:
+            total_seconds = sum(arm['minutes'] for arm in self.arms.values()) * 60
+            self.seconds_per_page = total_seconds / total_pages
@@ -0,0 +1,147 @@
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from config import Config
+
+# (file suffix, function name) of the calls the breakdown separates out.
+# Every WebDriver command ends in one HTTP request to chromedriver, so the
+# cumulative time of _request covers find_element, click, get and the rest.
+WEBDRIVER_HTTP = ('selenium/webdriver/remote/remote_connection.py', '_request')
+SLEEP = ('~', '<built-in method time.sleep>')
+
+def is_webdriver_http(filename: str, name: str) -> bool:
+    return name == WEBDRIVER_HTTP[1] and filename.replace('\\', '/').endswith(WEBDRIVER_HTTP[0])
+
+class StageProfiler:
+    """
+    Profiles the stages of a run with cProfile and a stack sampler.
+    For every stage it writes <stage>.pstats (for pstats or snakeviz) and
+    <stage>.collapsed, one "frame;frame;frame count" line per sampled stack
+    for flamegraph.pl or speedscope. Only the thread running the stage is
+    sampled.
+    """
+
+    def __init__(self, output_dir: str = None, sample_interval: float = None):
+        run_dir = time.strftime('%Y%m%d-%H%M%S')
+        self.output_dir = os.path.join(output_dir or Config.PROFILE_DIR, run_dir)
+        self.sample_interval = sample_interval or Config.PROFILE_SAMPLE_INTERVAL
+        self.profiles = {}
+        self.samples = {}
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @contextmanager
+    def profile(self, stage: str):
+        """Profile the enclosed block, adding to earlier profiles of the same stage"""
+        profiler = self.profiles.setdefault(stage, cProfile.Profile())
+        samples = self.samples.setdefault(stage, Counter())
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self.sample, args=(threading.get_ident(), samples, stop),
+            name='StageSampler', daemon=True
+        )
+
+        sampler.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            stop.set()
+            sampler.join()
+            # Written at the end of every stage so a crashed run keeps what it has
+            self.write(stage)
+
+    def sample(self, thread_id: int, samples: Counter, stop: threading.Event):
+        """Sampler thread: count the stacks of the profiled thread"""
+        while not stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                samples[';'.join(reversed(stack))] += 1
+
+    def stage_path(self, stage: str, extension: str) -> str:
+        name = re.sub(r'[^a-z0-9]+', '_', stage.lower()).strip('_')
+        return os.path.join(self.output_dir, f"{name}.{extension}")
+
+    def write(self, stage: str):
+        """Write the .pstats and .collapsed files of a stage"""
+        self.profiles[stage].dump_stats(self.stage_path(stage, 'pstats'))
+        with open(self.stage_path(stage, 'collapsed'), 'w', encoding='utf-8') as file:
+            for stack, count in self.samples[stage].most_common():
+                file.write(f"{stack} {count}\n")
+
+    def stats(self, stage: str) -> Optional[pstats.Stats]:
+        profiler = self.profiles.get(stage)
+        if profiler is None:
+            return None
+        profiler.create_stats()
+        if not profiler.stats:
+            return None
+        return pstats.Stats(profiler)
+
+    def breakdown(self, stats: pstats.Stats) -> Dict[str, float]:
+        """Seconds of a stage spent in WebDriver HTTP calls, in time.sleep and in the rest"""
+        webdriver = 0.0
+        sleep = 0.0
+        for (filename, _, name), (_, _, own_time, cumulative_time, callers) in stats.stats.items():
+            if is_webdriver_http(filename, name):
+                webdriver += cumulative_time
+            elif (filename, name) == SLEEP:
+                sleep += own_time
+                # Sleeps inside WebDriver requests (retries) are already in its time
+                for (caller_file, _, caller_name), caller_stats in callers.items():
+                    if is_webdriver_http(caller_file, caller_name):
+                        sleep -= caller_stats[2]
+
+        total = stats.total_tt
+        return {
+            'total': total,
+            'webdriver_http': webdriver,
+            'sleep': sleep,
+            'python': max(0.0, total - webdriver - sleep)
+        }
+
+    def hotspots(self, stats: pstats.Stats, limit: int = 10) -> List[Dict]:
+        """Functions with the most time spent in their own code"""
+        rows = []
+        for function, (_, calls, own_time, cumulative_time, _) in stats.stats.items():
+            rows.append({
+                'function': pstats.func_std_string(function),
+                'calls': calls,
+                'own_seconds': own_time,
+                'cumulative_seconds': cumulative_time
+            })
+        rows.sort(key=lambda row: row['own_seconds'], reverse=True)
+        return rows[:limit]
+
+    def print_summary(self, limit: int = 10):
+        """Print the time breakdown and top hotspots of every profiled stage"""
+        print("\nPROFILE")
+        print("-" * 20)
+        for stage in self.profiles:
+            stats = self.stats(stage)
+            if stats is None:
+                continue
+
+            parts = self.breakdown(stats)
+            total = parts['total'] or 1.0
+            print(f"\n{stage}: {parts['total']:.2f}s profiled")
+            for key, label in (('webdriver_http', 'WebDriver HTTP'), ('sleep', 'time.sleep'), ('python', 'Python')):
+                print(f"  {label}: {parts[key]:.2f}s ({parts[key] / total * 100:.0f}%)")
+
+            print("  Top hotspots (own time):")
+            for row in self.hotspots(stats, limit):
+                print(f"    {row['own_seconds']:8.3f}s {row['calls']:>8} calls  {row['function']}")
+
+        print(f"\nProfiles written to {self.output_dir}")
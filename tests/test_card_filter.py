@@ -0,0 +1,49 @@
+from card_filter import CardFilter
+
+def card(title, company):
+    return {'title': title, 'company': company}
+
+def test_companies_match_without_legal_suffixes_and_punctuation():
+    card_filter = CardFilter(excluded_companies=['Acme Inc.'])
+    assert card_filter.reason(card('Python Developer', 'ACME')) == "excluded company"
+    assert card_filter.reason(card('Python Developer', 'acme, Ltd')) == "excluded company"
+    assert card_filter.reason(card('Python Developer', 'Acme Staffing')) is None
+
+def test_excluded_titles_match_whole_words_and_phrases():
+    card_filter = CardFilter(excluded_titles=['sales', 'Team Lead', '  '])
+    assert card_filter.excluded_titles == ['sales', 'team lead']
+    assert card_filter.reason(card('Sales Engineer', 'Globex')) == "title matches 'sales'"
+    assert card_filter.reason(card('Python Team-Lead (m/f/d)', 'Globex')) == "title matches 'team lead'"
+    assert card_filter.reason(card('Salesforce Developer', 'Globex')) is None
+    assert card_filter.reason(card('Lead of the Data Team', 'Globex')) is None
+
+def test_preferred_companies_first_in_page_order():
+    card_filter = CardFilter(excluded_companies=['Initech'], preferred_companies=['example corp'])
+    cards = [card('Backend Developer', 'Globex'), card('Data Engineer', 'Example Corp.'),
+             card('Platform Engineer', 'Initech'), card('Frontend Developer', 'Hooli'),
+             card('ML Engineer', 'EXAMPLE CORP')]
+
+    kept, skipped = card_filter.select(cards)
+
+    assert [kept_card['title'] for kept_card in kept] == [
+        'Data Engineer', 'ML Engineer', 'Backend Developer', 'Frontend Developer'
+    ]
+    assert skipped == [(cards[2], "excluded company")]
+
+def test_applied_companies_skipped_unless_preferred():
+    card_filter = CardFilter(preferred_companies=['Hooli'], applied_companies=['Globex GmbH'],
+                             skip_applied_companies=True)
+    card_filter.add_applied_company('Hooli')
+    assert card_filter.reason(card('Data Engineer', 'Globex')) == "already applied to this company"
+    # Preferred companies may get several applications
+    assert card_filter.reason(card('Data Engineer', 'Hooli')) is None
+
+    keep_applied = CardFilter(applied_companies=['Globex'], skip_applied_companies=False)
+    keep_applied.add_applied_company('Hooli')
+    assert keep_applied.reason(card('Data Engineer', 'Globex')) is None
+    assert keep_applied.reason(card('Data Engineer', 'Hooli')) is None
+
+def test_preferences_skip_applied_companies_by_default():
+    card_filter = CardFilter.from_preferences({'excluded_titles': ['intern']}, applied_companies=['Globex'])
+    assert card_filter.reason(card('Data Engineer', 'Globex')) == "already applied to this company"
+    assert card_filter.reason(card('Software Engineering Intern', 'Hooli')) == "title matches 'intern'"
@@ -0,0 +1,80 @@
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+import database
+from database import JobDatabase
+
+def add_jobs(db, count):
+    for number in range(count):
+        db.add_job_application({'title': f'Python Developer {number}', 'company': f'Company {number}',
+                                'url': f'https://www.linkedin.com/jobs/view/{5000 + number}/'})
+
+def mark_applied(db, number):
+    # updated_at has millisecond resolution
+    time.sleep(0.005)
+    with db.transaction() as cursor:
+        db.mark_applied_by_url(cursor, [f'https://www.linkedin.com/jobs/view/{5000 + number}/'])
+
+def exported_titles(path):
+    with open(path) as file:
+        return [json.loads(line)['job_title'] for line in file]
+
+@pytest.fixture
+def ahead_of_utc(monkeypatch):
+    """Local time nine hours ahead of UTC"""
+    monkeypatch.setenv('TZ', 'JST-9')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def test_incremental_export_appends_only_changed_rows(tmp_path):
+    db = JobDatabase(str(tmp_path / 'jobs.db'))
+    target = str(tmp_path / 'changes.jsonl')
+    add_jobs(db, 3)
+
+    assert db.export(target, incremental=True) == 3
+    assert db.export(target, incremental=True) == 0
+
+    mark_applied(db, 1)
+    assert db.export(target, incremental=True) == 1
+    assert exported_titles(target)[-1] == 'Python Developer 1'
+    # Other targets keep their own cursor
+    assert db.export(str(tmp_path / 'other.jsonl'), incremental=True) == 3
+
+def test_backfilled_rows_do_not_hide_later_changes(tmp_path, ahead_of_utc):
+    db = JobDatabase(str(tmp_path / 'jobs.db'))
+    add_jobs(db, 2)
+    # A row from before updated_at existed, applied to at local time
+    with db.transaction() as cursor:
+        cursor.execute('UPDATE applications SET application_date = ?, updated_at = NULL WHERE job_title = ?',
+                       (datetime.now(), 'Python Developer 0'))
+        database.migrate_updated_at(cursor)
+
+    target = str(tmp_path / 'changes.jsonl')
+    assert db.export(target, incremental=True) == 2
+    mark_applied(db, 1)
+    assert db.export(target, incremental=True) == 1
+    assert exported_titles(target)[-1] == 'Python Developer 1'
+
+def test_local_time_backfill_is_converted(tmp_path, ahead_of_utc):
+    db = JobDatabase(str(tmp_path / 'jobs.db'))
+    add_jobs(db, 1)
+    target = str(tmp_path / 'changes.jsonl')
+    db.export(target, incremental=True)
+    # What the first version of the backfill left behind
+    with db.transaction() as cursor:
+        cursor.execute('UPDATE applications SET application_date = ?', (datetime.now(),))
+        cursor.execute('UPDATE applications SET updated_at = application_date')
+        cursor.execute('UPDATE export_state SET last_updated_at = (SELECT updated_at FROM applications)')
+        database.migrate_updated_at_utc(cursor)
+
+    updated_at, application_date = db.connection().execute(
+        'SELECT updated_at, application_date FROM applications'
+    ).fetchone()
+    assert updated_at < application_date
+    mark_applied(db, 0)
+    assert db.export(target, incremental=True) == 1
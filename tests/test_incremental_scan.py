@@ -0,0 +1,173 @@
+import time
+import types
+
+import pytest
+
+import linkedin_scraper
+from config import Config
+from database import JobDatabase
+from db_writer import DatabaseWriter
+from linkedin_scraper import LinkedInScraper
+from rate_governor import ApplicationGovernor
+from browser_watchdog import BrowserWatchdog
+
+# Newest first, as LinkedIn sorts them with sortBy=DD
+PAGES = [
+    [(110, 'Python Backend Developer', 'Acme'), (109, 'Data Platform Engineer', 'Globex'),
+     (108, 'Machine Learning Specialist', 'Initech'), (107, 'Site Reliability Engineer', 'Umbrella'),
+     (106, 'Frontend Developer React', 'Hooli')],
+    [(105, 'Embedded Firmware Engineer', 'Stark'), (104, 'Database Administrator Postgres', 'Wayne'),
+     (103, 'Mobile Developer Android', 'Tyrell'), (102, 'Security Analyst Cloud', 'Cyberdyne'),
+     (101, 'Technical Writer Docs', 'Soylent')],
+]
+
+def new_scan(watermark=None, oldest=None):
+    return {'watermark': watermark, 'oldest': oldest, 'newest': None, 'recent': (), 'known_streak': 0,
+            'reached_known': False, 'finished': False, 'exhausted': False}
+
+class Element:
+    def __init__(self, text='', attributes=None, children=None):
+        self.text = text
+        self.attributes = attributes or {}
+        self.children = children or {}
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+    def find_elements(self, by, selector):
+        return self.children.get(selector, [])
+
+    def find_element(self, by, selector):
+        found = self.children.get(selector)
+        if not found:
+            raise Exception(f"no {selector}")
+        return found[0]
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.children['on_click']()
+
+def job_card(job_id, title, company):
+    link = Element(title, {'href': f'https://www.linkedin.com/jobs/view/{job_id}/?trk=search'})
+    return Element(f'{title}\n{company}\nEasy Apply', {'data-occludable-job-id': str(job_id)},
+                   {'a': [link], '.artdeco-entity-lockup__subtitle': [Element(company)]})
+
+class SearchDriver:
+    """Result pages of PAGES with a Next page button, every job opens an Easy Apply modal"""
+
+    current_url = 'https://www.linkedin.com/jobs/search/'
+    current_window_handle = 'search'
+
+    def __init__(self):
+        self.page = 0
+        self.opened = []
+
+    def get(self, url):
+        self.page = 0
+
+    def next_page(self):
+        self.page += 1
+
+    def find_elements(self, by, selector):
+        if selector == 'li':
+            return [job_card(*card) for card in PAGES[self.page]]
+        if selector in ('.jobs-apply-button', '.jobs-easy-apply-modal, .artdeco-modal, [role=\'dialog\']'):
+            return [Element('Easy Apply')]
+        return []
+
+    def find_element(self, by, selector):
+        if selector == "button[aria-label='Next page']" and self.page + 1 < len(PAGES):
+            return Element(children={'on_click': self.next_page})
+        raise Exception(f"no {selector}")
+
+    def execute_script(self, script, *args):
+        if args and args[0].text != 'Easy Apply':
+            self.opened.append(args[0].text)
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr(linkedin_scraper, 'By', types.SimpleNamespace(TAG_NAME='tag name', CSS_SELECTOR='css selector'))
+    monkeypatch.setattr(linkedin_scraper, 'time', types.SimpleNamespace(sleep=lambda seconds: None,
+                                                                         monotonic=time.monotonic))
+    monkeypatch.setattr(Config, 'PREFETCH_TABS', 0)
+    writer = DatabaseWriter(JobDatabase(str(tmp_path / 'jobs.db')))
+    scraper = LinkedInScraper(db_writer=writer)
+    scraper.watchdog = BrowserWatchdog(max_jobs=0, max_rss_mb=0, max_latency_ms=0)
+    scraper.complete_full_application = lambda user_info, title: True
+    yield scraper
+    writer.close()
+
+def search(scraper, max_per_day=0):
+    scraper.driver = SearchDriver()
+    scraper.governor = ApplicationGovernor(scraper.db_writer.db.connections, delay_seconds=0, max_per_day=max_per_day)
+    results = scraper.search_and_apply_jobs_fast('python', 'Milan', {}, max_pages=len(PAGES), incremental=True)
+    scraper.db_writer.flush()
+    return results, scraper.driver.opened
+
+def scan_cards(scraper, scan, job_ids):
+    """note_card over job_ids, returns the ones reported as known"""
+    return [job_id for job_id in job_ids if scraper.note_card(scan, job_id)]
+
+def test_note_card_tracks_newest_and_known_postings(scraper):
+    scan = new_scan(watermark=110, oldest=100)
+    assert not scan_cards(scraper, scan, [115, 112])
+    assert scan['newest'] == 115
+    # Known postings are skipped, but one is not enough to call the rest known
+    assert scan_cards(scraper, scan, [110, 109, 108]) == [110, 109, 108]
+    assert scan['reached_known'] and not scan['finished']
+    # Below the stored range: cut off by the limits of earlier runs
+    assert not scan_cards(scraper, scan, [99, 98])
+    assert scan['recent'] == (108, 99, 98)
+
+def test_note_card_finishes_once_earlier_runs_reached_the_end(scraper):
+    scan = new_scan(watermark=110)
+    scan_cards(scraper, scan, [111, 110, 109])
+    assert not scan['finished']
+    scan_cards(scraper, scan, [108])
+    assert scan['finished']
+
+def test_note_card_ignores_missing_ids(scraper):
+    scan = new_scan(watermark=110)
+    assert not scraper.note_card(scan, None)
+    assert not scraper.note_card(scan, 'abc')
+    assert scan['newest'] is None
+
+def test_scanned_range(scraper):
+    first = new_scan()
+    scan_cards(scraper, first, [110, 109, 108, 107])
+    assert scraper.scanned_range(first) == (110, 109)
+    first['exhausted'] = True
+    assert scraper.scanned_range(first) == (110, None)
+
+    # Reaching the stored range extends it downward
+    overlapping = new_scan(watermark=110, oldest=105)
+    scan_cards(scraper, overlapping, [112, 111, 110, 109, 104, 103, 102])
+    assert scraper.scanned_range(overlapping) == (112, 104)
+    # Stopping above it would leave a gap
+    above = new_scan(watermark=110, oldest=105)
+    scan_cards(scraper, above, [120, 119, 118])
+    assert scraper.scanned_range(above) is None
+
+def test_page_cut_short_by_daily_limit_stays_eligible(scraper):
+    # The cap ends the run on the second card of page 2
+    results, opened = search(scraper, max_per_day=len(PAGES[0]) + 1)
+    assert results['applied'] == len(PAGES[0]) + 1
+    assert results['limit_reached']
+    # Only the completed first page counts as scanned
+    assert scraper.db_writer.db.get_search_watermark('python', 'Milan') == (110, 108)
+
+    # The next run opens the postings the cap left unhandled
+    results, opened = search(scraper)
+    assert opened[-3:] == [title for _, title, _ in PAGES[1][2:]]
+    assert results['applied'] == 3
+    assert scraper.db_writer.db.get_search_watermark('python', 'Milan') == (110, None)
+
+def test_interrupted_first_page_stores_no_range(scraper):
+    results, opened = search(scraper, max_per_day=2)
+    assert results['applied'] == 2
+    assert scraper.db_writer.db.get_search_watermark('python', 'Milan') is None
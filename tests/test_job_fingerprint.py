@@ -0,0 +1,85 @@
+from itertools import accumulate
+
+import pytest
+
+from database import JobDatabase
+from job_fingerprint import (BAND_WIDTHS, SIMHASH_BANDS, FingerprintIndex, hamming_distance, job_fingerprint,
+                             posting_key, simhash_bands, to_signed)
+
+# High bit set, so the signed SQLite storage is exercised too
+BASE = 0x9E3779B97F4A7C15
+# First bit of each band after the first
+BAND_STARTS = list(accumulate(BAND_WIDTHS))[:-1]
+
+def flipped(*bits):
+    value = BASE
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+def fingerprint(value, key=None):
+    return {'key': key, 'simhash': value, 'bands': simhash_bands(value)}
+
+def test_bands_cover_all_bits():
+    assert sum(BAND_WIDTHS) == 64 and len(BAND_WIDTHS) == SIMHASH_BANDS
+    # Flipping the last bit of a band and the first bit of the next changes exactly those two bands
+    for start in BAND_STARTS:
+        pairs = zip(simhash_bands(BASE), simhash_bands(flipped(start - 1, start)))
+        changed = [band for band, (old, new) in enumerate(pairs) if old != new]
+        assert len(changed) == 2 and changed[1] == changed[0] + 1
+
+# Each bit in a different band, on both sides of the band boundaries
+NEAR = [
+    flipped(*[start - 1 for start in BAND_STARTS]),
+    flipped(*BAND_STARTS),
+    flipped(0, 63),
+]
+# Six bits, one in every band: no band is shared
+FAR = flipped(0, *BAND_STARTS)
+
+@pytest.mark.parametrize('value', NEAR)
+def test_index_finds_hashes_within_the_distance_across_bands(value):
+    index = FingerprintIndex(max_distance=SIMHASH_BANDS - 1)
+    index.add('https://www.linkedin.com/jobs/view/1/', fingerprint(BASE))
+    assert hamming_distance(BASE, value) <= SIMHASH_BANDS - 1
+    assert index.find(fingerprint(value)) == 'https://www.linkedin.com/jobs/view/1/'
+
+def test_index_threshold():
+    index = FingerprintIndex(max_distance=2)
+    index.add('https://www.linkedin.com/jobs/view/1/', fingerprint(BASE))
+    assert index.find(fingerprint(flipped(3, 40))) == 'https://www.linkedin.com/jobs/view/1/'
+    # Shares bands with BASE, but differs in more bits than allowed
+    assert index.find(fingerprint(flipped(3, 40, 50))) is None
+
+    assert hamming_distance(BASE, FAR) == SIMHASH_BANDS
+    assert FingerprintIndex().find(fingerprint(FAR)) is None
+
+@pytest.fixture
+def db(tmp_path):
+    """Database with one applied posting whose description SimHash is BASE"""
+    db = JobDatabase(str(tmp_path / 'jobs.db'))
+    url = 'https://www.linkedin.com/jobs/view/1/'
+    db.add_job_application({'title': 'Python Developer', 'company': 'Globex', 'location': 'Milan', 'url': url})
+    with db.transaction() as cursor:
+        db.mark_applied_by_url(cursor, [url])
+        bands = ', '.join(f'band{band} = ?' for band in range(SIMHASH_BANDS))
+        cursor.execute(f'UPDATE job_fingerprints SET simhash = ?, {bands} WHERE url = ?',
+                       (to_signed(BASE), *simhash_bands(BASE), url))
+    return db
+
+@pytest.mark.parametrize('value', NEAR)
+def test_database_finds_near_duplicates_across_bands(db, value):
+    job = {'title': 'Data Engineer', 'company': 'Hooli', 'location': 'Rome'}
+    assert db.find_duplicate(job, fingerprint=fingerprint(value)) == 'https://www.linkedin.com/jobs/view/1/'
+
+def test_database_threshold(db):
+    job = {'title': 'Data Engineer', 'company': 'Hooli', 'location': 'Rome'}
+    assert db.find_duplicate(job, max_distance=2, fingerprint=fingerprint(flipped(3, 40))) is not None
+    assert db.find_duplicate(job, max_distance=2, fingerprint=fingerprint(flipped(3, 40, 50))) is None
+    assert db.find_duplicate(job, fingerprint=fingerprint(FAR)) is None
+
+def test_database_matches_reposts_by_posting_key(db):
+    repost = {'title': 'Python Dev (m/f/d) - Remote', 'company': 'Globex GmbH', 'location': 'milan'}
+    assert job_fingerprint(repost)['key'] == posting_key('Globex', 'Python Developer', 'Milan')
+    assert db.find_duplicate(repost) == 'https://www.linkedin.com/jobs/view/1/'
+    assert db.find_duplicate(dict(repost, title='Senior Python Developer')) is None
@@ -0,0 +1,133 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import Config
+from work_queue import SQLiteWorkQueue, run_worker
+
+PROFILE = 'alice'
+JOB_IDS = [str(4000000000 + number) for number in range(8)]
+
+def make_units(count):
+    return [{'profile': PROFILE, 'position': 'Python Developer', 'location': 'Milan', 'page': page}
+            for page in range(1, count + 1)]
+
+def status_of(queue, unit_id):
+    return queue.connections.connection().execute(
+        'SELECT status FROM work_units WHERE id = ?', (unit_id,)
+    ).fetchone()[0]
+
+def apply_to_shared_postings(unit, lease):
+    """Fake process_unit: every unit finds the same postings and tries to apply to all of them"""
+    applied = []
+    for job_id in JOB_IDS:
+        if lease.reserve_application(job_id):
+            time.sleep(0.002)
+            lease.finish_application(job_id, True)
+            applied.append(job_id)
+    return {'applied': len(applied), 'job_ids': applied, 'pid': os.getpid()}
+
+def always_fail(unit, lease):
+    raise RuntimeError("browser crashed")
+
+def work(path, worker_id, process_unit=apply_to_shared_postings, lease_seconds=5.0):
+    """Worker process: run the queue until it is empty"""
+    return run_worker(SQLiteWorkQueue(path), process_unit, worker_id=worker_id,
+                      lease_seconds=lease_seconds, poll_interval=0.05)
+
+def run_processes(path, processes, **kwargs):
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(work, path, f"worker-{index}", **kwargs) for index in range(processes)]
+        return [future.result(timeout=60) for future in futures]
+
+def test_every_unit_done_once_and_postings_applied_once(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    queue = SQLiteWorkQueue(path)
+    assert queue.add_units(make_units(40)) == 40
+    # Re-planning the same units adds nothing
+    assert queue.add_units(make_units(40)) == 0
+
+    stats = run_processes(path, 4)
+
+    assert sum(worker['done'] for worker in stats) == 40
+    assert sum(worker['failed'] + worker['lost'] for worker in stats) == 0
+    assert queue.counts()['units'] == {'done': 40}
+
+    results = queue.results()
+    assert sorted(result['page'] for result in results) == list(range(1, 41))
+    # Each posting went to exactly one unit, whichever process ran it
+    applied = [job_id for result in results for job_id in result['job_ids']]
+    assert sorted(applied) == sorted(JOB_IDS)
+    assert queue.counts()['applications'] == {'applied': len(JOB_IDS)}
+
+def test_two_leases_cannot_reserve_the_same_posting(tmp_path):
+    queue = SQLiteWorkQueue(str(tmp_path / 'queue.db'))
+    queue.add_units(make_units(2))
+    first = queue.claim('worker-1', 60)
+    second = queue.claim('worker-2', 60)
+    assert first['id'] != second['id']
+
+    assert queue.reserve_application(first, JOB_IDS[0])
+    assert not queue.reserve_application(second, JOB_IDS[0])
+    # Still reserved (outcome unknown), so nobody may retry it
+    assert not queue.reserve_application(first, JOB_IDS[0])
+
+    # A failed attempt that sent nothing can be retried by another lease
+    assert queue.finish_application(first, JOB_IDS[0], False)
+    assert queue.reserve_application(second, JOB_IDS[0])
+    assert queue.finish_application(second, JOB_IDS[0], True)
+    assert not queue.reserve_application(first, JOB_IDS[0])
+
+def test_expired_lease_is_reclaimed_and_stale_worker_fenced(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    queue = SQLiteWorkQueue(path)
+    queue.add_units(make_units(1))
+
+    stale = queue.claim('stale-worker', 0.05)
+    time.sleep(0.1)
+
+    stats = run_processes(path, 1)
+    assert stats[0]['done'] == 1
+    assert status_of(queue, stale['id']) == 'done'
+
+    # The stale worker still holds its old token, which every write is checked against
+    assert not queue.renew(stale, 60)
+    assert not queue.complete(stale, {'applied': 99})
+    assert not queue.reserve_application(stale, '4999999999')
+    assert not queue.fail(stale, 'late failure')
+    assert queue.results()[0]['applied'] == len(JOB_IDS)
+
+def test_failing_unit_reaches_failed_after_max_attempts(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    queue = SQLiteWorkQueue(path)
+    queue.add_units(make_units(1))
+
+    for attempt in range(1, Config.WORK_QUEUE_MAX_ATTEMPTS + 1):
+        unit = queue.claim('worker-1', 60)
+        assert unit['attempts'] == attempt
+        assert queue.fail(unit, 'browser crashed')
+        expected = 'failed' if attempt == Config.WORK_QUEUE_MAX_ATTEMPTS else 'pending'
+        assert status_of(queue, unit['id']) == expected
+
+    assert queue.claim('worker-1', 60) is None
+
+def test_workers_give_up_on_a_failing_unit(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    queue = SQLiteWorkQueue(path)
+    queue.add_units(make_units(1))
+
+    stats = run_processes(path, 2, process_unit=always_fail)
+
+    assert sum(worker['failed'] for worker in stats) == Config.WORK_QUEUE_MAX_ATTEMPTS
+    assert queue.counts()['units'] == {'failed': 1}
+
+def test_lease_threads_do_not_leak_connections(tmp_path):
+    queue = SQLiteWorkQueue(str(tmp_path / 'queue.db'))
+    queue.add_units(make_units(20))
+
+    # Units outlast the first renewal, so every lease thread opens a connection
+    stats = run_worker(queue, lambda unit, lease: (time.sleep(0.08), {})[1], worker_id='worker-1',
+                       lease_seconds=0.15, poll_interval=0)
+
+    assert stats['done'] == 20
+    assert len(queue.connections.connections) == 1
@@ -0,0 +1,354 @@
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable, Dict, List, Optional
+from config import Config
+from database import ConnectionManager, migrate_rate_limits
+
+# Work unit states: pending -> leased -> done, or back to pending when a lease
+# expires or an attempt fails, until WORK_QUEUE_MAX_ATTEMPTS is reached (failed)
+UNIT_COLUMNS = ['id', 'profile', 'position', 'location', 'page', 'attempts', 'worker_id', 'lease_token', 'lease_expires']
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueueBackend:
+    """
+    Interface for lease-based queues of (profile, position, location, page) units.
+    A claimed unit carries a lease token; every later write about the unit must
+    present it, so a worker whose lease expired and was reclaimed can neither
+    complete the unit nor apply for it again.
+    """
+    name = 'base'
+
+    def add_units(self, units: List[Dict]) -> int:
+        """Add units that are not queued yet, returns how many were added"""
+        raise NotImplementedError
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict]:
+        """Lease the next pending unit (after reclaiming expired leases), or None"""
+        raise NotImplementedError
+
+    def renew(self, unit: Dict, lease_seconds: float) -> bool:
+        """Extend a lease, returns False if it was lost to another worker"""
+        raise NotImplementedError
+
+    def complete(self, unit: Dict, result: Dict) -> bool:
+        """Mark a unit done with its result, returns False if the lease was lost"""
+        raise NotImplementedError
+
+    def fail(self, unit: Dict, error: str) -> bool:
+        """Return a unit to the queue after a failed attempt"""
+        raise NotImplementedError
+
+    def release(self, unit: Dict) -> bool:
+        """Give a unit back without counting the attempt (worker shutdown)"""
+        raise NotImplementedError
+
+    def reserve_application(self, unit: Dict, job_id: str) -> bool:
+        """Reserve applying to a posting for the profile, returns False if another attempt owns it"""
+        raise NotImplementedError
+
+    def finish_application(self, unit: Dict, job_id: str, applied: bool) -> bool:
+        """Record the outcome of a reserved application"""
+        raise NotImplementedError
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Units and applications per status"""
+        raise NotImplementedError
+
+    def close_thread(self):
+        """Release what the calling thread holds open, before the thread exits"""
+
+class SQLiteWorkQueue(WorkQueueBackend):
+    """
+    Work queue in a SQLite file, for worker processes on one host or containers
+    sharing a local volume. SQLite locking is unreliable on network filesystems,
+    so workers on separate machines need a backend on a shared database server.
+    """
+    name = 'sqlite'
+
+    def __init__(self, path: str, max_attempts: int = None):
+        self.path = path
+        self.max_attempts = max_attempts or Config.WORK_QUEUE_MAX_ATTEMPTS
+        self.connections = ConnectionManager.for_path(path)
+        self.connections.initialize(self.create_tables)
+
+    def create_tables(self):
+        with self.connections.transaction() as cursor:
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS work_units (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profile TEXT NOT NULL,
+                position TEXT NOT NULL,
+                location TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                worker_id TEXT,
+                lease_token TEXT,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP,
+                UNIQUE (profile, position, location, page)
+            )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_work_units_status ON work_units (status, lease_expires)')
+            # One row per posting and profile: the ledger that keeps applications exactly-once
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS work_applications (
+                profile TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                unit_id INTEGER,
+                worker_id TEXT,
+                lease_token TEXT,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (profile, job_id)
+            )
+            ''')
+            # Workers of a profile share its application pacing here (the queue database has no migrations)
+            migrate_rate_limits(cursor)
+
+    def add_units(self, units: List[Dict]) -> int:
+        with self.connections.transaction() as cursor:
+            before = cursor.execute('SELECT COUNT(*) FROM work_units').fetchone()[0]
+            cursor.executemany('''
+            INSERT OR IGNORE INTO work_units (profile, position, location, page) VALUES (?, ?, ?, ?)
+            ''', [(unit['profile'], unit['position'], unit['location'], unit['page']) for unit in units])
+            return cursor.execute('SELECT COUNT(*) FROM work_units').fetchone()[0] - before
+
+    def reclaim_expired(self, cursor) -> int:
+        """Return units whose lease ran out to the queue, or fail them after max attempts"""
+        cursor.execute('''
+        UPDATE work_units
+        SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+            error = 'lease expired on ' || worker_id, worker_id = NULL, lease_token = NULL, lease_expires = NULL
+        WHERE status = 'leased' AND lease_expires < ?
+        ''', (self.max_attempts, time.time()))
+        return cursor.rowcount
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict]:
+        # BEGIN IMMEDIATE serializes claims, so a unit is never leased twice
+        with self.connections.transaction() as cursor:
+            reclaimed = self.reclaim_expired(cursor)
+            if reclaimed:
+                print(f"Reclaimed {reclaimed} expired work unit leases")
+
+            row = cursor.execute("SELECT id FROM work_units WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+
+            cursor.execute('''
+            UPDATE work_units
+            SET status = 'leased', attempts = attempts + 1, worker_id = ?, lease_token = ?, lease_expires = ?
+            WHERE id = ?
+            ''', (worker_id, uuid.uuid4().hex, time.time() + lease_seconds, row[0]))
+            values = cursor.execute(f'SELECT {", ".join(UNIT_COLUMNS)} FROM work_units WHERE id = ?', row).fetchone()
+            return dict(zip(UNIT_COLUMNS, values))
+
+    def update_leased(self, unit: Dict, assignments: str, params: tuple) -> bool:
+        """Update a unit only while the caller still holds its lease"""
+        with self.connections.transaction() as cursor:
+            cursor.execute(f'''
+            UPDATE work_units SET {assignments}
+            WHERE id = ? AND lease_token = ? AND status = 'leased'
+            ''', params + (unit['id'], unit['lease_token']))
+            return cursor.rowcount == 1
+
+    def renew(self, unit: Dict, lease_seconds: float) -> bool:
+        return self.update_leased(unit, 'lease_expires = ?', (time.time() + lease_seconds,))
+
+    def complete(self, unit: Dict, result: Dict) -> bool:
+        return self.update_leased(
+            unit, "status = 'done', result = ?, error = NULL, lease_expires = NULL, finished_at = CURRENT_TIMESTAMP",
+            (json.dumps(result),)
+        )
+
+    def fail(self, unit: Dict, error: str) -> bool:
+        return self.update_leased(
+            unit, "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ?, "
+                  "worker_id = NULL, lease_token = NULL, lease_expires = NULL",
+            (self.max_attempts, error)
+        )
+
+    def release(self, unit: Dict) -> bool:
+        return self.update_leased(
+            unit, "status = 'pending', attempts = attempts - 1, worker_id = NULL, lease_token = NULL, lease_expires = NULL",
+            ()
+        )
+
+    def reserve_application(self, unit: Dict, job_id: str) -> bool:
+        with self.connections.transaction() as cursor:
+            leased = cursor.execute(
+                "SELECT 1 FROM work_units WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                (unit['id'], unit['lease_token'])
+            ).fetchone()
+            if not leased:
+                return False
+
+            # A posting whose last attempt failed before submitting may be tried again;
+            # 'reserved' rows of crashed workers are never retried, since the
+            # application may have gone through
+            cursor.execute('''
+            INSERT INTO work_applications (profile, job_id, status, unit_id, worker_id, lease_token, updated_at)
+            VALUES (?, ?, 'reserved', ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(profile, job_id) DO UPDATE SET
+                status = 'reserved', unit_id = excluded.unit_id, worker_id = excluded.worker_id,
+                lease_token = excluded.lease_token, updated_at = excluded.updated_at
+            WHERE work_applications.status = 'failed'
+            ''', (unit['profile'], job_id, unit['id'], unit['worker_id'], unit['lease_token']))
+            return cursor.rowcount == 1
+
+    def finish_application(self, unit: Dict, job_id: str, applied: bool) -> bool:
+        with self.connections.transaction() as cursor:
+            cursor.execute('''
+            UPDATE work_applications SET status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE profile = ? AND job_id = ? AND lease_token = ? AND status = 'reserved'
+            ''', ('applied' if applied else 'failed', unit['profile'], job_id, unit['lease_token']))
+            return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        conn = self.connections.connection()
+        return {
+            'units': dict(conn.execute('SELECT status, COUNT(*) FROM work_units GROUP BY status').fetchall()),
+            'applications': dict(conn.execute('SELECT status, COUNT(*) FROM work_applications GROUP BY status').fetchall())
+        }
+
+    def close_thread(self):
+        self.connections.close_thread()
+
+    def results(self) -> List[Dict]:
+        """Results of the finished units, in queue order"""
+        rows = self.connections.connection().execute(
+            "SELECT profile, position, location, page, worker_id, result FROM work_units WHERE status = 'done' ORDER BY id"
+        ).fetchall()
+        return [
+            {'profile': profile, 'position': position, 'location': location, 'page': page,
+             'worker_id': worker_id, **json.loads(result or '{}')}
+            for profile, position, location, page, worker_id, result in rows
+        ]
+
+# Backends by URL scheme; other backends (e.g. on a database server) register here
+WORK_QUEUE_BACKENDS = {
+    'sqlite': SQLiteWorkQueue
+}
+
+def create_work_queue(url: str = None) -> WorkQueueBackend:
+    """Open the queue at 'scheme://location', a bare path meaning a SQLite file"""
+    url = url or Config.WORK_QUEUE_URL
+    scheme, separator, location = url.partition('://')
+    if not separator:
+        scheme, location = 'sqlite', url
+
+    backend_class = WORK_QUEUE_BACKENDS.get(scheme.lower())
+    if backend_class is None:
+        raise ValueError(f"Unsupported work queue backend: {scheme}. Supported backends: {', '.join(WORK_QUEUE_BACKENDS)}")
+    return backend_class(location)
+
+class WorkLease:
+    """
+    A claimed unit whose lease is renewed on a background thread while it is
+    worked on. When a renewal fails the lease is lost: lost is set, and
+    application reservations are refused from then on.
+    """
+
+    def __init__(self, queue: WorkQueueBackend, unit: Dict, lease_seconds: float = None):
+        self.queue = queue
+        self.unit = unit
+        self.lease_seconds = lease_seconds or Config.WORK_QUEUE_LEASE_SECONDS
+        self.lost = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def __enter__(self) -> 'WorkLease':
+        self.thread = threading.Thread(target=self.run, name='WorkLease', daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        """Renew the lease three times per lease period"""
+        expires = time.time() + self.lease_seconds
+        try:
+            while not self.stopped.wait(self.lease_seconds / 3):
+                try:
+                    if not self.queue.renew(self.unit, self.lease_seconds):
+                        print(f"Lost the lease on work unit {self.unit['id']}, stopping it")
+                        self.lost.set()
+                        return
+                    expires = time.time() + self.lease_seconds
+                except Exception as e:
+                    # Transient errors are retried until the lease would have run out
+                    print(f"Warning: Could not renew lease on work unit {self.unit['id']}: {e}")
+                    if time.time() >= expires:
+                        self.lost.set()
+                        return
+        finally:
+            # Every unit gets a new thread, whose connection would otherwise stay open
+            self.queue.close_thread()
+
+    def reserve_application(self, job_id: str) -> bool:
+        if self.lost.is_set() or not job_id:
+            return False
+        return self.queue.reserve_application(self.unit, job_id)
+
+    def finish_application(self, job_id: str, applied: bool):
+        if job_id:
+            self.queue.finish_application(self.unit, job_id, applied)
+
+def run_worker(queue: WorkQueueBackend, process_unit: Callable[[Dict, WorkLease], Dict],
+               on_complete: Callable[[Dict, Dict], None] = None, worker_id: str = None,
+               lease_seconds: float = None, poll_interval: float = None) -> Dict[str, int]:
+    """
+    Claim and process units until none are pending or leased. on_complete runs
+    only for units whose completion was accepted, so every unit's result is
+    recorded once even when an expired lease makes two workers run it.
+    """
+    worker_id = worker_id or default_worker_id()
+    lease_seconds = lease_seconds or Config.WORK_QUEUE_LEASE_SECONDS
+    poll_interval = Config.WORK_QUEUE_POLL_INTERVAL if poll_interval is None else poll_interval
+    stats = {'done': 0, 'failed': 0, 'lost': 0}
+
+    while True:
+        unit = queue.claim(worker_id, lease_seconds)
+        if unit is None:
+            # Units leased by other workers come back if their leases expire
+            if not queue.counts()['units'].get('leased'):
+                break
+            time.sleep(poll_interval)
+            continue
+
+        print(f"[{worker_id}] Work unit {unit['id']}: {unit['profile']} / {unit['position']} in "
+              f"{unit['location']}, page {unit['page']} (attempt {unit['attempts']})")
+        try:
+            with WorkLease(queue, unit, lease_seconds) as lease:
+                result = process_unit(unit, lease)
+        except KeyboardInterrupt:
+            queue.release(unit)
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            queue.fail(unit, str(e))
+            stats['failed'] += 1
+            continue
+
+        if queue.complete(unit, result):
+            stats['done'] += 1
+            if on_complete:
+                on_complete(unit, result)
+        else:
+            print(f"[{worker_id}] Work unit {unit['id']} was reclaimed by another worker, result discarded")
+            stats['lost'] += 1
+
+    print(f"[{worker_id}] No work left: {stats['done']} done, {stats['failed']} failed, {stats['lost']} lost")
+    return stats